@@ -9,6 +9,9 @@ from core.config import get_settings, DatabaseSettings
 from infrastructure.database.base import Base
 from infrastructure.database.models import (  # noqa: F401
     application,
+    idempotency,
+    projection,
+    rate_limit,
 )
 
 config = context.config
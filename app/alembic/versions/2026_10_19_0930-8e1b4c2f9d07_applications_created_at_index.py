@@ -0,0 +1,37 @@
+"""applications created_at index
+
+Revision ID: 8e1b4c2f9d07
+Revises: 3c9f2d7a1b64
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e1b4c2f9d07'
+down_revision: Union[str, None] = '3c9f2d7a1b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_applications_created_at',
+            'applications',
+            ['created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_applications_created_at',
+            table_name='applications',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,49 @@
+"""notify applications created
+
+Revision ID: 5d2a7e9c4f18
+Revises: 8e1b4c2f9d07
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a7e9c4f18'
+down_revision: Union[str, None] = '8e1b4c2f9d07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NOTIFY payloads are limited to 8000 bytes, so large rows only carry
+    # their id and listeners load the row themselves. Listeners subscribe
+    # to CREATED_CHANNEL of the application model, which must stay equal
+    # to the channel notified here.
+    op.execute("""
+        CREATE FUNCTION notify_applications_created() RETURNS trigger AS $$
+        DECLARE
+            payload text := row_to_json(NEW)::text;
+        BEGIN
+            IF octet_length(payload) > 7900 THEN
+                payload := json_build_object('id', NEW.id)::text;
+            END IF;
+            PERFORM pg_notify('applications_created', payload);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER applications_created_notify
+        AFTER INSERT ON applications
+        FOR EACH ROW EXECUTE FUNCTION notify_applications_created();
+    """)
+
+
+def downgrade() -> None:
+    op.execute(
+        'DROP TRIGGER IF EXISTS applications_created_notify ON applications;'
+    )
+    op.execute('DROP FUNCTION IF EXISTS notify_applications_created();')
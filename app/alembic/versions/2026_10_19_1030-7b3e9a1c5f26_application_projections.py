@@ -0,0 +1,34 @@
+"""application projections
+
+Revision ID: 7b3e9a1c5f26
+Revises: 5d2a7e9c4f18
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy_utils
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9a1c5f26'
+down_revision: Union[str, None] = '5d2a7e9c4f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('application_projections',
+    sa.Column('user_name', sa.String(length=64), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('projected_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sqlalchemy_utils.types.uuid.UUIDType(binary=False), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_application_projections'))
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('application_projections')
@@ -0,0 +1,34 @@
+"""rate limits
+
+Revision ID: 9f4c1e7b2a38
+Revises: 7b3e9a1c5f26
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4c1e7b2a38'
+down_revision: Union[str, None] = '7b3e9a1c5f26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('rate_limits',
+    sa.Column('key', sa.Text(), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('allowed', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key', name=op.f('pk_rate_limits'))
+    )
+    op.create_index('ix_rate_limits_updated_at', 'rate_limits', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_rate_limits_updated_at', table_name='rate_limits')
+    op.drop_table('rate_limits')
@@ -0,0 +1,47 @@
+"""applications content hash
+
+Revision ID: 4b8d2f6a9c13
+Revises: 9f4c1e7b2a38
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8d2f6a9c13'
+down_revision: Union[str, None] = '9f4c1e7b2a38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A nullable column without a default only changes the catalog, so
+    # the table is neither rewritten nor locked for long. Repositories
+    # write the hash on insert; older applications keep NULL, which only
+    # matters for submissions repeated within the deduplication window.
+    op.add_column(
+        'applications',
+        sa.Column('content_hash', sa.Uuid(), nullable=True),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_applications_content_hash_created_at',
+            'applications',
+            ['content_hash', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_applications_content_hash_created_at',
+            table_name='applications',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('applications', 'content_hash')
@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+from datetime import timedelta
+
+from core.config import ArchiveSettings, DatabaseSettings, get_settings
+from core.logger import get_logger
+from domain.entities.application import ApplicationRead
+from infrastructure.archive.store import ArchiveStore
+from infrastructure.database.engine import SqlAlchemyEngine
+from infrastructure.database.filter.application import ApplicationFilter
+from infrastructure.database.models.application import Application
+from infrastructure.database.repository.application import (
+    ApplicationRepository,
+)
+from services.archive import ArchiveService
+
+logger = get_logger(__name__)
+
+
+async def run(once: bool) -> None:
+    """Archives old applications of the database or of every shard.
+
+    :param once: Whether to stop after one run instead of repeating it
+    every ``ARCHIVE_INTERVAL`` seconds.
+    :type once: bool
+    """
+    archive_settings = get_settings(ArchiveSettings)
+    database_settings = get_settings(DatabaseSettings)
+    uris = database_settings.shards or [database_settings.uri]
+    engines = [SqlAlchemyEngine(uri, database_settings.echo) for uri in uris]
+    filter = ApplicationFilter(Application)
+    service = ArchiveService(
+        [
+            ApplicationRepository(engine, Application, filter)
+            for engine in engines
+        ],
+        ArchiveStore(
+            archive_settings.directory,
+            ApplicationRead,
+            archive_settings.cache_files,
+        ),
+        ApplicationRead,
+        timedelta(days=archive_settings.max_age),
+        archive_settings.batch_size,
+    )
+    try:
+        while True:
+            try:
+                await service.archive()
+            except Exception as exc:
+                if once:
+                    raise
+                logger.error(f'Archival run failed: {str(exc)}')
+            if once:
+                break
+            await asyncio.sleep(archive_settings.interval)
+    finally:
+        for engine in engines:
+            await engine.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Move old applications to compressed archive files.'
+    )
+    parser.add_argument('--once', action='store_true')
+    args = parser.parse_args()
+    asyncio.run(run(args.once))
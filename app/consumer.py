@@ -0,0 +1,42 @@
+import asyncio
+import multiprocessing
+import signal
+
+from core.config import ProjectionSettings, get_settings
+from core.providers import get_consumer_providers
+from public.consumer.app import create_consumer_app
+
+app = create_consumer_app(get_consumer_providers())
+
+
+def run() -> None:
+    """Runs the consumer application in the current process."""
+    asyncio.run(app.run())
+
+
+def run_workers(workers: int) -> None:
+    """Runs the consumer in several processes of the same consumer group.
+
+    :param workers: The number of worker processes.
+    :type workers: int
+    """
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=run) for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    def terminate(signum: int, frame: object) -> None:
+        for process in processes:
+            process.terminate()
+
+    signal.signal(signal.SIGTERM, terminate)
+    for process in processes:
+        process.join()
+
+
+if __name__ == '__main__':
+    workers = get_settings(ProjectionSettings).workers
+    if workers > 1:
+        run_workers(workers)
+    else:
+        run()
@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+
+from .metrics import metrics
+
+cache_hits = metrics.counter(
+    'cache_hits_total',
+    'In-process cache lookups that found an entry.',
+)
+cache_misses = metrics.counter(
+    'cache_misses_total',
+    'In-process cache lookups that found no entry.',
+)
+
+
+class LRUCache[KeyType, ValueType]:
+    """Bounded in-process LRU cache with an optional time to live."""
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        ttl: float | None = None,
+    ) -> None:
+        """Initializes the cache.
+
+        :param name: The cache name used in metrics.
+        :type name: str
+        :param maxsize: The maximum number of entries.
+        :type maxsize: int
+        :param ttl: Seconds an entry stays valid, or None to keep entries
+        until they are evicted.
+        :type ttl: float | None
+        """
+        self.name = name
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[KeyType, tuple[float, ValueType]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: KeyType) -> ValueType | None:
+        """Returns the cached value and marks it as recently used.
+
+        :param key: The cache key.
+        :type key: KeyType
+        :returns: The cached value, or None if missing or expired.
+        :rtype: ValueType | None
+        """
+        entry = self._entries.get(key)
+        if entry is None or (
+            self._ttl is not None and entry[0] < time.monotonic()
+        ):
+            if entry is not None:
+                del self._entries[key]
+            cache_misses.inc(cache=self.name)
+            return None
+        self._entries.move_to_end(key)
+        cache_hits.inc(cache=self.name)
+        return entry[1]
+
+    def set(self, key: KeyType, value: ValueType) -> None:
+        """Stores a value, evicting the least recently used entry if full.
+
+        :param key: The cache key.
+        :type key: KeyType
+        :param value: The value to cache.
+        :type value: ValueType
+        """
+        expires_at = (
+            time.monotonic() + self._ttl if self._ttl is not None else 0.0
+        )
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: KeyType) -> None:
+        """Removes an entry if it is cached.
+
+        :param key: The cache key.
+        :type key: KeyType
+        """
+        self._entries.pop(key, None)
@@ -0,0 +1,178 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncGenerator
+
+from .logger import get_logger
+from .metrics import metrics
+
+logger = get_logger(__name__)
+
+circuit_state = metrics.gauge(
+    'circuit_breaker_state',
+    'Circuit breaker state (0 closed, 1 open, 2 half-open).',
+)
+circuit_failures = metrics.counter(
+    'circuit_breaker_failures_total',
+    'Calls that failed or timed out.',
+)
+circuit_rejections = metrics.counter(
+    'circuit_breaker_rejections_total',
+    'Calls rejected without reaching the dependency.',
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit is open."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        """Initializes the exception.
+
+        :param name: The name of the protected dependency.
+        :type name: str
+        :param retry_after: Seconds until the circuit allows a probe.
+        :type retry_after: float
+        """
+        self.name = name
+        self.retry_after = retry_after
+        self.message = f'{name} is temporarily unavailable'
+        super().__init__(self.message)
+
+
+class CircuitBreaker:
+    """Async circuit breaker with a per-call timeout.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast with :class:`CircuitOpenError`. Once
+    ``recovery_timeout`` has passed the circuit is half-open and lets up to
+    ``half_open_max_calls`` probes through: a successful probe closes the
+    circuit, a failed one opens it again. Calls that started before the
+    circuit last opened neither close nor reopen it when they finish.
+    """
+
+    class State(IntEnum):
+        closed = 0
+        open = 1
+        half_open = 2
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 5.0,
+        half_open_max_calls: int = 1,
+        failure_exceptions: tuple[type[BaseException], ...] = (Exception,),
+    ) -> None:
+        """Initializes the circuit breaker.
+
+        :param name: The name of the protected dependency.
+        :type name: str
+        :param timeout: Seconds a single call may take.
+        :type timeout: float
+        :param failure_threshold: Consecutive failures that open the circuit.
+        :type failure_threshold: int
+        :param recovery_timeout: Seconds the circuit stays open.
+        :type recovery_timeout: float
+        :param half_open_max_calls: Concurrent probes allowed when half-open.
+        :type half_open_max_calls: int
+        :param failure_exceptions: Exceptions that count as failures, in
+        addition to timeouts.
+        :type failure_exceptions: tuple[type[BaseException], ...]
+        """
+        self.name = name
+        self._timeout = timeout
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_max_calls = half_open_max_calls
+        self._failure_exceptions: tuple[type[BaseException], ...] = (
+            TimeoutError,
+            *failure_exceptions,
+        )
+        self._failures = 0
+        self._generation = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._state = self.State.closed
+        circuit_state.set_function(lambda: int(self.state), name=name)
+
+    @property
+    def state(self) -> State:
+        """The current state, moving from open to half-open when due."""
+        if (
+            self._state is self.State.open
+            and time.monotonic() - self._opened_at >= self._recovery_timeout
+        ):
+            self._state = self.State.half_open
+            logger.info(f'Circuit {self.name} is half-open')
+        return self._state
+
+    @property
+    def available(self) -> bool:
+        """Whether calls may reach the dependency, closed or half-open."""
+        return self.state is not self.State.open
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncGenerator[None, None]:
+        """Runs the body under the circuit with the configured timeout.
+
+        :raises CircuitOpenError: If the circuit does not allow the call.
+        :raises TimeoutError: If the body takes longer than the timeout.
+        """
+        probe = self._acquire()
+        generation = self._generation
+        try:
+            async with asyncio.timeout(self._timeout):
+                yield
+        except self._failure_exceptions:
+            self._record_failure(generation)
+            raise
+        else:
+            self._record_success(generation)
+        finally:
+            if probe:
+                self._probes -= 1
+
+    def _acquire(self) -> bool:
+        state = self.state
+        if state is self.State.closed:
+            return False
+        if (
+            state is self.State.half_open
+            and self._probes < self._half_open_max_calls
+        ):
+            self._probes += 1
+            return True
+        circuit_rejections.inc(name=self.name)
+        raise CircuitOpenError(self.name, self._retry_after())
+
+    def _retry_after(self) -> float:
+        elapsed = time.monotonic() - self._opened_at
+        return max(self._recovery_timeout - elapsed, 0.0)
+
+    def _record_success(self, generation: int) -> None:
+        if generation != self._generation:
+            return
+        if self._state is not self.State.closed:
+            logger.info(f'Circuit {self.name} is closed')
+        self._failures = 0
+        self._state = self.State.closed
+
+    def _record_failure(self, generation: int) -> None:
+        circuit_failures.inc(name=self.name)
+        if generation != self._generation:
+            return
+        self._failures += 1
+        if (
+            self._state is self.State.half_open
+            or self._failures >= self._failure_threshold
+        ):
+            if self._state is not self.State.open:
+                logger.warning(
+                    f'Circuit {self.name} is open after '
+                    f'{self._failures} failures'
+                )
+            self._state = self.State.open
+            self._opened_at = time.monotonic()
+            self._generation += 1
@@ -1,14 +1,31 @@
 from enum import StrEnum, auto
-from typing import TypeVar
-
-from pydantic import ValidationInfo, field_validator
+from typing import Any, TypeVar
+
+from pydantic import (
+    Field,
+    IPvAnyNetwork,
+    ValidationInfo,
+    field_validator,
+)
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 TSettings = TypeVar('TSettings', bound=BaseSettings)
 
+_settings: dict[type[BaseSettings], Any] = {}
+
 
 def get_settings(cls: type[TSettings]) -> TSettings:
-    return cls()
+    """Returns the settings of a class, read from the environment once.
+
+    :param cls: The settings class.
+    :type cls: type[TSettings]
+    :returns: The settings shared by every caller in the process.
+    :rtype: TSettings
+    """
+    settings = _settings.get(cls)
+    if settings is None:
+        settings = _settings[cls] = cls()
+    return settings
 
 
 class DatabaseSettings(BaseSettings):
@@ -33,8 +50,27 @@ class DatabaseSettings(BaseSettings):
     :type echo: bool, optional
     :param uri: The connection URI for connecting to the database.
     :type uri: str, optional
+    :param repository: The application repository implementation:
+    SQLAlchemy, or raw queries on an asyncpg pool.
+    :type repository: Repository, optional
+    :param pool_size: Connections in the asyncpg pool.
+    :type pool_size: int, optional
+    :param shards: URIs of the databases applications are spread over;
+    when empty they are stored in the database above, which keeps the
+    other tables either way.
+    :type shards: list[str], optional
+    :param shard_key: The application field hashed to pick a shard.
+    :type shard_key: ShardKey, optional
     """
 
+    class Repository(StrEnum):
+        sqlalchemy = auto()
+        asyncpg = auto()
+
+    class ShardKey(StrEnum):
+        id = auto()
+        user_name = auto()
+
     model_config = SettingsConfigDict(
         env_file='./.env',
         env_prefix='postgres_',
@@ -49,6 +85,10 @@ class DatabaseSettings(BaseSettings):
     db: str = 'applications'
     echo: bool = False
     uri: str = ''
+    repository: Repository = Repository.sqlalchemy
+    pool_size: int = 10
+    shards: list[str] = []
+    shard_key: ShardKey = ShardKey.id
 
     @field_validator('uri')
     @classmethod
@@ -85,6 +125,20 @@ class AppSettings(BaseSettings):
     :type host: str, optional
     :param port: The port number to listen on. Defaults to 8000.
     :type port: int, optional
+    :param workers: Worker processes of the production server; ``0`` runs
+    one per CPU available to the process.
+    :type workers: int, optional
+    :param backend: Where applications are stored and published: Postgres
+    and Kafka, or process memory for tests and local development.
+    :type backend: Backend, optional
+    :param keep_alive: Seconds an idle connection is kept open; longer than
+    the idle timeout of the load balancer in front of the service.
+    :type keep_alive: int, optional
+    :param backlog: Connections the listening socket queues before accept.
+    :type backlog: int, optional
+    :param graceful_timeout: Seconds in-flight requests are given to finish
+    after SIGTERM.
+    :type graceful_timeout: int, optional
     """
 
     class LogLevel(StrEnum):
@@ -93,6 +147,10 @@ class AppSettings(BaseSettings):
         warning = auto()
         error = auto()
 
+    class Backend(StrEnum):
+        postgres = auto()
+        memory = auto()
+
     model_config = SettingsConfigDict(
         env_file='./.env',
         env_prefix='app_',
@@ -102,7 +160,11 @@ class AppSettings(BaseSettings):
     port: int = 8000
     log_level: LogLevel
     debug_reload: bool = False
-    workers: int = 1
+    workers: int = Field(1, ge=0)
+    backend: Backend = Backend.postgres
+    keep_alive: int = 75
+    backlog: int = 2048
+    graceful_timeout: int = 30
 
 
 class KafkaSettings(BaseSettings):
@@ -150,6 +212,410 @@ class KafkaSettings(BaseSettings):
         return f'{host}:{port}'
 
 
+class SpoolSettings(BaseSettings):
+    """Pydantic model for event spool settings.
+
+    This model contains the configuration for the on-disk spool that
+    buffers events while Kafka is unavailable.
+
+    :param enabled: Whether events are spooled when Kafka is unavailable.
+    :type enabled: bool
+    :param directory: The base directory for spool segment files.
+    :type directory: str
+    :param segment_size: The size of a single segment file in bytes.
+    :type segment_size: int
+    :param max_bytes: The maximum number of pending bytes before appends
+    are delayed and eventually rejected.
+    :type max_bytes: int
+    :param fsync: When appended events are flushed to disk.
+    :type fsync: FsyncPolicy
+    :param fsync_interval: Seconds between flushes for the ``interval``
+    policy.
+    :type fsync_interval: float
+    :param backpressure_timeout: Seconds an append waits for free space.
+    :type backpressure_timeout: float
+    :param drain_interval: Seconds between attempts to replay the spool.
+    :type drain_interval: float
+    """
+
+    class FsyncPolicy(StrEnum):
+        always = auto()
+        interval = auto()
+        never = auto()
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='spool_',
+        extra='ignore',
+    )
+
+    enabled: bool = True
+    directory: str = './spool'
+    segment_size: int = 8 * 1024 * 1024
+    max_bytes: int = 256 * 1024 * 1024
+    fsync: FsyncPolicy = FsyncPolicy.interval
+    fsync_interval: float = 1.0
+    backpressure_timeout: float = 1.0
+    drain_interval: float = 1.0
+
+
+class CircuitBreakerSettings(BaseSettings):
+    """Pydantic model for circuit breaker settings.
+
+    This model contains the timeouts and thresholds of the circuit breakers
+    guarding calls to Kafka and the database.
+
+    :param kafka_timeout: Seconds a Kafka connect or publish may take.
+    :type kafka_timeout: float
+    :param database_timeout: Seconds a database session may take.
+    :type database_timeout: float
+    :param failure_threshold: Consecutive failures that open a circuit.
+    :type failure_threshold: int
+    :param recovery_timeout: Seconds an open circuit waits before probing.
+    :type recovery_timeout: float
+    :param half_open_max_calls: Concurrent probes allowed when half-open.
+    :type half_open_max_calls: int
+    """
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='breaker_',
+        extra='ignore',
+    )
+
+    kafka_timeout: float = 2.0
+    database_timeout: float = 5.0
+    failure_threshold: int = 5
+    recovery_timeout: float = 5.0
+    half_open_max_calls: int = 1
+
+
+class HealthSettings(BaseSettings):
+    """Pydantic model for health check settings.
+
+    :param interval: Seconds between readiness refreshes, and between
+    attempts to start dependencies that failed to start.
+    :type interval: float
+    :param start_timeout: Seconds starting a dependency may take.
+    :type start_timeout: float
+    """
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='health_',
+        extra='ignore',
+    )
+
+    interval: float = Field(1.0, gt=0)
+    start_timeout: float = Field(10.0, gt=0)
+
+
+class AdmissionSettings(BaseSettings):
+    """Pydantic model for admission control settings.
+
+    This model contains the concurrency budgets of the admission control
+    middleware. Reads (list) and writes (create) have separate budgets whose
+    limits adapt to observed latency (AIMD).
+
+    :param enabled: Whether admission control is enabled.
+    :type enabled: bool
+    :param read_limit: Initial concurrency limit for list requests.
+    :type read_limit: int
+    :param write_limit: Initial concurrency limit for create requests.
+    :type write_limit: int
+    :param min_limit: Lowest concurrency limit a budget shrinks to.
+    :type min_limit: int
+    :param max_limit: Highest concurrency limit a budget grows to.
+    :type max_limit: int
+    :param read_queue: Requests allowed to wait for a read slot.
+    :type read_queue: int
+    :param write_queue: Requests allowed to wait for a write slot.
+    :type write_queue: int
+    :param queue_timeout: Seconds a queued request waits for a slot.
+    :type queue_timeout: float
+    :param read_latency_target: Seconds above which list latency shrinks
+    the read limit.
+    :type read_latency_target: float
+    :param write_latency_target: Seconds above which create latency shrinks
+    the write limit.
+    :type write_latency_target: float
+    """
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='admission_',
+        extra='ignore',
+    )
+
+    enabled: bool = True
+    read_limit: int = 32
+    write_limit: int = 16
+    min_limit: int = 2
+    max_limit: int = 256
+    read_queue: int = 64
+    write_queue: int = 64
+    queue_timeout: float = 0.5
+    read_latency_target: float = 0.1
+    write_latency_target: float = 0.2
+
+
+class RateLimitSettings(BaseSettings):
+    """Pydantic model for per-client rate limiting settings.
+
+    Clients sending one of ``api_keys`` in the ``key_header`` request
+    header are identified by it, any other client by its IP address. That
+    is the peer address, unless the peer is one of ``trusted_proxies``:
+    then it is the last ``X-Forwarded-For`` address not in them. Behind a
+    load balancer, list its addresses there, or every client shares the
+    buckets of the balancer. Every client has a token bucket per route
+    policy holding up to ``burst`` tokens, refilled at ``rate`` tokens per
+    second.
+
+    :param enabled: Whether rate limiting is enabled.
+    :type enabled: bool
+    :param key_header: The header carrying the client's API key.
+    :type key_header: str
+    :param api_keys: The API keys that get buckets of their own.
+    :type api_keys: list[str]
+    :param trusted_proxies: Addresses or networks of the proxies whose
+    ``X-Forwarded-For`` header is trusted.
+    :type trusted_proxies: list[IPvAnyNetwork]
+    :param read_rate: Requests per second a client may list.
+    :type read_rate: float
+    :param read_burst: List requests a client may send at once.
+    :type read_burst: int
+    :param write_rate: Requests per second a client may create.
+    :type write_rate: float
+    :param write_burst: Create requests a client may send at once.
+    :type write_burst: int
+    :param max_clients: Client buckets kept in memory per worker.
+    :type max_clients: int
+    :param shared: Whether buckets are also kept in the shared backend, so
+    limits apply across workers and hosts.
+    :type shared: bool
+    :param cleanup_interval: Seconds between deletions of idle shared
+    buckets.
+    :type cleanup_interval: float
+    """
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='rate_limit_',
+        extra='ignore',
+    )
+
+    enabled: bool = True
+    key_header: str = 'X-API-Key'
+    api_keys: list[str] = []
+    trusted_proxies: list[IPvAnyNetwork] = []
+    read_rate: float = Field(50.0, gt=0)
+    read_burst: int = Field(100, ge=1)
+    write_rate: float = Field(5.0, gt=0)
+    write_burst: int = Field(20, ge=1)
+    max_clients: int = Field(100_000, ge=1)
+    shared: bool = False
+    cleanup_interval: float = 5 * 60
+
+
+class CompressionSettings(BaseSettings):
+    """Pydantic model for response compression settings.
+
+    Responses are encoded with the most preferred of zstd, brotli and gzip
+    the client accepts; zstd and brotli are used only when their packages
+    are installed.
+
+    :param enabled: Whether responses are compressed.
+    :type enabled: bool
+    :param minimum_size: Bytes below which a response is sent as it is.
+    :type minimum_size: int
+    :param gzip_level: The gzip compression level, from 1 to 9.
+    :type gzip_level: int
+    :param brotli_quality: The brotli quality, from 0 to 11.
+    :type brotli_quality: int
+    :param zstd_level: The zstd compression level, from 1 to 22.
+    :type zstd_level: int
+    """
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='compression_',
+        extra='ignore',
+    )
+
+    enabled: bool = True
+    minimum_size: int = Field(1024, ge=0)
+    gzip_level: int = Field(1, ge=1, le=9)
+    brotli_quality: int = Field(4, ge=0, le=11)
+    zstd_level: int = Field(3, ge=1, le=22)
+
+
+class IdempotencySettings(BaseSettings):
+    """Pydantic model for idempotency key settings.
+
+    :param ttl: Seconds an idempotency key is honored.
+    :type ttl: float
+    :param cache_size: Keys kept in the in-process LRU cache.
+    :type cache_size: int
+    :param cleanup_interval: Seconds between deletions of expired keys.
+    :type cleanup_interval: float
+    :param lock_timeout: Seconds a request waits for another request with
+    the same key before getting 409.
+    :type lock_timeout: float
+    """
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='idempotency_',
+        extra='ignore',
+    )
+
+    ttl: float = 24 * 60 * 60
+    cache_size: int = 10_000
+    cleanup_interval: float = 5 * 60
+    lock_timeout: float = Field(10.0, gt=0)
+
+
+class DeduplicationSettings(BaseSettings):
+    """Pydantic model for submission deduplication settings.
+
+    An application with the same user name and description as one created
+    less than ``window`` seconds earlier is not created again; the earlier
+    application is returned instead.
+
+    :param enabled: Whether repeated submissions are deduplicated.
+    :type enabled: bool
+    :param window: Seconds a submission suppresses its repetitions.
+    :type window: float
+    :param cache_size: Recent submissions kept in memory per worker.
+    :type cache_size: int
+    """
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='deduplication_',
+        extra='ignore',
+    )
+
+    enabled: bool = False
+    window: float = Field(10.0, gt=0)
+    cache_size: int = Field(10_000, ge=1)
+
+
+class ReadCacheSettings(BaseSettings):
+    """Pydantic model for the cache of records looked up by ID.
+
+    :param size: Records kept in the in-process LRU cache; ``0`` disables
+    the cache.
+    :type size: int
+    """
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='read_cache_',
+        extra='ignore',
+    )
+
+    size: int = Field(10_000, ge=0)
+
+
+class StreamSettings(BaseSettings):
+    """Pydantic model for the new applications stream settings.
+
+    :param queue_size: Events buffered per subscriber.
+    :type queue_size: int
+    :param slow_consumer_policy: What happens when a subscriber's buffer
+    is full: drop its oldest event, or disconnect it.
+    :type slow_consumer_policy: SlowConsumerPolicy
+    :param max_subscribers: Concurrent subscribers allowed per worker.
+    :type max_subscribers: int
+    :param heartbeat_interval: Seconds between keep-alive comments.
+    :type heartbeat_interval: float
+    """
+
+    class SlowConsumerPolicy(StrEnum):
+        drop_oldest = auto()
+        disconnect = auto()
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='stream_',
+        extra='ignore',
+    )
+
+    queue_size: int = 256
+    slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.drop_oldest
+    max_subscribers: int = 1000
+    heartbeat_interval: float = 15.0
+
+
+class ProjectionSettings(BaseSettings):
+    """Pydantic model for the applications projection consumer settings.
+
+    :param topic: The topic new applications are published to.
+    :type topic: str
+    :param group_id: The consumer group shared by all projection workers.
+    :type group_id: str
+    :param max_records: Messages fetched and upserted per batch.
+    :type max_records: int
+    :param batch_timeout_ms: Milliseconds to wait for a batch to fill.
+    :type batch_timeout_ms: int
+    :param retry_backoff: Seconds to wait before a failed batch is
+    redelivered.
+    :type retry_backoff: float
+    :param max_retries: Retries of a batch while the database is
+    unavailable, before its events are skipped.
+    :type max_retries: int
+    :param workers: Consumer processes started by the runner.
+    :type workers: int
+    """
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='projection_',
+        extra='ignore',
+    )
+
+    topic: str = 'applications'
+    group_id: str = 'applications-projection'
+    max_records: int = Field(500, ge=1, le=5000)
+    batch_timeout_ms: int = 200
+    retry_backoff: float = 1.0
+    max_retries: int = Field(60, ge=0)
+    workers: int = 1
+
+
+class ArchiveSettings(BaseSettings):
+    """Pydantic model for the archive of old applications.
+
+    :param enabled: Whether old applications are moved to archive files and
+    read through them.
+    :type enabled: bool
+    :param directory: The directory of the archive files and their index.
+    :type directory: str
+    :param max_age: Days an application stays in the database.
+    :type max_age: float
+    :param batch_size: Applications moved per batch.
+    :type batch_size: int
+    :param interval: Seconds between archival runs.
+    :type interval: float
+    :param cache_files: Decoded archive files kept in memory per worker.
+    :type cache_files: int
+    """
+
+    model_config = SettingsConfigDict(
+        env_file='./.env',
+        env_prefix='archive_',
+        extra='ignore',
+    )
+
+    enabled: bool = False
+    directory: str = './archive'
+    max_age: float = Field(365, gt=0)
+    batch_size: int = Field(10_000, ge=1)
+    interval: float = 60 * 60
+    cache_files: int = Field(16, ge=1)
+
+
 class CORSSettings(BaseSettings):
     """Pydantic model for CORS settings.
 
@@ -163,6 +629,10 @@ class CORSSettings(BaseSettings):
     :type allow_methods: list[str]
     :param allow_headers: List of headers that are allowed
     :type allow_headers: list[str]
+    :param max_age: Seconds browsers may cache a preflight response
+    :type max_age: int
+    :param preflight_cache_size: Preflight responses kept in memory
+    :type preflight_cache_size: int
     """
 
     model_config = SettingsConfigDict(
@@ -180,8 +650,9 @@ class CORSSettings(BaseSettings):
         'X-Requested-With',
         'Accept',
         'Origin',
+        'Idempotency-Key',
+        'X-API-Key',
     ]
+    max_age: int = Field(600, ge=0)
+    preflight_cache_size: int = Field(256, ge=1)
 
-
-cors_settings: CORSSettings = get_settings(CORSSettings)
-app_settings: AppSettings = get_settings(AppSettings)
@@ -1,7 +1,7 @@
 import logging
 import sys
 
-from .config import app_settings
+from .config import AppSettings, get_settings
 
 LOG_LEVEL = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
 
@@ -22,7 +22,8 @@ class LoggerSetup:
         :type level: int
         """
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(LOG_LEVEL[app_settings.log_level.value])
+        log_level = get_settings(AppSettings).log_level
+        self.logger.setLevel(LOG_LEVEL[log_level.value])
 
         if not self.logger.handlers:
             self._setup_handler()
@@ -0,0 +1,138 @@
+from typing import Callable
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+class Metric:
+    """Base class for in-process metrics with optional labels."""
+
+    type: str = 'untyped'
+
+    def __init__(self, name: str, description: str) -> None:
+        """Initializes the metric.
+
+        :param name: The metric name.
+        :type name: str
+        :param description: Human readable description of the metric.
+        :type description: str
+        """
+        self.name = name
+        self.description = description
+        self._values: dict[LabelKey, float] = {}
+        self._callbacks: dict[LabelKey, Callable[[], float]] = {}
+
+    @staticmethod
+    def _key(labels: dict[str, str]) -> LabelKey:
+        return tuple(sorted(labels.items()))
+
+    def samples(self) -> dict[LabelKey, float]:
+        """Returns the current value of every label set.
+
+        :returns: A mapping of label sets to values.
+        :rtype: dict[LabelKey, float]
+        """
+        samples = dict(self._values)
+        for key, callback in self._callbacks.items():
+            samples[key] = callback()
+        return samples
+
+    def value(self, **labels: str) -> float:
+        """Returns the current value for a label set.
+
+        :returns: The metric value, or 0 if it was never recorded.
+        :rtype: float
+        """
+        key = self._key(labels)
+        if key in self._callbacks:
+            return self._callbacks[key]()
+        return self._values.get(key, 0.0)
+
+
+class Counter(Metric):
+    """A monotonically increasing counter."""
+
+    type = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """A value that can go up and down, or be computed on scrape."""
+
+    type = 'gauge'
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def set_function(
+        self,
+        callback: Callable[[], float],
+        **labels: str,
+    ) -> None:
+        self._callbacks[self._key(labels)] = callback
+
+
+class MetricsRegistry:
+    """Registry of the metrics exposed by the current process."""
+
+    def __init__(self) -> None:
+        """Initializes an empty registry."""
+        self._metrics: dict[str, Metric] = {}
+
+    def counter(self, name: str, description: str) -> Counter:
+        """Returns the counter with the given name, creating it if needed.
+
+        :param name: The metric name.
+        :type name: str
+        :param description: Human readable description of the metric.
+        :type description: str
+        :returns: The registered counter.
+        :rtype: Counter
+        """
+        return self._register(Counter, name, description)
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        """Returns the gauge with the given name, creating it if needed.
+
+        :param name: The metric name.
+        :type name: str
+        :param description: Human readable description of the metric.
+        :type description: str
+        :returns: The registered gauge.
+        :rtype: Gauge
+        """
+        return self._register(Gauge, name, description)
+
+    def _register[T: Metric](
+        self,
+        metric_type: type[T],
+        name: str,
+        description: str,
+    ) -> T:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = metric_type(name, description)
+        if not isinstance(metric, metric_type):
+            raise TypeError(f'Metric {name} is already a {metric.type}')
+        return metric
+
+    def render(self) -> str:
+        """Renders all metrics in the Prometheus text exposition format.
+
+        :returns: The metrics as text.
+        :rtype: str
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for key, value in metric.samples().items():
+                labels = ','.join(f'{name}="{label}"' for name, label in key)
+                suffix = f'{{{labels}}}' if labels else ''
+                lines.append(f'{metric.name}{suffix} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
@@ -1,19 +1,171 @@
+from typing import AsyncIterator, NewType
+from uuid import UUID
+
 from dishka import Provider, Scope, provide
 from dishka.integrations.fastapi import (
     FastapiProvider,
 )
+from sqlalchemy import make_url
 
-from domain.entities.application import ApplicationRead
-from infrastructure.broker.kafka_publisher import KafkaEventPublisher
-from infrastructure.database.engine import SqlAlchemyEngine
+from domain.entities.application import ApplicationCreate, ApplicationRead
+from domain.exceptions import StreamUnavailableError
+from infrastructure.archive.store import ArchiveStore
+from infrastructure.broker.base import EventPublisher
+from infrastructure.broker.memory_publisher import InMemoryEventPublisher
+from infrastructure.broker.spool import EventSpool
+from infrastructure.database.engine import (
+    CONNECTION_ERRORS,
+    SqlAlchemyEngine,
+)
 from infrastructure.database.filter.application import ApplicationFilter
-from infrastructure.database.models.application import Application
+from infrastructure.database.listener import PostgresListener
+from infrastructure.database.models.application import (
+    CREATED_CHANNEL,
+    Application,
+)
+from infrastructure.database.models.projection import ApplicationProjection
+from infrastructure.database.pool import AsyncpgPool
 from infrastructure.database.repository.application import (
     ApplicationRepository,
+    ApplicationStore,
+    RawApplicationRepository,
+)
+from infrastructure.database.repository.archived import ArchivedRepository
+from infrastructure.database.repository.idempotency import (
+    IdempotencyRepository,
+    IdempotencyStore,
+)
+from infrastructure.database.repository.memory import (
+    InMemoryApplicationRepository,
+    InMemoryIdempotencyRepository,
 )
+from infrastructure.database.repository.projection import (
+    ProjectionRepository,
+)
+from infrastructure.database.repository.rate_limit import (
+    PostgresRateLimitBackend,
+)
+from infrastructure.database.repository.sharded import ShardedRepository
+from infrastructure.rate_limit.base import RateLimitBackend
+from infrastructure.rate_limit.memory import InMemoryRateLimitBackend
 from services.application import ApplicationService
+from services.deduplication import DeduplicationService
+from services.health import HealthService
+from services.idempotency import IdempotencyService
+from services.projection import ProjectionService
+from services.stream import ApplicationStreamService
+
+from .cache import LRUCache
+from .circuit_breaker import CircuitBreaker
+from .config import (
+    AppSettings,
+    ArchiveSettings,
+    CircuitBreakerSettings,
+    DatabaseSettings,
+    DeduplicationSettings,
+    HealthSettings,
+    IdempotencySettings,
+    KafkaSettings,
+    ProjectionSettings,
+    RateLimitSettings,
+    ReadCacheSettings,
+    SpoolSettings,
+    StreamSettings,
+    get_settings,
+)
+
+DatabaseBreaker = NewType('DatabaseBreaker', CircuitBreaker)
+
+
+ApplicationShards = NewType('ApplicationShards', list[ApplicationStore])
+
+
+def libpq_uri(uri: str) -> str:
+    """Returns a database URI without the SQLAlchemy driver name.
+
+    :param uri: The SQLAlchemy database URI.
+    :type uri: str
+    :returns: The URI accepted by asyncpg.
+    :rtype: str
+    """
+    url = make_url(uri).set(drivername='postgresql')
+    return url.render_as_string(hide_password=False)
+
+
+def database_breaker(
+    name: str,
+    breaker_settings: CircuitBreakerSettings,
+) -> CircuitBreaker:
+    """Returns a circuit breaker for a database.
+
+    :param name: The name of the database in metrics and errors.
+    :type name: str
+    :param breaker_settings: The circuit breaker settings.
+    :type breaker_settings: CircuitBreakerSettings
+    :returns: The circuit breaker.
+    :rtype: CircuitBreaker
+    """
+    return CircuitBreaker(
+        name,
+        breaker_settings.database_timeout,
+        breaker_settings.failure_threshold,
+        breaker_settings.recovery_timeout,
+        breaker_settings.half_open_max_calls,
+        CONNECTION_ERRORS,
+    )
+
+
+def deduplication(
+    repository: ApplicationStore,
+    deduplication_settings: DeduplicationSettings,
+) -> DeduplicationService | None:
+    """Returns the deduplication of submissions, if it is enabled.
 
-from .config import DatabaseSettings, KafkaSettings, get_settings
+    :param repository: The application repository.
+    :type repository: ApplicationStore
+    :param deduplication_settings: The deduplication settings.
+    :type deduplication_settings: DeduplicationSettings
+    :returns: The deduplication service, or None.
+    :rtype: DeduplicationService | None
+    """
+    if not deduplication_settings.enabled:
+        return None
+    return DeduplicationService(
+        repository,
+        ApplicationRead,
+        deduplication_settings.window,
+        deduplication_settings.cache_size,
+    )
+
+
+def idempotency(
+    repository: IdempotencyStore,
+    idempotency_settings: IdempotencySettings,
+) -> IdempotencyService[ApplicationCreate, ApplicationRead]:
+    """Returns the idempotency of application submissions.
+
+    :param repository: The idempotency key store.
+    :type repository: IdempotencyStore
+    :param idempotency_settings: The idempotency settings.
+    :type idempotency_settings: IdempotencySettings
+    :returns: The idempotency service.
+    :rtype: IdempotencyService[ApplicationCreate, ApplicationRead]
+    """
+    return IdempotencyService(
+        repository,
+        ApplicationRead,
+        idempotency_settings.ttl,
+        idempotency_settings.cache_size,
+        idempotency_settings.cleanup_interval,
+    )
+
+
+class CircuitBreakerProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_circuit_breaker_settings(self) -> CircuitBreakerSettings:
+        return get_settings(CircuitBreakerSettings)
 
 
 class SqlAlchemyProvider(Provider):
@@ -23,15 +175,40 @@ class SqlAlchemyProvider(Provider):
     def get_database_settings(self) -> DatabaseSettings:
         return get_settings(DatabaseSettings)
 
+    @provide
+    def breaker(
+        self,
+        breaker_settings: CircuitBreakerSettings,
+    ) -> DatabaseBreaker:
+        return DatabaseBreaker(database_breaker('database', breaker_settings))
+
     @provide
     async def engine(
         self,
         database_settings: DatabaseSettings,
-    ) -> SqlAlchemyEngine:
-        return SqlAlchemyEngine(
+        breaker: DatabaseBreaker,
+    ) -> AsyncIterator[SqlAlchemyEngine]:
+        engine = SqlAlchemyEngine(
             database_settings.uri,
             database_settings.echo,
+            breaker,
+        )
+        yield engine
+        await engine.close()
+
+    @provide
+    async def pool(
+        self,
+        database_settings: DatabaseSettings,
+        breaker: DatabaseBreaker,
+    ) -> AsyncIterator[AsyncpgPool]:
+        pool = AsyncpgPool(
+            libpq_uri(database_settings.uri),
+            max_size=database_settings.pool_size,
+            breaker=breaker,
         )
+        yield pool
+        await pool.close()
 
 
 class KafkaProvider(Provider):
@@ -41,41 +218,393 @@ class KafkaProvider(Provider):
     def get_kafka_settings(self) -> KafkaSettings:
         return get_settings(KafkaSettings)
 
+    @provide
+    def get_spool_settings(self) -> SpoolSettings:
+        return get_settings(SpoolSettings)
+
     @provide
     async def kafka_event_publisher(
         self,
         kafka_settings: KafkaSettings,
-    ) -> KafkaEventPublisher:
-        return KafkaEventPublisher(kafka_settings.uri)
+        spool_settings: SpoolSettings,
+        breaker_settings: CircuitBreakerSettings,
+    ) -> AsyncIterator[EventPublisher]:
+        from aiokafka.errors import KafkaError
+
+        from infrastructure.broker.kafka_publisher import KafkaEventPublisher
+
+        breaker = CircuitBreaker(
+            'kafka',
+            breaker_settings.kafka_timeout,
+            breaker_settings.failure_threshold,
+            breaker_settings.recovery_timeout,
+            breaker_settings.half_open_max_calls,
+            (KafkaError,),
+        )
+        spool = None
+        if spool_settings.enabled:
+            spool = EventSpool(
+                spool_settings.directory,
+                spool_settings.segment_size,
+                spool_settings.max_bytes,
+                spool_settings.fsync,
+                spool_settings.fsync_interval,
+                spool_settings.backpressure_timeout,
+            )
+        publisher = KafkaEventPublisher(
+            kafka_settings.uri,
+            breaker,
+            spool,
+            spool_settings.drain_interval,
+        )
+        yield publisher
+        await publisher.close()
+
+
+class IdempotencyProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_idempotency_settings(self) -> IdempotencySettings:
+        return get_settings(IdempotencySettings)
+
+    @provide
+    async def repository(
+        self,
+        engine: SqlAlchemyEngine,
+        idempotency_settings: IdempotencySettings,
+    ) -> IdempotencyRepository:
+        return IdempotencyRepository(
+            engine, idempotency_settings.lock_timeout
+        )
+
+    @provide
+    async def service(
+        self,
+        repository: IdempotencyRepository,
+        idempotency_settings: IdempotencySettings,
+    ) -> IdempotencyService[ApplicationCreate, ApplicationRead]:
+        return idempotency(repository, idempotency_settings)
+
+
+class RateLimitProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_rate_limit_settings(self) -> RateLimitSettings:
+        return get_settings(RateLimitSettings)
+
+    @provide
+    def backend(
+        self,
+        engine: SqlAlchemyEngine,
+        rate_limit_settings: RateLimitSettings,
+    ) -> RateLimitBackend:
+        idle_timeout = max(
+            rate_limit_settings.read_burst / rate_limit_settings.read_rate,
+            rate_limit_settings.write_burst / rate_limit_settings.write_rate,
+        )
+        return PostgresRateLimitBackend(
+            engine,
+            idle_timeout,
+            rate_limit_settings.cleanup_interval,
+        )
 
 
 class ApplicationProvider(Provider):
-    @provide(scope=Scope.APP)
+    scope = Scope.APP
+
+    @provide
+    def get_read_cache_settings(self) -> ReadCacheSettings:
+        return get_settings(ReadCacheSettings)
+
+    @provide
+    def get_archive_settings(self) -> ArchiveSettings:
+        return get_settings(ArchiveSettings)
+
+    @provide
+    def get_deduplication_settings(self) -> DeduplicationSettings:
+        return get_settings(DeduplicationSettings)
+
+    @provide
     async def filter(self) -> ApplicationFilter:
         return ApplicationFilter(Application)
 
-    @provide(scope=Scope.REQUEST)
+    @provide
+    async def shards(
+        self,
+        database_settings: DatabaseSettings,
+        breaker_settings: CircuitBreakerSettings,
+        filter: ApplicationFilter,
+    ) -> AsyncIterator[ApplicationShards]:
+        repository = database_settings.repository
+        raw = repository is DatabaseSettings.Repository.asyncpg
+        shards: list[ApplicationStore] = []
+        resources: list[SqlAlchemyEngine | AsyncpgPool] = []
+        for index, uri in enumerate(database_settings.shards):
+            breaker = database_breaker(
+                f'database-shard-{index}', breaker_settings
+            )
+            if raw:
+                pool = AsyncpgPool(
+                    libpq_uri(uri),
+                    max_size=database_settings.pool_size,
+                    breaker=breaker,
+                )
+                resources.append(pool)
+                shards.append(
+                    RawApplicationRepository(pool, Application, filter, True)
+                )
+            else:
+                engine = SqlAlchemyEngine(uri, database_settings.echo, breaker)
+                resources.append(engine)
+                shards.append(
+                    ApplicationRepository(engine, Application, filter, True)
+                )
+        yield ApplicationShards(shards)
+        for resource in resources:
+            await resource.close()
+
+    @provide
     async def repository(
         self,
+        database_settings: DatabaseSettings,
+        archive_settings: ArchiveSettings,
         engine: SqlAlchemyEngine,
+        pool: AsyncpgPool,
+        shards: ApplicationShards,
         filter: ApplicationFilter,
-    ) -> ApplicationRepository:
-        return ApplicationRepository(engine, Application, filter)
+    ) -> ApplicationStore:
+        ordered = archive_settings.enabled
+        kind = database_settings.repository
+        raw = kind is DatabaseSettings.Repository.asyncpg
+        repository: ApplicationStore
+        if shards:
+            repository = ShardedRepository(shards, database_settings.shard_key)
+        elif raw:
+            repository = RawApplicationRepository(
+                pool, Application, filter, ordered
+            )
+        else:
+            repository = ApplicationRepository(
+                engine, Application, filter, ordered
+            )
+        if not archive_settings.enabled:
+            return repository
+        archive = ArchiveStore(
+            archive_settings.directory,
+            ApplicationRead,
+            archive_settings.cache_files,
+        )
+        return ArchivedRepository(repository, archive, filter)
 
-    @provide(scope=Scope.REQUEST)
+    @provide
     async def service(
         self,
-        repository: ApplicationRepository,
-        kafka_event_publisher: KafkaEventPublisher,
+        repository: ApplicationStore,
+        event_publisher: EventPublisher,
+        idempotency: IdempotencyService[ApplicationCreate, ApplicationRead],
+        read_cache_settings: ReadCacheSettings,
+        deduplication_settings: DeduplicationSettings,
+    ) -> ApplicationService:
+        cache: LRUCache[UUID, ApplicationRead] | None = None
+        if read_cache_settings.size:
+            cache = LRUCache('applications', read_cache_settings.size)
+        return ApplicationService(
+            repository,
+            ApplicationRead,
+            event_publisher,
+            idempotency,
+            cache,
+            deduplication(repository, deduplication_settings),
+        )
+
+
+class StreamProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_stream_settings(self) -> StreamSettings:
+        return get_settings(StreamSettings)
+
+    @provide
+    async def stream(
+        self,
+        database_settings: DatabaseSettings,
+        stream_settings: StreamSettings,
+        filter: ApplicationFilter,
+    ) -> AsyncIterator[ApplicationStreamService]:
+        listeners = [
+            PostgresListener(
+                libpq_uri(uri),
+                CREATED_CHANNEL,
+                Application.__table__,
+            )
+            for uri in database_settings.shards or [database_settings.uri]
+        ]
+        stream = ApplicationStreamService(
+            listeners,
+            filter,
+            ApplicationRead,
+            stream_settings.queue_size,
+            stream_settings.slow_consumer_policy,
+            stream_settings.max_subscribers,
+            stream_settings.heartbeat_interval,
+        )
+        yield stream
+        await stream.close()
+
+
+class ProjectionProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_projection_settings(self) -> ProjectionSettings:
+        return get_settings(ProjectionSettings)
+
+    @provide
+    async def repository(
+        self,
+        engine: SqlAlchemyEngine,
+    ) -> ProjectionRepository:
+        return ProjectionRepository(engine, ApplicationProjection)
+
+    @provide
+    async def service(
+        self,
+        repository: ProjectionRepository,
+        projection_settings: ProjectionSettings,
+    ) -> ProjectionService:
+        return ProjectionService(
+            repository,
+            projection_settings.retry_backoff,
+            projection_settings.max_retries,
+        )
+
+
+class HealthProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_health_settings(self) -> HealthSettings:
+        return get_settings(HealthSettings)
+
+    @provide
+    async def health(
+        self,
+        health_settings: HealthSettings,
+        repository: ApplicationStore,
+        event_publisher: EventPublisher,
+    ) -> AsyncIterator[HealthService]:
+        health = HealthService(
+            {'database': repository, 'broker': event_publisher},
+            health_settings.interval,
+            health_settings.start_timeout,
+        )
+        yield health
+        await health.close()
+
+
+class InMemoryBrokerProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def event_publisher(self) -> EventPublisher:
+        return InMemoryEventPublisher()
+
+
+class InMemoryRateLimitProvider(Provider):
+    scope = Scope.APP
+
+    @provide(provides=RateLimitBackend)
+    def backend(self) -> InMemoryRateLimitBackend:
+        return InMemoryRateLimitBackend(
+            get_settings(RateLimitSettings).max_clients
+        )
+
+
+class InMemoryApplicationProvider(Provider):
+    scope = Scope.APP
+
+    @provide(provides=ApplicationStore)
+    def repository(self) -> InMemoryApplicationRepository:
+        return InMemoryApplicationRepository()
+
+    @provide
+    def service(
+        self,
+        repository: ApplicationStore,
+        event_publisher: EventPublisher,
     ) -> ApplicationService:
         return ApplicationService(
-            repository, ApplicationRead, kafka_event_publisher
+            repository,
+            ApplicationRead,
+            event_publisher,
+            idempotency(
+                InMemoryIdempotencyRepository(),
+                get_settings(IdempotencySettings),
+            ),
+            deduplication=deduplication(
+                repository, get_settings(DeduplicationSettings)
+            ),
         )
 
 
+class InMemoryStreamProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def stream(self) -> ApplicationStreamService:
+        raise StreamUnavailableError()
+
+
 providers = [
+    CircuitBreakerProvider(),
     SqlAlchemyProvider(),
     KafkaProvider(),
+    IdempotencyProvider(),
+    RateLimitProvider(),
     ApplicationProvider(),
+    StreamProvider(),
+    HealthProvider(),
     FastapiProvider(),
 ]
+
+memory_providers = [
+    InMemoryBrokerProvider(),
+    InMemoryRateLimitProvider(),
+    InMemoryApplicationProvider(),
+    InMemoryStreamProvider(),
+    HealthProvider(),
+    FastapiProvider(),
+]
+
+
+def get_consumer_providers() -> list[Provider]:
+    """Returns the providers of the projection consumer.
+
+    FastStream is imported here rather than with the module, since the
+    API processes never load it.
+
+    :returns: The dependency injection providers.
+    :rtype: list[Provider]
+    """
+    from dishka.integrations.faststream import FastStreamProvider
+
+    return [
+        CircuitBreakerProvider(),
+        SqlAlchemyProvider(),
+        ProjectionProvider(),
+        FastStreamProvider(),
+    ]
+
+
+def get_providers() -> list[Provider]:
+    """Returns the providers for the configured application backend.
+
+    :returns: The dependency injection providers.
+    :rtype: list[Provider]
+    """
+    if get_settings(AppSettings).backend is AppSettings.Backend.memory:
+        return memory_providers
+    return providers
@@ -1,16 +1,19 @@
-from datetime import datetime
-from uuid import UUID, uuid4
+from datetime import UTC, datetime
+from functools import partial
+from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from domain.ids import uuid7
+
 from .base import BaseEntity
 
 
 class ApplicationCreate(BaseModel):
-    id: UUID = Field(default_factory=uuid4)
+    id: UUID = Field(default_factory=uuid7)
     user_name: str
     description: str
-    created_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=partial(datetime.now, UTC))
 
 
 class ApplicationRead(BaseEntity, ApplicationCreate):
@@ -1,6 +1,8 @@
-from typing import Any
+from functools import cache
+from types import GenericAlias
+from typing import Any, Self
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
 
 
 class BaseEntity(BaseModel):
@@ -9,12 +11,56 @@ class BaseEntity(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     @classmethod
-    def from_list(cls, obj: Any) -> list[BaseModel]:
+    @cache
+    def partial(cls, fields: frozenset[str]) -> type['BaseEntity']:
+        """Returns an entity with only the given fields, cached per set.
+
+        :param fields: The names of the fields to keep.
+        :type fields: frozenset[str]
+        :returns: The partial entity class.
+        :rtype: type[BaseEntity]
+        """
+        kept = {
+            name: (info.annotation, info)
+            for name, info in cls.model_fields.items()
+            if name in fields
+        }
+        name = f'{cls.__name__}[{",".join(kept)}]'
+        return create_model(name, __base__=BaseEntity, **kept)
+
+    @classmethod
+    @cache
+    def list_adapter(cls) -> TypeAdapter[list[Self]]:
+        """Returns the cached type adapter for a list of entities.
+
+        :returns: The type adapter for ``list[cls]``.
+        :rtype: TypeAdapter[list[Self]]
+        """
+        # Built as an alias object, since type checkers reject ``list[cls]``
+        # for a class only known at runtime.
+        return TypeAdapter(GenericAlias(list, (cls,)))
+
+    @classmethod
+    def from_list(cls, obj: Any) -> list[Self]:
         """Creates a list of entities from a list of objects.
 
+        The whole list is validated in a single call, so rows or mappings
+        are converted without a Python-level loop.
+
         :param obj: The list of objects to convert.
         :type obj: Any
         :returns: A list of entities.
-        :rtype: list[BaseModel]
+        :rtype: list[Self]
+        """
+        return cls.list_adapter().validate_python(obj)
+
+    @classmethod
+    def dump_list_json(cls, entities: list[Self]) -> bytes:
+        """Serializes a list of entities to JSON in a single call.
+
+        :param entities: The entities to serialize.
+        :type entities: list[Self]
+        :returns: The encoded JSON array.
+        :rtype: bytes
         """
-        return [cls.model_validate(item) for item in obj]
+        return cls.list_adapter().dump_json(entities)
@@ -1,7 +1,12 @@
+from datetime import UTC, datetime
+from typing import Any, Literal
+from uuid import UUID
+
 from pydantic import BaseModel, Field, ValidationInfo, field_validator
 
 MAX_PER_PAGE = 50
 MIN_PER_PAGE = 25
+MAX_IDS = 100
 
 
 class BaseQuery(BaseModel):
@@ -17,6 +22,18 @@ class BaseQuery(BaseModel):
         default=None,
         description='Page number to retrieve.',
     )
+    fields: tuple[str, ...] | None = Field(
+        default=None,
+        description='Comma-separated fields to return (all by default).',
+    )
+    ids: tuple[UUID, ...] | None = Field(
+        default=None,
+        max_length=MAX_IDS,
+        description=(
+            f'Comma-separated IDs to look up (max {MAX_IDS}); filters and '
+            'pagination are ignored.'
+        ),
+    )
 
     @field_validator('size')
     @classmethod
@@ -44,9 +61,71 @@ class BaseQuery(BaseModel):
         """
         return (value - 1) * values.data['size'] if value else None
 
+    @field_validator('fields', 'ids', mode='before')
+    @classmethod
+    def split_fields(cls, value: Any) -> tuple[str, ...] | None:
+        """Splits comma-separated lists and drops duplicates.
+
+        :param value: The raw list, as one or more query values.
+        :type value: Any
+        :returns: The requested field names or IDs, or None for none.
+        :rtype: tuple[str, ...] | None
+        """
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = [value]
+        names = (
+            name.strip() for item in value for name in str(item).split(',')
+        )
+        return tuple(dict.fromkeys(name for name in names if name)) or None
+
+
+ApplicationField = Literal['id', 'user_name', 'description', 'created_at']
+
 
 class ApplicationQuery(BaseQuery):
+    fields: tuple[ApplicationField, ...] | None = Field(
+        default=None,
+        description='Comma-separated fields to return (all by default).',
+    )
     user_name: str | None = Field(
         description='Match against user_name using operator.',
         default=None,
     )
+    created_after: datetime | None = Field(
+        default=None,
+        description='Only applications created at or after this time.',
+    )
+    created_before: datetime | None = Field(
+        default=None,
+        description='Only applications created before this time.',
+    )
+
+    @field_validator('created_after', 'created_before')
+    @classmethod
+    def as_utc(cls, value: datetime | None) -> datetime | None:
+        """Makes times without a time zone UTC, like the database does.
+
+        :param value: The time.
+        :type value: datetime | None
+        :returns: The time with a time zone.
+        :rtype: datetime | None
+        """
+        if value is None or value.tzinfo is not None:
+            return value
+        return value.replace(tzinfo=UTC)
+
+    def in_created_range(self, created_at: datetime) -> bool:
+        """Checks whether a creation time is within the queried range.
+
+        :param created_at: The creation time; UTC if it has no time zone.
+        :type created_at: datetime
+        :returns: Whether the time is within the range.
+        :rtype: bool
+        """
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=UTC)
+        if self.created_after is not None and created_at < self.created_after:
+            return False
+        return self.created_before is None or created_at < self.created_before
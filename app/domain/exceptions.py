@@ -5,3 +5,49 @@ class NotFoundError(Exception):
         """Initializes the exception."""
         self.message = 'Not Found'
         super().__init__(self.message)
+
+
+class ArchivedError(Exception):
+    """Raised when an archived entity would be modified."""
+
+    def __init__(self) -> None:
+        """Initializes the exception."""
+        self.message = 'Archived records cannot be modified'
+        super().__init__(self.message)
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when an idempotency key is reused with a different request."""
+
+    def __init__(self) -> None:
+        """Initializes the exception."""
+        self.message = 'Idempotency key was used with a different request'
+        super().__init__(self.message)
+
+
+class IdempotencyKeyInProgressError(Exception):
+    """Raised when another request with the same idempotency key is still
+    being processed."""
+
+    def __init__(self) -> None:
+        """Initializes the exception."""
+        self.message = 'A request with this idempotency key is in progress'
+        super().__init__(self.message)
+
+
+class StreamUnavailableError(Exception):
+    """Raised when the configured backend cannot stream new records."""
+
+    def __init__(self) -> None:
+        """Initializes the exception."""
+        self.message = 'Streaming needs the Postgres backend'
+        super().__init__(self.message)
+
+
+class TooManySubscribersError(Exception):
+    """Raised when a stream has reached its subscriber limit."""
+
+    def __init__(self) -> None:
+        """Initializes the exception."""
+        self.message = 'Too many stream subscribers'
+        super().__init__(self.message)
@@ -0,0 +1,28 @@
+import secrets
+import time
+from uuid import UUID
+
+_last_stamp = 0
+
+
+def uuid7() -> UUID:
+    """Generates a time-ordered UUID, version 7 of RFC 9562.
+
+    The first 48 bits are the Unix time in milliseconds and the next 12 a
+    sequence within the millisecond, so IDs generated by a process sort in
+    generation order and inserts land at the right edge of a primary key
+    index instead of on random pages. The remaining 62 bits are random.
+
+    :returns: The UUID.
+    :rtype: UUID
+    """
+    global _last_stamp
+    stamp = max(time.time_ns() // 1_000_000 << 12, _last_stamp + 1)
+    _last_stamp = stamp
+    return UUID(
+        int=(stamp >> 12) << 80
+        | 0x7 << 76
+        | (stamp & 0xFFF) << 64
+        | 0b10 << 62
+        | secrets.randbits(62)
+    )
@@ -0,0 +1,312 @@
+import asyncio
+import gzip
+import os
+from datetime import datetime
+from pathlib import Path
+from types import GenericAlias
+from typing import Any, Iterable, Sequence
+from uuid import UUID
+
+from pydantic import BaseModel, TypeAdapter
+
+from core.cache import LRUCache
+from core.logger import get_logger
+from core.metrics import metrics
+
+logger = get_logger(__name__)
+
+archive_file_reads = metrics.counter(
+    'archive_file_reads_total',
+    'Archive files read from disk and decoded.',
+)
+
+INDEX = 'index.json'
+SUFFIX = '.ndjson.gz'
+
+
+class ArchiveEntry(BaseModel):
+    """An archive file and the ranges of creation times and IDs it holds.
+
+    An entry is pending from the time its file is written until its records
+    are deleted from the database. Readers read pending files too, so that
+    records are not missing in between, and drop the records they also
+    found in the database. Entries written before ID ranges were recorded
+    have none and may hold any ID.
+    """
+
+    path: str
+    shard: int
+    count: int
+    min_created_at: datetime
+    max_created_at: datetime
+    min_id: UUID | None = None
+    max_id: UUID | None = None
+    pending: bool = True
+
+    def overlaps(
+        self,
+        created_after: datetime | None,
+        created_before: datetime | None,
+    ) -> bool:
+        """Checks whether the file may hold records in a range.
+
+        :param created_after: The inclusive lower bound, if any.
+        :type created_after: datetime | None
+        :param created_before: The exclusive upper bound, if any.
+        :type created_before: datetime | None
+        :returns: Whether the ranges overlap.
+        :rtype: bool
+        """
+        if created_after is not None and self.max_created_at < created_after:
+            return False
+        return created_before is None or self.min_created_at < created_before
+
+    def holds(self, entity_id: UUID) -> bool:
+        """Checks whether the file may hold a record with an ID.
+
+        :param entity_id: The ID of the record.
+        :type entity_id: UUID
+        :returns: Whether the ID is in the range of the file.
+        :rtype: bool
+        """
+        if self.min_id is None or self.max_id is None:
+            return True
+        return self.min_id <= entity_id <= self.max_id
+
+    def within(
+        self,
+        created_after: datetime | None,
+        created_before: datetime | None,
+    ) -> bool:
+        """Checks whether every record of the file is in a range.
+
+        :param created_after: The inclusive lower bound, if any.
+        :type created_after: datetime | None
+        :param created_before: The exclusive upper bound, if any.
+        :type created_before: datetime | None
+        :returns: Whether the file lies within the range.
+        :rtype: bool
+        """
+        if created_after is not None and self.min_created_at < created_after:
+            return False
+        return created_before is None or self.max_created_at < created_before
+
+
+entries_adapter = TypeAdapter(list[ArchiveEntry])
+
+
+class ArchiveStore[ReadSchemaType: BaseModel]:
+    """Compressed, time-partitioned files of records moved out of a table.
+
+    Records are written as gzip-compressed newline-delimited JSON, one
+    directory per month of ``created_at``, each file sorted by
+    ``(created_at, id)``. ``index.json`` lists every file with its record
+    count and its minimum and maximum ``created_at``, so readers open only
+    the files overlapping the time range of a query. The index is replaced
+    atomically and reloaded by readers when it changes on disk; decoded
+    files are kept in an LRU cache.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        read_schema: type[ReadSchemaType],
+        cache_files: int,
+    ) -> None:
+        """Initializes the store.
+
+        :param directory: The directory of the files and their index.
+        :type directory: str | Path
+        :param read_schema: The schema of the archived records.
+        :type read_schema: type[ReadSchemaType]
+        :param cache_files: Decoded files kept in memory.
+        :type cache_files: int
+        """
+        self._directory = Path(directory)
+        self._index = self._directory / INDEX
+        self._adapter: TypeAdapter[list[ReadSchemaType]] = TypeAdapter(
+            GenericAlias(list, (read_schema,))
+        )
+        self._files: LRUCache[str, list[ReadSchemaType]] = LRUCache(
+            'archive', cache_files
+        )
+        self._entries: list[ArchiveEntry] = []
+        self._stamp: tuple[int, int] | None = None
+
+    def entries(
+        self,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> list[ArchiveEntry]:
+        """Returns the files overlapping a range of creation times.
+
+        Pending files are included; their records may still be in the
+        database too.
+
+        :param created_after: The inclusive lower bound, if any.
+        :type created_after: datetime | None
+        :param created_before: The exclusive upper bound, if any.
+        :type created_before: datetime | None
+        :returns: The entries, ordered by their minimum ``created_at``.
+        :rtype: list[ArchiveEntry]
+        """
+        return [
+            entry
+            for entry in self._load()
+            if entry.overlaps(created_after, created_before)
+        ]
+
+    def pending(self) -> list[ArchiveEntry]:
+        """Returns the files whose records may still be in the database.
+
+        :returns: The pending entries.
+        :rtype: list[ArchiveEntry]
+        """
+        return [entry for entry in self._load() if entry.pending]
+
+    def _load(self) -> list[ArchiveEntry]:
+        """Returns the index, read again if the file changed.
+
+        :returns: Every entry, ordered by its minimum ``created_at``.
+        :rtype: list[ArchiveEntry]
+        """
+        try:
+            status = os.stat(self._index)
+        except FileNotFoundError:
+            self._entries, self._stamp = [], None
+            return self._entries
+        stamp = (status.st_mtime_ns, status.st_ino)
+        if stamp != self._stamp:
+            self._entries = sorted(
+                entries_adapter.validate_json(self._index.read_bytes()),
+                key=lambda entry: entry.min_created_at,
+            )
+            self._stamp = stamp
+        return self._entries
+
+    async def read(self, entry: ArchiveEntry) -> list[ReadSchemaType]:
+        """Returns the records of a file.
+
+        :param entry: The entry of the file.
+        :type entry: ArchiveEntry
+        :returns: The records, ordered by ``(created_at, id)``.
+        :rtype: list[ReadSchemaType]
+        """
+        records = self._files.get(entry.path)
+        if records is None:
+            records = await asyncio.to_thread(self._read, entry.path)
+            self._files.set(entry.path, records)
+        return records
+
+    def _read(self, path: str) -> list[ReadSchemaType]:
+        data = gzip.decompress((self._directory / path).read_bytes())
+        lines = data.splitlines()
+        archive_file_reads.inc()
+        return self._adapter.validate_json(b'[' + b','.join(lines) + b']')
+
+    async def find(
+        self,
+        entity_ids: Iterable[UUID],
+    ) -> list[ReadSchemaType]:
+        """Returns the archived records with any of the given IDs.
+
+        Only the files whose ID range holds one of the IDs are read, so
+        IDs that were never archived rarely cost a file read. Pending files
+        are searched too; callers look IDs up in the database first.
+
+        :param entity_ids: The IDs of the records.
+        :type entity_ids: Iterable[UUID]
+        :returns: The records found.
+        :rtype: list[ReadSchemaType]
+        """
+        missing = set(entity_ids)
+        found: list[ReadSchemaType] = []
+        for entry in self._load():
+            if not missing:
+                break
+            if not any(entry.holds(entity_id) for entity_id in missing):
+                continue
+            for record in await self.read(entry):
+                if record.id in missing:
+                    missing.discard(record.id)
+                    found.append(record)
+        return found
+
+    async def write(
+        self,
+        records: Sequence[ReadSchemaType],
+        shard: int,
+    ) -> ArchiveEntry:
+        """Writes records to a new file and adds it to the index as pending.
+
+        :param records: Records of one month, ordered by
+        ``(created_at, id)``.
+        :type records: Sequence[ReadSchemaType]
+        :param shard: The database the records are moved from.
+        :type shard: int
+        :returns: The pending entry of the file.
+        :rtype: ArchiveEntry
+        """
+        first, last = records[0], records[-1]
+        ids = [record.id for record in records]
+        entry = ArchiveEntry(
+            path=f'{first.created_at:%Y-%m}/{first.id}{SUFFIX}',
+            shard=shard,
+            count=len(records),
+            min_created_at=first.created_at,
+            max_created_at=last.created_at,
+            min_id=min(ids),
+            max_id=max(ids),
+        )
+        data = b'\n'.join(
+            record.model_dump_json().encode() for record in records
+        )
+        await asyncio.to_thread(
+            self._replace, self._directory / entry.path, gzip.compress(data)
+        )
+        await self._save([*self._load(), entry])
+        logger.info(f'Archived {entry.count} records to {entry.path}')
+        return entry
+
+    async def complete(self, entry: ArchiveEntry) -> None:
+        """Marks a file as complete once its records left the database.
+
+        :param entry: The pending entry of the file.
+        :type entry: ArchiveEntry
+        """
+        await self._save(
+            [
+                item.model_copy(update={'pending': False})
+                if item.path == entry.path
+                else item
+                for item in self._load()
+            ]
+        )
+
+    async def _save(self, entries: list[ArchiveEntry]) -> None:
+        await asyncio.to_thread(
+            self._replace, self._index, entries_adapter.dump_json(entries)
+        )
+        self._load()
+
+    @staticmethod
+    def _replace(path: Path, data: Any) -> None:
+        """Writes a file atomically, replacing any previous version.
+
+        :param path: The path of the file.
+        :type path: Path
+        :param data: The content of the file.
+        :type data: Any
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f'.{path.name}.tmp')
+        with open(temporary, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+        directory = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
@@ -3,11 +3,36 @@ from traceback import TracebackException
 from typing import Any, Self, Type
 
 
+class BrokerConnectionError(Exception):
+    """Raised when the message broker cannot be reached and events are not
+    spooled."""
+
+    def __init__(self) -> None:
+        """Initializes the exception."""
+        self.message = 'Unable to connect to the message broker'
+        super().__init__(self.message)
+
+
 class EventPublisher(ABC):
     """
     Abstract interface for publishing events/messages to a message broker.
     """
 
+    async def start(self) -> None:
+        """Connect ahead of the first publish and keep the connection open.
+
+        Implementations without a connection to set up do nothing.
+        """
+        pass
+
+    @property
+    def ready(self) -> bool:
+        """Whether published events are currently accepted.
+
+        Implementations without a connection are always ready.
+        """
+        return True
+
     @abstractmethod
     async def __aenter__(self) -> Self:
         """Connect to the message broker."""
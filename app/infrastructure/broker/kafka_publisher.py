@@ -1,32 +1,103 @@
+import asyncio
 from traceback import TracebackException
-from typing import Any, Self, Type
+from typing import Any, NoReturn, Self, Type
 
+from aiokafka.errors import KafkaConnectionError, KafkaError
 from faststream.kafka import KafkaBroker
 
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError
 from core.logger import get_logger
 
-from .base import EventPublisher
+from .base import BrokerConnectionError, EventPublisher
+from .spool import EventSpool
 
 logger = get_logger(__name__)
 
+UNAVAILABLE_ERRORS = (KafkaError, TimeoutError, CircuitOpenError)
+
 
 class KafkaEventPublisher(EventPublisher):
-    """Kafka implementation of the EventPublisher interface."""
+    """Kafka implementation of the EventPublisher interface.
+
+    When a spool is configured, events that cannot be delivered are
+    appended to it instead of failing the request. While the spool holds
+    events, new ones are appended behind them so ordering is preserved, and
+    a background drainer replays them once the broker is reachable again.
+
+    After ``start`` the producer stays connected between publishes and is
+    only stopped, flushing the messages it still buffers, by ``close``.
+    Without it every ``async with`` block connects and stops the producer.
+    """
 
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        breaker: CircuitBreaker,
+        spool: EventSpool | None = None,
+        drain_interval: float = 1.0,
+    ):
         """Initialize the KafkaEventPublisher.
 
         :param url: The Kafka broker URL.
         :type url: str
+        :param breaker: The circuit breaker guarding broker calls.
+        :type breaker: CircuitBreaker
+        :param spool: The spool to fall back to when Kafka is unavailable.
+        :type spool: EventSpool | None
+        :param drain_interval: Seconds between attempts to replay the spool.
+        :type drain_interval: float
         """
         self._broker = KafkaBroker(url)
+        self._breaker = breaker
+        self._spool = spool
+        self._drain_interval = drain_interval
+        self._drainer: asyncio.Task[None] | None = None
+        self._unavailable = False
+        self._started = False
+        self._connected = False
+
+    @property
+    def _spooling(self) -> bool:
+        return self._spool is not None and (
+            self._unavailable or not self._spool.is_empty
+        )
+
+    @property
+    def ready(self) -> bool:
+        """Whether events are accepted: the producer is connected and its
+        circuit lets calls through, or events are appended to the spool."""
+        if self._spooling:
+            return True
+        return self._connected and self._breaker.available
+
+    async def start(self) -> None:
+        """Connect to the Kafka broker and keep the producer connected."""
+        self._started = True
+        await self._connect()
 
     async def __aenter__(self) -> Self:
         """Connect to the Kafka broker."""
+        if not (self._started and self._connected):
+            await self._connect()
+        return self
+
+    async def _connect(self) -> None:
+        if self._spooling:
+            self._ensure_drainer()
+            return
         logger.info('Attempting to connect to Kafka broker')
-        await self._broker.connect()
+        try:
+            async with self._breaker.guard():
+                await self._broker.connect()
+        except UNAVAILABLE_ERRORS as exc:
+            if self._spool is None:
+                self._reraise(exc)
+            logger.warning('Kafka is unavailable, spooling events to disk')
+            self._unavailable = True
+            self._ensure_drainer()
+            return
+        self._connected = True
         logger.info('Successfully connected to Kafka broker')
-        return self
 
     async def publish(self, topic: str, message: dict[str, Any]) -> None:
         """Publish a message to the specified Kafka topic.
@@ -36,19 +107,126 @@ class KafkaEventPublisher(EventPublisher):
         :param message: The message content as a dictionary.
         :type message: dict[str, Any]
         """
+        if self._spooling:
+            await self._append_to_spool(topic, message)
+            return
+
         logger.debug(f"Publishing message to Kafka topic '{topic}'")
-        await self._broker.publish(message, topic=topic)
+        try:
+            async with self._breaker.guard():
+                await self._broker.publish(message, topic=topic)
+        except UNAVAILABLE_ERRORS as exc:
+            if self._spool is None:
+                self._reraise(exc)
+            logger.warning(f'Failed to publish to Kafka: {str(exc)}')
+            self._unavailable = True
+            await self._append_to_spool(topic, message)
+            return
         logger.debug(
             f"Successfully published message to Kafka topic '{topic}'"
         )
 
+    @staticmethod
+    def _reraise(exc: Exception) -> NoReturn:
+        """Raises a broker error that callers can handle without aiokafka.
+
+        :param exc: The error raised by a broker call.
+        :type exc: Exception
+        :raises BrokerConnectionError: If the broker could not be reached.
+        """
+        if isinstance(exc, KafkaConnectionError):
+            raise BrokerConnectionError() from exc
+        raise exc
+
+    async def _append_to_spool(
+        self,
+        topic: str,
+        message: dict[str, Any],
+    ) -> None:
+        if self._spool is None:
+            raise RuntimeError('Kafka event spool is not configured')
+        logger.debug(f"Spooling message for Kafka topic '{topic}'")
+        await self._spool.append(topic, message)
+        self._ensure_drainer()
+
+    def _ensure_drainer(self) -> None:
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        """Replays spooled events in order until the spool is empty."""
+        spool = self._spool
+        if spool is None:
+            return
+        logger.info('Starting Kafka spool drainer')
+        while self._spooling:
+            try:
+                await self._replay(spool)
+                self._unavailable = False
+            except UNAVAILABLE_ERRORS as exc:
+                logger.debug(f'Kafka is still unavailable: {str(exc)}')
+                await asyncio.sleep(self._drain_interval)
+            except Exception as exc:
+                logger.error(f'Failed to replay the Kafka spool: {str(exc)}')
+                await asyncio.sleep(self._drain_interval)
+        logger.info('Kafka spool drained, publishing directly again')
+
+    async def _replay(self, spool: EventSpool) -> None:
+        """Publishes the spooled events, rejecting the ones that fail for
+        any other reason than the broker being unavailable.
+
+        :param spool: The spool to replay.
+        :type spool: EventSpool
+        :raises KafkaError: If the broker is unavailable.
+        """
+        async with self._breaker.guard():
+            await self._broker.connect()
+        self._connected = True
+        while True:
+            try:
+                event = spool.peek()
+            except (KeyError, ValueError) as exc:
+                logger.error(f'Rejecting unreadable spooled event: {exc!r}')
+                spool.reject()
+                continue
+            if event is None:
+                return
+            topic, message = event
+            try:
+                async with self._breaker.guard():
+                    await self._broker.publish(message, topic=topic)
+            except UNAVAILABLE_ERRORS:
+                raise
+            except Exception as exc:
+                logger.error(
+                    f"Rejecting spooled event for Kafka topic '{topic}': "
+                    f'{str(exc)}'
+                )
+                spool.reject()
+                continue
+            spool.ack()
+
+    async def close(self) -> None:
+        """Stop the spool drainer, then flush the producer and the spool."""
+        if self._drainer is not None:
+            self._drainer.cancel()
+        if self._started:
+            logger.info('Flushing and stopping Kafka producer')
+            await self._broker.stop()
+            self._started = self._connected = False
+        if self._spool is not None:
+            self._spool.close()
+
     async def __aexit__(
         self,
         exc_type: Type[Exception] | None,
         exc_value: Exception | None,
         traceback: TracebackException,
     ) -> None:
-        """Stop the Kafka broker connection."""
+        """Stop the Kafka broker connection unless it was started."""
+        if self._started or self._spooling:
+            return
         logger.info('Stopping Kafka broker connection')
         await self._broker.stop()
+        self._connected = False
         logger.info('Successfully stopped Kafka broker connection')
@@ -0,0 +1,97 @@
+import asyncio
+from traceback import TracebackException
+from typing import Any, Callable, Self, Type
+
+from core.logger import get_logger
+
+from .base import EventPublisher
+
+logger = get_logger(__name__)
+
+
+class InMemoryEventPublisher(EventPublisher):
+    """In-process implementation of the EventPublisher interface.
+
+    Published events are kept in order and can be inspected, awaited or
+    observed through listeners. Setting ``failure`` makes every publish
+    raise it, to exercise the outage handling of callers.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the publisher with no events."""
+        self.events: list[tuple[str, dict[str, Any]]] = []
+        self.failure: Exception | None = None
+        self._listeners: list[Callable[[str, dict[str, Any]], None]] = []
+        self._published = asyncio.Condition()
+
+    async def __aenter__(self) -> Self:
+        """Connect to the in-memory broker."""
+        return self
+
+    async def publish(self, topic: str, message: dict[str, Any]) -> None:
+        """Record a message published to the specified topic.
+
+        :param topic: The topic to publish the message to.
+        :type topic: str
+        :param message: The message content as a dictionary.
+        :type message: dict[str, Any]
+        :raises Exception: The configured ``failure``, if any.
+        """
+        if self.failure is not None:
+            raise self.failure
+        self.events.append((topic, message))
+        for listener in self._listeners:
+            listener(topic, message)
+        async with self._published:
+            self._published.notify_all()
+        logger.debug(f'Published in-memory message to {topic}')
+
+    async def __aexit__(
+        self,
+        exc_type: Type[Exception] | None,
+        exc_value: Exception | None,
+        traceback: TracebackException,
+    ) -> None:
+        """Disconnect from the in-memory broker."""
+        pass
+
+    def messages(self, topic: str) -> list[dict[str, Any]]:
+        """Returns the messages published to a topic, oldest first.
+
+        :param topic: The topic.
+        :type topic: str
+        :returns: The messages.
+        :rtype: list[dict[str, Any]]
+        """
+        return [message for name, message in self.events if name == topic]
+
+    def add_listener(
+        self,
+        listener: Callable[[str, dict[str, Any]], None],
+    ) -> None:
+        """Calls a listener with the topic and message of every event.
+
+        :param listener: The callback.
+        :type listener: Callable[[str, dict[str, Any]], None]
+        """
+        self._listeners.append(listener)
+
+    async def wait_for(self, count: int, timeout: float = 1.0) -> None:
+        """Waits until at least ``count`` events were published.
+
+        :param count: The number of events to wait for.
+        :type count: int
+        :param timeout: Seconds to wait.
+        :type timeout: float
+        :raises TimeoutError: If fewer events were published in time.
+        """
+        async with asyncio.timeout(timeout):
+            async with self._published:
+                await self._published.wait_for(
+                    lambda: len(self.events) >= count
+                )
+
+    def clear(self) -> None:
+        """Forgets the published events and the configured failure."""
+        self.events.clear()
+        self.failure = None
@@ -0,0 +1,351 @@
+import asyncio
+import fcntl
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from itertools import count
+from pathlib import Path
+from typing import Any
+
+from pydantic_core import to_json
+
+from core.config import SpoolSettings
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+FsyncPolicy = SpoolSettings.FsyncPolicy
+
+HEADER = struct.Struct('<II')
+CURSOR = struct.Struct('<QQ')
+SEGMENT_SUFFIX = '.seg'
+
+
+class SpoolFullError(Exception):
+    """Raised when the spool has no room left for a new event."""
+
+    def __init__(self) -> None:
+        """Initializes the exception."""
+        self.message = 'Event spool is full'
+        super().__init__(self.message)
+
+
+class _Segment:
+    """A single preallocated, memory-mapped spool segment file."""
+
+    def __init__(self, path: Path, index: int, size: int) -> None:
+        """Opens (and preallocates, if needed) a segment file.
+
+        :param path: The path of the segment file.
+        :type path: Path
+        :param index: The sequence number of the segment.
+        :type index: int
+        :param size: The size of the segment in bytes.
+        :type size: int
+        """
+        self.path = path
+        self.index = index
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self.map = mmap.mmap(self._fd, size)
+        self.size = size
+        self.end = self._recover_end()
+
+    def _recover_end(self) -> int:
+        """Finds the offset right after the last intact record.
+
+        :returns: The write offset of the segment.
+        :rtype: int
+        """
+        offset = 0
+        while offset + HEADER.size <= self.size:
+            length, checksum = HEADER.unpack_from(self.map, offset)
+            start = offset + HEADER.size
+            if not length or start + length > self.size:
+                break
+            if zlib.crc32(self.map[start : start + length]) != checksum:
+                logger.warning(
+                    f'Truncating torn record in {self.path.name} at {offset}'
+                )
+                break
+            offset = start + length
+        return offset
+
+    def fits(self, length: int) -> bool:
+        return self.end + HEADER.size + length <= self.size
+
+    def append(self, payload: bytes) -> None:
+        start = self.end + HEADER.size
+        self.map[start : start + len(payload)] = payload
+        HEADER.pack_into(
+            self.map, self.end, len(payload), zlib.crc32(payload)
+        )
+        self.end = start + len(payload)
+        if self.end + HEADER.size <= self.size:
+            HEADER.pack_into(self.map, self.end, 0, 0)
+
+    def read(self, offset: int) -> tuple[bytes, int] | None:
+        if offset >= self.end:
+            return None
+        length, _ = HEADER.unpack_from(self.map, offset)
+        start = offset + HEADER.size
+        return bytes(self.map[start : start + length]), start + length
+
+    def flush(self) -> None:
+        self.map.flush()
+
+    def close(self) -> None:
+        self.map.close()
+        os.close(self._fd)
+
+    def remove(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+class EventSpool:
+    """Append-only, segment-based on-disk queue of unpublished events.
+
+    Events are framed as ``length | crc32 | json`` inside preallocated,
+    memory-mapped segment files. A separate cursor file records how far the
+    spool has been replayed, so events survive process restarts and are
+    delivered in the order they were appended.
+
+    Every worker process claims its own ``slot-N`` subdirectory with an
+    exclusive ``flock``, so spools left behind by dead workers are adopted
+    by the next process that starts.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int,
+        max_bytes: int,
+        fsync: FsyncPolicy = FsyncPolicy.interval,
+        fsync_interval: float = 1.0,
+        backpressure_timeout: float = 1.0,
+    ) -> None:
+        """Opens the spool and recovers any events left on disk.
+
+        :param directory: The base directory for spool slots.
+        :type directory: str
+        :param segment_size: The size of a single segment file in bytes.
+        :type segment_size: int
+        :param max_bytes: The maximum number of pending bytes.
+        :type max_bytes: int
+        :param fsync: When appended events are flushed to disk.
+        :type fsync: FsyncPolicy
+        :param fsync_interval: Seconds between flushes for the ``interval``
+        policy.
+        :type fsync_interval: float
+        :param backpressure_timeout: Seconds an append waits for free space
+        before raising :class:`SpoolFullError`.
+        :type backpressure_timeout: float
+        """
+        self._segment_size = segment_size
+        self._max_bytes = max_bytes
+        self._fsync = fsync
+        self._fsync_interval = fsync_interval
+        self._backpressure_timeout = backpressure_timeout
+        self._last_flush = time.monotonic()
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._space_freed = asyncio.Event()
+
+        self._path, self._lock_fd = self._claim_slot(Path(directory))
+        self._cursor_fd = os.open(
+            self._path / 'cursor', os.O_RDWR | os.O_CREAT, 0o600
+        )
+        self._segments: list[_Segment] = []
+        self._read_offset = 0
+        self._recover()
+        logger.info(
+            f'Event spool opened at {self._path}, '
+            f'{self.pending_bytes} bytes pending'
+        )
+
+    @staticmethod
+    def _claim_slot(directory: Path) -> tuple[Path, int]:
+        """Locks the first spool slot not held by another process.
+
+        :param directory: The base directory for spool slots.
+        :type directory: Path
+        :returns: The slot path and the descriptor holding its lock.
+        :rtype: tuple[Path, int]
+        """
+        for slot in count():
+            path = directory / f'slot-{slot}'
+            path.mkdir(parents=True, exist_ok=True)
+            fd = os.open(path / 'lock', os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            return path, fd
+        raise RuntimeError('unreachable')
+
+    def _recover(self) -> None:
+        """Loads the cursor and reopens segments that are not replayed."""
+        raw = os.pread(self._cursor_fd, CURSOR.size, 0)
+        segment_index, offset = (
+            CURSOR.unpack(raw) if len(raw) == CURSOR.size else (0, 0)
+        )
+        for path in sorted(self._path.glob(f'*{SEGMENT_SUFFIX}')):
+            index = int(path.stem)
+            if index < segment_index:
+                path.unlink()
+                continue
+            self._segments.append(
+                _Segment(path, index, self._segment_size)
+            )
+        if self._segments and self._segments[0].index == segment_index:
+            self._read_offset = offset
+        if not self._segments:
+            self._segments.append(self._new_segment(segment_index))
+
+    def _new_segment(self, index: int) -> _Segment:
+        path = self._path / f'{index:020d}{SEGMENT_SUFFIX}'
+        return _Segment(path, index, self._segment_size)
+
+    @property
+    def pending_bytes(self) -> int:
+        """The number of spooled bytes that are not yet replayed."""
+        return (
+            sum(segment.end for segment in self._segments)
+            - self._read_offset
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether every spooled event has been replayed."""
+        head = self._segments[0]
+        return len(self._segments) == 1 and self._read_offset >= head.end
+
+    async def append(self, topic: str, message: dict[str, Any]) -> None:
+        """Appends an event to the tail of the spool.
+
+        Waits up to ``backpressure_timeout`` seconds for the drainer to free
+        space when the spool is at its size bound.
+
+        :param topic: The topic the event is destined for.
+        :type topic: str
+        :param message: The message content as a dictionary.
+        :type message: dict[str, Any]
+        :raises SpoolFullError: If no space was freed in time.
+        :raises ValueError: If the event does not fit into one segment.
+        """
+        payload = to_json({'topic': topic, 'message': message})
+        frame_size = HEADER.size + len(payload)
+        if frame_size + HEADER.size > self._segment_size:
+            raise ValueError('Event is larger than a spool segment')
+
+        deadline = time.monotonic() + self._backpressure_timeout
+        while self.pending_bytes + frame_size > self._max_bytes:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SpoolFullError()
+            self._space_freed.clear()
+            try:
+                await asyncio.wait_for(self._space_freed.wait(), remaining)
+            except TimeoutError:
+                raise SpoolFullError() from None
+
+        tail = self._segments[-1]
+        if not tail.fits(len(payload)):
+            tail.flush()
+            tail = self._new_segment(tail.index + 1)
+            self._segments.append(tail)
+        tail.append(payload)
+        self._maybe_flush(tail)
+
+    def peek(self) -> tuple[str, dict[str, Any]] | None:
+        """Returns the oldest event that is not yet replayed.
+
+        :returns: The topic and message, or None if the spool is empty.
+        :rtype: tuple[str, dict[str, Any]] | None
+        """
+        while True:
+            head = self._segments[0]
+            record = head.read(self._read_offset)
+            if record is not None:
+                event = json.loads(record[0])
+                return event['topic'], event['message']
+            if len(self._segments) == 1:
+                return None
+            self._advance_segment()
+
+    def ack(self) -> None:
+        """Marks the event returned by :meth:`peek` as replayed."""
+        record = self._segments[0].read(self._read_offset)
+        if record is None:
+            return
+        self._read_offset = record[1]
+        if self._read_offset >= self._segments[0].end and (
+            len(self._segments) > 1
+        ):
+            self._advance_segment()
+        else:
+            self._write_cursor()
+        self._space_freed.set()
+
+    def reject(self) -> None:
+        """Moves the event returned by :meth:`peek` to the ``rejected``
+        file of the slot, for events that can never be published."""
+        record = self._segments[0].read(self._read_offset)
+        if record is None:
+            return
+        with open(self._path / 'rejected', 'ab') as file:
+            file.write(record[0] + b'\n')
+        self.ack()
+
+    def _advance_segment(self) -> None:
+        self._segments.pop(0).remove()
+        self._read_offset = 0
+        self._write_cursor()
+
+    def _write_cursor(self) -> None:
+        os.pwrite(
+            self._cursor_fd,
+            CURSOR.pack(self._segments[0].index, self._read_offset),
+            0,
+        )
+
+    def _maybe_flush(self, segment: _Segment) -> None:
+        if self._fsync is FsyncPolicy.never:
+            return
+        now = time.monotonic()
+        elapsed = now - self._last_flush
+        if (
+            self._fsync is FsyncPolicy.always
+            or elapsed >= self._fsync_interval
+        ):
+            segment.flush()
+            self._last_flush = now
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self._fsync_interval - elapsed, self._flush_tail
+            )
+
+    def _flush_tail(self) -> None:
+        """Flushes the events appended since the last flush, so that the
+        ones before an idle period are not left unsynced."""
+        self._flush_timer = None
+        self._segments[-1].flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flushes and closes all segment files and releases the slot."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        for segment in self._segments:
+            segment.flush()
+            segment.close()
+        os.fsync(self._cursor_fd)
+        os.close(self._cursor_fd)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        os.close(self._lock_fd)
+        logger.info(f'Event spool at {self._path} closed')
@@ -1,17 +1,18 @@
 from datetime import datetime
 from typing import Annotated
-from uuid import UUID, uuid4
+from uuid import UUID
 
-from sqlalchemy import DateTime, MetaData, String, Text
+from sqlalchemy import DateTime, MetaData, String, Text, Uuid
 from sqlalchemy.orm import DeclarativeBase, mapped_column, registry
-from sqlalchemy_utils import UUIDType
+
+from domain.ids import uuid7
 
 uuid_pk = Annotated[
     UUID,
     mapped_column(
-        UUIDType(binary=False),
+        Uuid(),
         primary_key=True,
-        default=uuid4,
+        default=uuid7,
     ),
 ]
 
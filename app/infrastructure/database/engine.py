@@ -1,41 +1,162 @@
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
+import asyncpg
+from sqlalchemy import event, text
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.engine.interfaces import ExecutionContext
+from sqlalchemy.exc import InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
+from core.circuit_breaker import CircuitBreaker
 from core.logger import get_logger
+from core.metrics import metrics
 
 logger = get_logger(__name__)
 
+compile_cache = metrics.counter(
+    'sql_compile_cache_total',
+    'Statements executed, by SQL compilation cache outcome.',
+)
+compile_cache_ratio = metrics.gauge(
+    'sql_compile_cache_hit_ratio',
+    'Share of statements whose compiled form came from the cache.',
+)
+CACHE_RESULTS = {CACHE_HIT: 'hit', CACHE_MISS: 'miss'}
+
+# Errors meaning the database cannot be reached, rather than that a
+# statement was rejected.
+CONNECTION_ERRORS = (
+    OSError,
+    OperationalError,
+    InterfaceError,
+    asyncpg.InterfaceError,
+    asyncpg.PostgresConnectionError,
+)
+
+
+def _compile_cache_hit_ratio() -> float:
+    hits = compile_cache.value(result='hit')
+    total = sum(compile_cache.samples().values())
+    return hits / total if total else 0.0
+
+
+compile_cache_ratio.set_function(_compile_cache_hit_ratio)
+
+
+def _record_compile_cache(
+    conn: object,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    if context is None or context.compiled is None:
+        return
+    compile_cache.inc(result=CACHE_RESULTS.get(context.cache_hit, 'none'))
+
+
+class GuardedSession(AsyncSession):
+    """Session running each database round trip under a circuit breaker.
+
+    The breaker timeout applies to every statement and commit on its own,
+    so work the caller does between them, while the session is open, is
+    neither timed out nor counted as a database failure. Statements with
+    the ``circuit_breaker`` execution option set to False, such as lock
+    waits, bypass the breaker.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        breaker: CircuitBreaker,
+        **kwargs: Any,
+    ) -> None:
+        """Initializes the session.
+
+        :param breaker: The circuit breaker guarding the round trips.
+        :type breaker: CircuitBreaker
+        """
+        super().__init__(*args, **kwargs)
+        self._breaker = breaker
+
+    async def execute(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        """Executes a statement under the circuit breaker."""
+        options = statement.get_execution_options()
+        if not options.get('circuit_breaker', True):
+            return await super().execute(statement, *args, **kwargs)
+        async with self._breaker.guard():
+            return await super().execute(statement, *args, **kwargs)
+
+    async def commit(self) -> None:
+        """Commits the transaction under the circuit breaker."""
+        async with self._breaker.guard():
+            await super().commit()
+
 
 class SqlAlchemyEngine:
     """A wrapper around the SQLAlchemy async engine and session factory."""
 
-    def __init__(self, uri: str, echo: bool = False) -> None:
+    def __init__(
+        self,
+        uri: str,
+        echo: bool = False,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
         """Initializes the engine.
 
         :param uri: The database URI.
         :type uri: str
         :param echo: Whether to echo SQL statements.
         :type echo: bool
+        :param breaker: The circuit breaker guarding database sessions.
+        :type breaker: CircuitBreaker | None
         """
+        self._breaker = breaker
         logger.info("Initializing database engine")
         self._engine = create_async_engine(url=uri, echo=echo)
+        event.listen(
+            self._engine.sync_engine,
+            'after_cursor_execute',
+            _record_compile_cache,
+        )
+        options: dict[str, Any] = {}
+        if breaker is not None:
+            options = {'class_': GuardedSession, 'breaker': breaker}
         self._session_factory = async_sessionmaker(
             self._engine,
             expire_on_commit=False,
             autoflush=False,
+            **options,
         )
         logger.info("Database engine initialized successfully")
 
+    async def start(self) -> None:
+        """Opens a pooled connection ahead of the first request."""
+        async with self._engine.connect() as connection:
+            await connection.execute(text('SELECT 1'))
+
+    @property
+    def ready(self) -> bool:
+        """Whether sessions are let through by the circuit breaker."""
+        return self._breaker is None or self._breaker.available
+
+    async def close(self) -> None:
+        """Closes the pooled connections."""
+        await self._engine.dispose()
+
     @asynccontextmanager
     async def session(self) -> AsyncGenerator[AsyncSession, None]:
         """Provides a session to interact with the database.
 
+        With a circuit breaker, its statements and commits are guarded
+        one by one.
+
         :returns: An async session.
         :rtype: AsyncGenerator[AsyncSession, None]
         """
@@ -1,22 +1,84 @@
-from sqlalchemy import BinaryExpression, and_
+from typing import Any, Type
 
+from sqlalchemy import BinaryExpression, and_, bindparam
+
+from domain.entities.application import ApplicationRead
 from domain.entities.queries import ApplicationQuery
-from infrastructure.database.filter.base import BaseFilter
+from infrastructure.database.filter.base import BaseFilter, ModelType
 
 
 class ApplicationFilter(BaseFilter):
     """Filter for applications."""
 
+    def __init__(self, model: Type[ModelType]) -> None:
+        """Initializes the filter.
+
+        :param model: The database model.
+        :type model: Type[ModelType]
+        """
+        super().__init__(model)
+        self._user_name = self._model.user_name.ilike(bindparam('user_name'))
+        self._created_after = self._model.created_at >= bindparam(
+            'created_after'
+        )
+        self._created_before = self._model.created_at < bindparam(
+            'created_before'
+        )
+
     def where(self, query: ApplicationQuery) -> BinaryExpression | None:
-        """Creates a where clause for a application query.
+        """Returns the where clause for a application query.
 
         :param query: The application query.
         :type query: ApplicationQuery
         :returns: A where clause for a application query.
         :rtype: BinaryExpression | None
         """
+        clauses = []
+        if query.user_name:
+            clauses.append(self._user_name)
+        if query.created_after is not None:
+            clauses.append(self._created_after)
+        if query.created_before is not None:
+            clauses.append(self._created_before)
+
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else and_(*clauses)
+
+    def parameters(self, query: ApplicationQuery) -> dict[str, Any]:
+        """Returns the values bound by the application query clause.
+
+        :param query: The application query.
+        :type query: ApplicationQuery
+        :returns: The bound parameter values, keyed by name.
+        :rtype: dict[str, Any]
+        """
+        parameters: dict[str, Any] = {}
+        if query.user_name:
+            parameters['user_name'] = f'%{query.user_name}%'
+        if query.created_after is not None:
+            parameters['created_after'] = query.created_after
+        if query.created_before is not None:
+            parameters['created_before'] = query.created_before
+        return parameters
 
+    def matches(
+        self,
+        query: ApplicationQuery,
+        entity: ApplicationRead,
+    ) -> bool:
+        """Checks whether an application satisfies an application query.
+
+        :param query: The application query.
+        :type query: ApplicationQuery
+        :param entity: The application to check.
+        :type entity: ApplicationRead
+        :returns: Whether the application matches the query.
+        :rtype: bool
+        """
+        if not query.in_created_range(entity.created_at):
+            return False
         if query.user_name:
-            return and_(self._model.user_name.ilike(f'%{query.user_name}%'))
+            return query.user_name.lower() in entity.user_name.lower()
 
-        return None
+        return True
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Type, TypeVar
+from typing import Any, Type, TypeVar
 
 from pydantic import BaseModel
 from sqlalchemy import BinaryExpression
@@ -26,7 +26,12 @@ class BaseFilter(ABC):
 
     @abstractmethod
     def where(self, query: QueryType) -> BinaryExpression | None:
-        """Creates a where clause for a query.
+        """Returns the where clause for a query.
+
+        The clause only holds bound parameters, whose values are returned
+        by :meth:`parameters`, so the same clause object is returned for
+        every query that filters on the same fields and statements built
+        from it can be reused.
 
         :param query: The query model.
         :type query: QueryType
@@ -34,3 +39,30 @@ class BaseFilter(ABC):
         :rtype: BinaryExpression | None
         """
         raise NotImplementedError()
+
+    @abstractmethod
+    def parameters(self, query: QueryType) -> dict[str, Any]:
+        """Returns the values of the parameters bound by :meth:`where`.
+
+        :param query: The query model.
+        :type query: QueryType
+        :returns: The bound parameter values, keyed by name.
+        :rtype: dict[str, Any]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def matches(self, query: QueryType, entity: BaseModel) -> bool:
+        """Checks in Python whether an entity satisfies a query.
+
+        Mirrors :meth:`where` for records that are not read from the
+        database, such as streamed notifications.
+
+        :param query: The query model.
+        :type query: QueryType
+        :param entity: The entity to check.
+        :type entity: BaseModel
+        :returns: Whether the entity matches the query.
+        :rtype: bool
+        """
+        raise NotImplementedError()
@@ -0,0 +1,116 @@
+import asyncio
+from typing import Any, Callable
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import Table
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PostgresListener:
+    """A single asyncpg connection that LISTENs on a notification channel.
+
+    The connection is re-established after it is lost. Notification payloads
+    are passed to the handler in the order they arrive.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        table: Table,
+        reconnect_interval: float = 1.0,
+    ) -> None:
+        """Initializes the listener.
+
+        :param dsn: The libpq-style database URI.
+        :type dsn: str
+        :param channel: The notification channel to listen on.
+        :type channel: str
+        :param table: The table notifications refer to, used to load rows
+        whose payload only carries the id.
+        :type table: Table
+        :param reconnect_interval: Seconds between reconnection attempts.
+        :type reconnect_interval: float
+        """
+        self._dsn = dsn
+        self._channel = channel
+        self._reconnect_interval = reconnect_interval
+        columns = ', '.join(
+            column.name
+            for column in table.columns
+            if not column.info.get('internal')
+        )
+        self._select_by_id = (
+            f'SELECT {columns} FROM {table.name} WHERE id = $1'
+        )
+        self._connection: asyncpg.Connection | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._handler: Callable[[str], None] | None = None
+
+    def start(self, handler: Callable[[str], None]) -> None:
+        """Starts listening in a background task.
+
+        :param handler: Called with every notification payload.
+        :type handler: Callable[[str], None]
+        """
+        if self._task is not None:
+            return
+        self._handler = handler
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            lost = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(self._dsn)
+                self._connection.add_termination_listener(
+                    lambda connection: lost.set()
+                )
+                await self._connection.add_listener(
+                    self._channel, self._notify
+                )
+                logger.info(f"Listening on channel '{self._channel}'")
+                await lost.wait()
+                logger.warning(f"Lost listener on channel '{self._channel}'")
+            except Exception as exc:
+                logger.error(f'Failed to listen: {str(exc)}')
+            self._connection = None
+            await asyncio.sleep(self._reconnect_interval)
+
+    def _notify(
+        self,
+        connection: asyncpg.Connection,
+        pid: int,
+        channel: str,
+        payload: str,
+    ) -> None:
+        if self._handler is not None:
+            self._handler(payload)
+
+    async def get_by_id(self, entity_id: UUID) -> dict[str, Any] | None:
+        """Loads a row by id over the listening connection.
+
+        :param entity_id: The id of the row.
+        :type entity_id: UUID
+        :returns: The row as a dictionary, or None.
+        :rtype: dict[str, Any] | None
+        """
+        if self._connection is None:
+            return None
+        record = await self._connection.fetchrow(
+            self._select_by_id, entity_id
+        )
+        return dict(record) if record is not None else None
+
+    async def stop(self) -> None:
+        """Stops listening and closes the connection."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
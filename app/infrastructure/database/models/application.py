@@ -1,18 +1,49 @@
-from sqlalchemy import Index
-from sqlalchemy.orm import Mapped
+from hashlib import md5
+from uuid import UUID
+
+from sqlalchemy import Index, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
 
 from infrastructure.database.base import str_64, text
 
 from .mixins import BaseMixin, CreatedAtMixin
 
+# The channel the trigger of migration 5d2a7e9c4f18 notifies of every
+# inserted application. Changing it needs a migration replacing the
+# trigger function.
+CREATED_CHANNEL = 'applications_created'
+
+
+def content_hash(user_name: str, description: str) -> UUID:
+    """Returns the hash stored for an application's content.
+
+    :param user_name: The name of the user submitting the application.
+    :type user_name: str
+    :param description: The description of the application.
+    :type description: str
+    :returns: The value of the ``content_hash`` column.
+    :rtype: UUID
+    """
+    data = f'{user_name}\x1f{description}'.encode()
+    return UUID(bytes=md5(data, usedforsecurity=False).digest())
+
 
 class Application(BaseMixin, CreatedAtMixin):
-    """Model for applications."""
+    """Model for applications.
+
+    ``content_hash`` is computed from the user name and the description
+    by the repositories when they insert an application, to find repeated
+    submissions; it is internal and never returned. Applications created
+    before the column was added have none.
+    """
 
     __tablename__ = 'applications'
 
     user_name: Mapped[str_64]
     description: Mapped[text]
+    content_hash: Mapped[UUID | None] = mapped_column(
+        Uuid(), info={'internal': True}
+    )
 
     __table_args__ = (
         Index(
@@ -21,4 +52,10 @@ class Application(BaseMixin, CreatedAtMixin):
             postgresql_using='gin',
             postgresql_ops={'user_name': 'gin_trgm_ops'},
         ),
+        Index('ix_applications_created_at', 'created_at'),
+        Index(
+            'ix_applications_content_hash_created_at',
+            'content_hash',
+            'created_at',
+        ),
     )
@@ -0,0 +1,21 @@
+from typing import Any
+
+from sqlalchemy import Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from infrastructure.database.base import str_64, text
+
+from .mixins import CreatedAtMixin
+
+
+class IdempotencyKey(CreatedAtMixin):
+    """Model for idempotency keys and the responses they produced."""
+
+    __tablename__ = 'idempotency_keys'
+
+    key: Mapped[text] = mapped_column(primary_key=True)
+    fingerprint: Mapped[str_64]
+    response: Mapped[dict[str, Any]] = mapped_column(JSONB)
+
+    __table_args__ = (Index('ix_idempotency_keys_created_at', 'created_at'),)
@@ -0,0 +1,18 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from infrastructure.database.base import datetime_timezone, str_64, text
+
+from .mixins import BaseMixin, CreatedAtMixin
+
+
+class ApplicationProjection(BaseMixin, CreatedAtMixin):
+    """Read model of applications built from the applications topic."""
+
+    __tablename__ = 'application_projections'
+
+    user_name: Mapped[str_64]
+    description: Mapped[text]
+    projected_at: Mapped[datetime_timezone] = mapped_column(
+        server_default=func.now(),
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from infrastructure.database.base import Base, datetime_timezone, text
+
+
+class RateLimitBucket(Base):
+    """Model for the token buckets of rate-limited clients."""
+
+    __tablename__ = 'rate_limits'
+
+    key: Mapped[text] = mapped_column(primary_key=True)
+    tokens: Mapped[float]
+    allowed: Mapped[bool]
+    updated_at: Mapped[datetime_timezone]
+
+    __table_args__ = (Index('ix_rate_limits_updated_at', 'updated_at'),)
@@ -0,0 +1,95 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+import asyncpg
+
+from core.circuit_breaker import CircuitBreaker
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncpgPool:
+    """A lazily created asyncpg connection pool.
+
+    Each pooled connection keeps its own cache of prepared statements,
+    keyed by the SQL text, so repeated queries skip the parse and plan
+    round trip.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        """Initializes the pool.
+
+        :param dsn: The libpq-style database URI.
+        :type dsn: str
+        :param min_size: Connections kept open.
+        :type min_size: int
+        :param max_size: Maximum number of connections.
+        :type max_size: int
+        :param breaker: The circuit breaker guarding database calls.
+        :type breaker: CircuitBreaker | None
+        """
+        self._dsn = dsn
+        self._min_size = min_size
+        self._max_size = max_size
+        self._breaker = breaker
+        self._pool: asyncpg.Pool | None = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Creates the pool ahead of the first request."""
+        await self._get_pool()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the pool is created and its circuit lets calls through."""
+        return self._pool is not None and (
+            self._breaker is None or self._breaker.available
+        )
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            async with self._lock:
+                if self._pool is None:
+                    logger.info('Creating asyncpg connection pool')
+                    self._pool = await asyncpg.create_pool(
+                        self._dsn,
+                        min_size=self._min_size,
+                        max_size=self._max_size,
+                    )
+        return self._pool
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncGenerator[asyncpg.Connection, None]:
+        """Provides a pooled connection.
+
+        :returns: An asyncpg connection.
+        :rtype: AsyncGenerator[asyncpg.Connection, None]
+        """
+        if self._breaker is None:
+            async with self._acquire() as connection:
+                yield connection
+            return
+
+        async with self._breaker.guard():
+            async with self._acquire() as connection:
+                yield connection
+
+    @asynccontextmanager
+    async def _acquire(self) -> AsyncGenerator[asyncpg.Connection, None]:
+        pool = await self._get_pool()
+        async with pool.acquire() as connection:
+            yield connection
+
+    async def close(self) -> None:
+        """Closes the pool and its connections."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
@@ -1,14 +1,138 @@
+from datetime import datetime
+from typing import Any, Mapping, Protocol
+
+from pydantic import BaseModel
+from sqlalchemy import Executable, RowMapping, bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from domain.entities.application import ApplicationCreate
-from infrastructure.database.models.application import Application
+from domain.entities.queries import ApplicationQuery
+from infrastructure.database.models.application import (
+    Application,
+    content_hash,
+)
+
+from .base import BaseRepository, Repository, StatementBuilder
+from .raw import RawRepository
+
+
+class ApplicationStore(
+    Repository[ApplicationQuery, ApplicationCreate],
+    Protocol,
+):
+    """The application repository operations the services use."""
+
+    async def get_duplicate(
+        self,
+        object: ApplicationCreate,
+        since: datetime,
+        session: AsyncSession | None = None,
+    ) -> Mapping[str, Any] | None: ...
+
+
+class ApplicationStatements(StatementBuilder[Application]):
+    """Statements of the application repositories."""
 
-from .base import BaseRepository
+    def _values(self, object: BaseModel) -> dict[str, Any]:
+        values = object.model_dump()
+        values['content_hash'] = content_hash(
+            values['user_name'], values['description']
+        )
+        return values
 
+    def _get_duplicate_statement(self) -> Executable:
+        model = self._model
+        return self._statement(
+            'get_duplicate',
+            lambda: select(*self._columns(None))
+            .where(
+                model.content_hash == bindparam('content_hash'),
+                model.created_at >= bindparam('since'),
+            )
+            .order_by(model.created_at.desc())
+            .limit(bindparam('limit')),
+        )
 
-class ApplicationRepository(BaseRepository[Application, ApplicationCreate]):
+    @staticmethod
+    def _duplicate_parameters(
+        object: ApplicationCreate,
+        since: datetime,
+    ) -> dict[str, Any]:
+        return {
+            'content_hash': content_hash(object.user_name, object.description),
+            'since': since,
+            'limit': 1,
+        }
+
+
+class ApplicationRepository(
+    BaseRepository[Application, ApplicationCreate],
+    ApplicationStatements,
+):
     """Repository for managing application entities in the database.
 
     Provides methods for creating, reading, updating, and deleting
     application records in the database.
     """
 
-    pass
+    async def get_duplicate(
+        self,
+        object: ApplicationCreate,
+        since: datetime,
+        session: AsyncSession | None = None,
+    ) -> RowMapping | None:
+        """Gets the latest record with the same content created since a time.
+
+        Uses the index on ``(content_hash, created_at)``.
+
+        :param object: The data of the submitted application.
+        :type object: ApplicationCreate
+        :param since: The inclusive lower bound of ``created_at``.
+        :type since: datetime
+        :param session: A session to query on instead of a new one.
+        :type session: AsyncSession | None
+        :returns: The record, or None if there is none.
+        :rtype: RowMapping | None
+        """
+        stmt = self._get_duplicate_statement()
+        parameters = self._duplicate_parameters(object, since)
+        if session is not None:
+            result = await session.execute(stmt, parameters)
+        else:
+            async with self._engine.session() as session:
+                result = await session.execute(stmt, parameters)
+        return result.mappings().first()
+
+class RawApplicationRepository(
+    RawRepository[Application, ApplicationCreate],
+    ApplicationStatements,
+):
+    """Application repository running directly on an asyncpg pool."""
+
+    async def get_duplicate(
+        self,
+        object: ApplicationCreate,
+        since: datetime,
+        session: AsyncSession | None = None,
+    ) -> dict[str, Any] | None:
+        """Gets the latest record with the same content created since a time.
+
+        :param object: The data of the submitted application.
+        :type object: ApplicationCreate
+        :param since: The inclusive lower bound of ``created_at``.
+        :type since: datetime
+        :param session: A session to query on instead of the pool.
+        :type session: AsyncSession | None
+        :returns: The record, or None if there is none.
+        :rtype: dict[str, Any] | None
+        """
+        stmt = self._get_duplicate_statement()
+        parameters = self._duplicate_parameters(object, since)
+        if session is not None:
+            result = await session.execute(stmt, parameters)
+            mapping = result.mappings().first()
+            return dict(mapping) if mapping is not None else None
+        sql, arguments = self._compile(stmt, parameters)
+        async with self._pool.connection() as connection:
+            record = await connection.fetchrow(sql, *arguments)
+        return dict(record) if record is not None else None
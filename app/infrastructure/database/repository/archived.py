@@ -0,0 +1,362 @@
+import heapq
+from bisect import bisect_left
+from datetime import datetime
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.logger import get_logger
+from domain.entities.application import ApplicationCreate
+from domain.entities.queries import ApplicationQuery
+from domain.exceptions import ArchivedError
+from infrastructure.archive.store import ArchiveEntry, ArchiveStore
+from infrastructure.database.filter.base import BaseFilter
+
+from .application import ApplicationStore
+from .sharded import SORT_FIELDS
+
+logger = get_logger(__name__)
+
+
+def _unique(
+    records: Iterable[Mapping[str, Any]],
+) -> Iterator[Mapping[str, Any]]:
+    """Drops records following one with the same ``(created_at, id)``.
+
+    :param records: Records ordered by ``(created_at, id)``.
+    :type records: Iterable[Mapping[str, Any]]
+    :returns: The records, each once.
+    :rtype: Iterator[Mapping[str, Any]]
+    """
+    key = itemgetter(*SORT_FIELDS)
+    previous = None
+    for record in records:
+        current = key(record)
+        if current != previous:
+            yield record
+        previous = current
+
+
+class ArchivedRepository:
+    """Repository reading through archive files for old records.
+
+    Records older than the archive age live in the files of an
+    ``ArchiveStore`` instead of the database. Queries whose time range
+    overlaps no archive file go straight to the database repository.
+    Otherwise the database page and the matching archived records are
+    merged by ``(created_at, id)`` and the offset and limit are applied to
+    the merge, like the sharded repository does; files are read oldest
+    first and only until the page is known to be complete. Files still
+    pending may hold records that are in the database too, which are
+    counted and listed once. Writes always go to the database.
+    """
+
+    def __init__(
+        self,
+        hot: ApplicationStore,
+        archive: ArchiveStore[Any],
+        filter: BaseFilter,
+    ) -> None:
+        """Initializes the repository.
+
+        :param hot: The database repository, returning ordered pages.
+        :type hot: ApplicationStore
+        :param archive: The archive of old records.
+        :type archive: ArchiveStore[Any]
+        :param filter: The filter matching archived records to queries.
+        :type filter: BaseFilter
+        """
+        self._hot = hot
+        self._archive = archive
+        self._filter = filter
+
+    async def start(self) -> None:
+        """Opens a database connection ahead of the first request."""
+        await self._hot.start()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the database is available."""
+        return self._hot.ready
+
+    def _entries(self, query: ApplicationQuery) -> list[ArchiveEntry]:
+        return self._archive.entries(
+            getattr(query, 'created_after', None),
+            getattr(query, 'created_before', None),
+        )
+
+    async def _matching(
+        self,
+        query: ApplicationQuery,
+        entry: ArchiveEntry,
+        limit: int | None = None,
+    ) -> list[BaseModel]:
+        """Returns the first records of a file matching a query.
+
+        Files are sorted by ``created_at``, so the time range is found by
+        bisection, and only the records within it are matched until
+        ``limit`` are found.
+
+        :param query: The query to filter the records.
+        :type query: ApplicationQuery
+        :param entry: The file to read.
+        :type entry: ArchiveEntry
+        :param limit: The number of records needed, or None for all.
+        :type limit: int | None
+        :returns: The matching records, ordered by ``(created_at, id)``.
+        :rtype: list[BaseModel]
+        """
+        records = await self._archive.read(entry)
+        created_after = getattr(query, 'created_after', None)
+        created_before = getattr(query, 'created_before', None)
+        key = attrgetter('created_at')
+        start = 0
+        if created_after is not None:
+            start = bisect_left(records, created_after, key=key)
+        stop = len(records)
+        if created_before is not None:
+            stop = bisect_left(records, created_before, lo=start, key=key)
+        matches = self._filter.matches
+        return list(
+            islice(
+                (
+                    record
+                    for record in islice(records, start, stop)
+                    if matches(query, record)
+                ),
+                limit,
+            )
+        )
+
+    async def _archived(
+        self,
+        query: ApplicationQuery,
+        entries: list[ArchiveEntry],
+        limit: int,
+    ) -> list[BaseModel]:
+        """Returns the first archived records matching a query.
+
+        :param query: The query to filter the records.
+        :type query: ApplicationQuery
+        :param entries: The files overlapping the query, oldest first.
+        :type entries: list[ArchiveEntry]
+        :param limit: The number of records needed.
+        :type limit: int
+        :returns: Up to ``limit`` records, ordered by ``(created_at, id)``.
+        :rtype: list[BaseModel]
+        """
+        key = attrgetter(*SORT_FIELDS)
+        records: list[BaseModel] = []
+        for entry in entries:
+            if (
+                len(records) >= limit
+                and records[-1].created_at < entry.min_created_at
+            ):
+                break
+            matching = await self._matching(query, entry, limit)
+            records = heapq.nsmallest(limit, [*records, *matching], key=key)
+        return records
+
+    async def get_multi(
+        self,
+        query: ApplicationQuery,
+    ) -> Sequence[Mapping[str, Any]]:
+        """Gets a page of records from the database and the archive.
+
+        :param query: The query to filter the records.
+        :type query: ApplicationQuery
+        :returns: A list of records, limited to ``query.fields`` if set.
+        :rtype: Sequence[Mapping[str, Any]]
+        """
+        entries = self._entries(query)
+        if not entries:
+            return await self._hot.get_multi(query)
+
+        offset = query.page or 0
+        fields = query.fields
+        if fields:
+            fields = tuple(dict.fromkeys((*fields, *SORT_FIELDS)))
+        hot_query = query.model_copy(
+            update={
+                'page': None,
+                'size': offset + query.size,
+                'fields': fields,
+            }
+        )
+        hot = await self._hot.get_multi(hot_query)
+        archived = [
+            record.model_dump()
+            for record in await self._archived(
+                query, entries, offset + query.size
+            )
+        ]
+        records = list(
+            islice(
+                _unique(
+                    heapq.merge(archived, hot, key=itemgetter(*SORT_FIELDS))
+                ),
+                offset,
+                offset + query.size,
+            )
+        )
+        if query.fields:
+            records = [
+                {name: record[name] for name in query.fields}
+                for record in records
+            ]
+        logger.info(
+            f'Retrieved {len(records)} records from the database and '
+            f'{len(entries)} archive files'
+        )
+        return records
+
+    async def get_version(
+        self,
+        query: ApplicationQuery,
+    ) -> tuple[int, datetime | None]:
+        """Gets the number and latest creation time of matching records.
+
+        Files entirely within the time range of a query without other
+        filters are counted from the index, without being read.
+
+        :param query: The query to filter the records.
+        :type query: ApplicationQuery
+        :returns: The number of matching records and their latest
+        creation time.
+        :rtype: tuple[int, datetime | None]
+        """
+        count, last = await self._hot.get_version(query)
+        created_after = getattr(query, 'created_after', None)
+        created_before = getattr(query, 'created_before', None)
+        unfiltered = not getattr(query, 'user_name', None)
+        stamps = [last] if last is not None else []
+        for entry in self._entries(query):
+            if (
+                unfiltered
+                and not entry.pending
+                and entry.within(created_after, created_before)
+            ):
+                count += entry.count
+                stamps.append(entry.max_created_at)
+                continue
+            matching = await self._matching(query, entry)
+            if entry.pending and matching:
+                matching = await self._deleted(matching)
+            if matching:
+                count += len(matching)
+                stamps.append(matching[-1].created_at)
+        return count, max(stamps, default=None)
+
+    async def _deleted(self, records: list[BaseModel]) -> list[BaseModel]:
+        """Returns the records of a pending file no longer in the database.
+
+        :param records: Records of a pending file.
+        :type records: list[BaseModel]
+        :returns: The records the database does not hold anymore.
+        :rtype: list[BaseModel]
+        """
+        present = {
+            row['id']
+            for row in await self._hot.get_by_ids(
+                [record.id for record in records]
+            )
+        }
+        return [record for record in records if record.id not in present]
+
+    async def get_by_id(self, entity_id: UUID) -> Mapping[str, Any] | None:
+        """Gets a record by its ID from the database or the archive.
+
+        :param entity_id: The ID of the record.
+        :type entity_id: UUID
+        :returns: The record, or None if it does not exist.
+        :rtype: Mapping[str, Any] | None
+        """
+        record = await self._hot.get_by_id(entity_id)
+        if record is not None:
+            return record
+        archived = await self._archive.find((entity_id,))
+        return archived[0].model_dump() if archived else None
+
+    async def get_by_ids(
+        self,
+        entity_ids: Iterable[UUID],
+    ) -> Sequence[Mapping[str, Any]]:
+        """Gets the records with any of the given IDs.
+
+        IDs missing from the database are looked up in the archive.
+
+        :param entity_ids: The IDs of the records.
+        :type entity_ids: Iterable[UUID]
+        :returns: The existing records, in no particular order.
+        :rtype: Sequence[Mapping[str, Any]]
+        """
+        entity_ids = list(entity_ids)
+        records = list(await self._hot.get_by_ids(entity_ids))
+        found = {record['id'] for record in records}
+        missing = [
+            entity_id for entity_id in entity_ids if entity_id not in found
+        ]
+        if missing:
+            records.extend(
+                record.model_dump()
+                for record in await self._archive.find(missing)
+            )
+        return records
+
+    async def get_duplicate(
+        self,
+        object: ApplicationCreate,
+        since: datetime,
+        session: AsyncSession | None = None,
+    ) -> Mapping[str, Any] | None:
+        """Gets the latest record with the same content created since a time.
+
+        Deduplication windows are far shorter than the archiving age, so
+        only the database is searched.
+
+        :param object: The data of the submitted record.
+        :type object: ApplicationCreate
+        :param since: The inclusive lower bound of ``created_at``.
+        :type since: datetime
+        :param session: A session to query on instead of a new one.
+        :type session: AsyncSession | None
+        :returns: The record, or None if there is none.
+        :rtype: Mapping[str, Any] | None
+        """
+        return await self._hot.get_duplicate(object, since, session)
+
+    async def create(
+        self,
+        object: ApplicationCreate,
+        session: AsyncSession | None = None,
+    ) -> Any:
+        """Creates a new record in the database.
+
+        :param object: The data to create the record with.
+        :type object: ApplicationCreate
+        :param session: A session to insert on, left for the caller to
+        commit, instead of a new one.
+        :type session: AsyncSession | None
+        :returns: The created record.
+        :rtype: Any
+        """
+        return await self._hot.create(object, session)
+
+    async def delete_by_id(self, entity_id: UUID) -> None:
+        """Deletes a record from the database.
+
+        Archive files are immutable, so archived records cannot be deleted.
+        The archive is only searched for IDs missing from the database.
+
+        :param entity_id: The ID of the record to delete.
+        :type entity_id: UUID
+        :raises ArchivedError: If the record is archived.
+        """
+        if await self._hot.get_by_id(entity_id) is not None:
+            await self._hot.delete_by_id(entity_id)
+        elif await self._archive.find((entity_id,)):
+            raise ArchivedError()
@@ -1,11 +1,30 @@
-from typing import Any, Sequence, Type
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Mapping,
+    Protocol,
+    Sequence,
+    Type,
+)
+from uuid import UUID
 
 from pydantic import BaseModel
 from sqlalchemy import (
+    Column,
+    Executable,
+    RowMapping,
+    any_,
+    bindparam,
     delete,
+    func,
     insert,
     select,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.logger import get_logger
 from domain.entities.queries import BaseQuery
@@ -16,17 +35,232 @@ from infrastructure.database.filter.base import BaseFilter
 logger = get_logger(__name__)
 
 
+class Repository[QueryType: BaseQuery, CreateSchemaType: BaseModel](
+    Protocol
+):
+    """The repository operations the services use.
+
+    Implemented by the SQLAlchemy, asyncpg and in-memory repositories, and
+    by the sharded and archived repositories wrapping them.
+    """
+
+    async def start(self) -> None: ...
+
+    @property
+    def ready(self) -> bool: ...
+
+    async def get_multi(
+        self,
+        query: QueryType,
+    ) -> Sequence[Mapping[str, Any]]: ...
+
+    async def get_version(
+        self,
+        query: QueryType,
+    ) -> tuple[int, datetime | None]: ...
+
+    async def get_by_id(self, entity_id: UUID) -> Mapping[str, Any] | None: ...
+
+    async def get_by_ids(
+        self,
+        entity_ids: Iterable[UUID],
+    ) -> Sequence[Mapping[str, Any]]: ...
+
+    async def create(
+        self,
+        object: CreateSchemaType,
+        session: AsyncSession | None = None,
+    ) -> Any: ...
+
+    async def delete_by_id(self, entity_id: UUID) -> None: ...
+
+
+class ArchivableRepository(Protocol):
+    """The repository operations the archiver uses on every database."""
+
+    async def get_oldest(
+        self,
+        before: datetime,
+        limit: int,
+    ) -> Sequence[Mapping[str, Any]]: ...
+
+    async def delete_by_ids(self, entity_ids: Iterable[UUID]) -> int: ...
+
+
+class StatementBuilder[ModelType: Base]:
+    """Builds and caches the statements of a repository.
+
+    Statements are built once per shape (selected fields, filtered fields,
+    whether an offset is applied) with bound parameters for every value,
+    and reused afterwards. Reusing the statement object skips both building
+    the construct and computing its cache key, and keeps the SQL text
+    stable so the driver's prepared statements are reused too.
+    """
+
+    def __init__(
+        self,
+        model: Type[ModelType],
+        filter: BaseFilter,
+        ordered: bool = False,
+    ) -> None:
+        """Initializes the statement builder.
+
+        :param model: The database model.
+        :type model: Type[ModelType]
+        :param filter: The filter for the model.
+        :type filter: BaseFilter
+        :param ordered: Whether pages are ordered by ``(created_at, id)``,
+        as shards of a sharded repository must be.
+        :type ordered: bool
+        """
+        self._model = model
+        self._filter = filter
+        self._ordered = ordered
+        self._statements: dict[Hashable, Executable] = {}
+
+    def _statement(
+        self,
+        key: Hashable,
+        build: Callable[[], Executable],
+    ) -> Executable:
+        """Returns the statement cached under a key, building it once.
+
+        :param key: The shape of the statement.
+        :type key: Hashable
+        :param build: Builds the statement on first use.
+        :type build: Callable[[], Executable]
+        :returns: The statement.
+        :rtype: Executable
+        """
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = self._statements[key] = build()
+        return statement
+
+    def _get_multi_statement(
+        self,
+        query: BaseQuery,
+    ) -> tuple[Executable, dict[str, Any]]:
+        """Returns the cached list statement and its parameter values.
+
+        :param query: The query to filter the records.
+        :type query: BaseQuery
+        :returns: The statement and the values to execute it with.
+        :rtype: tuple[Executable, dict[str, Any]]
+        """
+        parameters = {'limit': query.size, **self._filter.parameters(query)}
+        if query.page:
+            logger.debug(f'Applying offset: {query.page}')
+            parameters['offset'] = query.page
+
+        def build() -> Executable:
+            stmt = select(*self._columns(query.fields)).limit(
+                bindparam('limit')
+            )
+            where_expression = self._filter.where(query)
+            if where_expression is not None:
+                stmt = stmt.where(where_expression)
+            if query.page:
+                stmt = stmt.offset(bindparam('offset'))
+            if self._ordered:
+                stmt = stmt.order_by(self._model.created_at, self._model.id)
+            return stmt
+
+        key = ('get_multi', query.fields, *parameters)
+        return self._statement(key, build), parameters
+
+    def _values(self, object: BaseModel) -> dict[str, Any]:
+        """Returns the column values to insert a record with.
+
+        :param object: The data to create the record with.
+        :type object: BaseModel
+        :returns: The values keyed by column name.
+        :rtype: dict[str, Any]
+        """
+        return object.model_dump()
+
+    def _columns(self, fields: tuple[str, ...] | None) -> list[Column[Any]]:
+        """Returns the table columns to select for a field list.
+
+        Columns marked ``internal`` in their ``info`` are never selected.
+
+        :param fields: The requested field names, or None for all.
+        :type fields: tuple[str, ...] | None
+        :returns: The columns in table order.
+        :rtype: list[Column[Any]]
+        """
+        columns = [
+            column
+            for column in self._model.__table__.columns
+            if not column.info.get('internal')
+        ]
+        if not fields:
+            return columns
+        return [column for column in columns if column.name in fields]
+
+    def _get_version_statement(
+        self,
+        query: BaseQuery,
+    ) -> tuple[Executable, dict[str, Any]]:
+        """Returns the cached version statement and its parameter values.
+
+        :param query: The query to filter the records.
+        :type query: BaseQuery
+        :returns: The statement and the values to execute it with.
+        :rtype: tuple[Executable, dict[str, Any]]
+        """
+        parameters = self._filter.parameters(query)
+
+        def build() -> Executable:
+            stmt = select(func.count(), func.max(self._model.created_at))
+            where_expression = self._filter.where(query)
+            if where_expression is not None:
+                stmt = stmt.where(where_expression)
+            return stmt
+
+        key = ('get_version', *parameters)
+        return self._statement(key, build), parameters
+
+    def _get_by_id_statement(self) -> Executable:
+        return self._statement(
+            'get_by_id',
+            lambda: select(*self._columns(None)).where(
+                self._model.id == bindparam('entity_id')
+            ),
+        )
+
+    def _get_by_ids_statement(self) -> Executable:
+        return self._statement(
+            'get_by_ids',
+            lambda: select(*self._columns(None)).where(
+                self._model.id
+                == any_(bindparam('ids', type_=ARRAY(self._model.id.type)))
+            ),
+        )
+
+    def _get_oldest_statement(self) -> Executable:
+        return self._statement(
+            'get_oldest',
+            lambda: select(*self._columns(None))
+            .where(self._model.created_at < bindparam('before'))
+            .order_by(self._model.created_at, self._model.id)
+            .limit(bindparam('limit')),
+        )
+
+
 class BaseRepository[
     ModelType: Base,
     CreateSchemaType: BaseModel,
-]:
-    """Base class for all repositories."""
+](StatementBuilder[ModelType]):
+    """Base class for all repositories, running their statements through
+    SQLAlchemy sessions."""
 
     def __init__(
         self,
         engine: SqlAlchemyEngine,
         model: Type[ModelType],
         filter: BaseFilter,
+        ordered: bool = False,
     ) -> None:
         """Initializes the repository.
 
@@ -36,65 +270,156 @@ class BaseRepository[
         :type model: Type[ModelType]
         :param filter: The filter for the model.
         :type filter: BaseFilter
+        :param ordered: Whether pages are ordered by ``(created_at, id)``,
+        as shards of a sharded repository must be.
+        :type ordered: bool
         """
-        self._model = model
+        super().__init__(model, filter, ordered)
         self._engine = engine
-        self._filter = filter
+
+    async def start(self) -> None:
+        """Opens a database connection ahead of the first request."""
+        await self._engine.start()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the database is accepting sessions."""
+        return self._engine.ready
 
     async def get_multi(
         self,
-        query: Type[BaseQuery],
-    ) -> Sequence[ModelType]:
+        query: BaseQuery,
+    ) -> Sequence[RowMapping]:
         """Gets multiple records from the database.
 
+        Selects the table columns rather than the mapped entity, so rows are
+        returned as plain mappings without ORM hydration. When the query
+        names ``fields``, only those columns are selected.
+
         :param query: The query to filter the records.
-        :type query: Type[BaseQuery]
+        :type query: BaseQuery
         :returns: A list of records.
-        :rtype: Sequence[ModelType]
+        :rtype: Sequence[RowMapping]
         """
         logger.debug(
             f'Getting multiple records of type {self._model.__name__}'
         )
 
-        stmt = select(self._model).limit(query.size)
-
-        where_expression = self._filter.where(query)
-        if where_expression is not None:
-            logger.debug(f'Applying filter: {where_expression}')
-            stmt = stmt.where(where_expression)
-
-        if query.page:
-            logger.debug(f'Applying offset: {query.page}')
-            stmt = stmt.offset(query.page)
-
+        stmt, parameters = self._get_multi_statement(query)
         async with self._engine.session() as session:
-            result = await session.execute(stmt)
-        records = result.scalars().all()
+            result = await session.execute(stmt, parameters)
+        records = result.mappings().all()
         logger.info(
             f'Retrieved {len(records)} records of type {self._model.__name__}'
         )
         return records
 
-    async def create(self, object: CreateSchemaType) -> ModelType:
+    async def get_version(
+        self,
+        query: BaseQuery,
+    ) -> tuple[int, datetime | None]:
+        """Gets a cheap validator for the records matching a query.
+
+        Records are never updated, so the number of matching records and
+        the newest ``created_at`` change whenever the result may change.
+
+        :param query: The query to filter the records.
+        :type query: BaseQuery
+        :returns: The number of matching records and their latest
+        creation time.
+        :rtype: tuple[int, datetime | None]
+        """
+        stmt, parameters = self._get_version_statement(query)
+        async with self._engine.session() as session:
+            result = await session.execute(stmt, parameters)
+        count, last_modified = result.one()
+        return count, last_modified
+
+    async def get_by_id(self, entity_id: Any) -> RowMapping | None:
+        """Gets a record by its primary key.
+
+        :param entity_id: The ID of the record.
+        :type entity_id: Any
+        :returns: The record, or None if it does not exist.
+        :rtype: RowMapping | None
+        """
+        async with self._engine.session() as session:
+            result = await session.execute(
+                self._get_by_id_statement(), {'entity_id': entity_id}
+            )
+        return result.mappings().one_or_none()
+
+    async def get_by_ids(
+        self,
+        entity_ids: Iterable[Any],
+    ) -> Sequence[RowMapping]:
+        """Gets the records with any of the given primary keys.
+
+        The IDs are sent as a single array parameter, so the statement is
+        the same for any number of them.
+
+        :param entity_ids: The IDs of the records.
+        :type entity_ids: Iterable[Any]
+        :returns: The existing records, in no particular order.
+        :rtype: Sequence[RowMapping]
+        """
+        async with self._engine.session() as session:
+            result = await session.execute(
+                self._get_by_ids_statement(), {'ids': list(entity_ids)}
+            )
+        return result.mappings().all()
+
+    async def get_oldest(
+        self,
+        before: datetime,
+        limit: int,
+    ) -> Sequence[RowMapping]:
+        """Gets the oldest records created before a time.
+
+        :param before: The exclusive upper bound of ``created_at``.
+        :type before: datetime
+        :param limit: The maximum number of records.
+        :type limit: int
+        :returns: The records, ordered by ``(created_at, id)``.
+        :rtype: Sequence[RowMapping]
+        """
+        async with self._engine.session() as session:
+            result = await session.execute(
+                self._get_oldest_statement(),
+                {'before': before, 'limit': limit},
+            )
+        return result.mappings().all()
+
+    async def create(
+        self,
+        object: CreateSchemaType,
+        session: AsyncSession | None = None,
+    ) -> ModelType:
         """Creates a new record.
 
         :param object: The data to create the record with.
         :type object: CreateSchemaType
+        :param session: A session to insert on, left for the caller to
+        commit, instead of a new one.
+        :type session: AsyncSession | None
         :returns: The created record.
         :rtype: ModelType
         """
         logger.debug(f'Creating new record of type {self._model.__name__}')
 
-        stmt = (
-            insert(self._model)
-            .values(object.model_dump())
-            .returning(self._model)
+        stmt = self._statement(
+            'create', lambda: insert(self._model).returning(self._model)
         )
 
-        async with self._engine.session() as session:
-            async with session.begin():
-                result = await session.execute(stmt)
-                await session.commit()
+        if session is not None:
+            result = await session.execute(stmt, [self._values(object)])
+        else:
+            async with self._engine.session() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        stmt, [self._values(object)]
+                    )
+                    await session.commit()
         record = result.scalar()
         logger.info(
             f'Created record ID: {
@@ -109,7 +434,32 @@ class BaseRepository[
         :param entity_id: The ID of the record to delete.
         :type entity_id: Any
         """
-        stmt = delete(self._model).where(self._model.id == entity_id)
+        stmt = self._statement(
+            'delete_by_id',
+            lambda: delete(self._model).where(
+                self._model.id == bindparam('entity_id')
+            ),
+        )
+        async with self._engine.session() as session:
+            await session.execute(stmt, {'entity_id': entity_id})
+            await session.commit()
+
+    async def delete_by_ids(self, entity_ids: Iterable[Any]) -> int:
+        """Deletes the records with any of the given IDs.
+
+        :param entity_ids: The IDs of the records to delete.
+        :type entity_ids: Iterable[Any]
+        :returns: The number of deleted records.
+        :rtype: int
+        """
+        stmt = self._statement(
+            'delete_by_ids',
+            lambda: delete(self._model).where(
+                self._model.id
+                == any_(bindparam('ids', type_=ARRAY(self._model.id.type)))
+            ),
+        )
         async with self._engine.session() as session:
-            await session.execute(stmt)
+            result = await session.execute(stmt, {'ids': list(entity_ids)})
             await session.commit()
+        return result.rowcount
@@ -0,0 +1,187 @@
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncGenerator, Protocol
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.logger import get_logger
+from domain.exceptions import IdempotencyKeyInProgressError
+from infrastructure.database.engine import SqlAlchemyEngine
+from infrastructure.database.models.idempotency import IdempotencyKey
+
+logger = get_logger(__name__)
+
+LOCK_NOT_AVAILABLE = '55P03'
+
+
+class LockedKey(Protocol):
+    """An idempotency key held by the current request."""
+
+    @property
+    def session(self) -> AsyncSession | None:
+        """The session holding the lock, if the key is in a database."""
+        ...
+
+    async def get(self, not_before: datetime) -> IdempotencyKey | None: ...
+
+    async def save(
+        self,
+        fingerprint: str,
+        response: dict[str, Any],
+        created_at: datetime,
+    ) -> None: ...
+
+
+class IdempotencyStore(Protocol):
+    """Storage of idempotency keys and the responses they produced."""
+
+    def lock(self, key: str) -> AbstractAsyncContextManager[LockedKey]: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def delete_expired(self, before: datetime) -> None: ...
+
+
+class LockedIdempotencyKey:
+    """An idempotency key held under a transaction-level advisory lock."""
+
+    def __init__(self, session: AsyncSession, key: str) -> None:
+        """Initializes the locked key.
+
+        :param session: The session holding the advisory lock.
+        :type session: AsyncSession
+        :param key: The idempotency key.
+        :type key: str
+        """
+        self.session = session
+        self._key = key
+
+    async def get(self, not_before: datetime) -> IdempotencyKey | None:
+        """Gets the stored key if it was created after ``not_before``.
+
+        :param not_before: The oldest creation time still considered valid.
+        :type not_before: datetime
+        :returns: The stored key, or None.
+        :rtype: IdempotencyKey | None
+        """
+        stmt = select(IdempotencyKey).where(
+            IdempotencyKey.key == self._key,
+            IdempotencyKey.created_at >= not_before,
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar()
+
+    async def save(
+        self,
+        fingerprint: str,
+        response: dict[str, Any],
+        created_at: datetime,
+    ) -> None:
+        """Stores the response produced for the key.
+
+        :param fingerprint: The hash of the request the key was used with.
+        :type fingerprint: str
+        :param response: The JSON-compatible response to replay.
+        :type response: dict[str, Any]
+        :param created_at: When the key was used.
+        :type created_at: datetime
+        """
+        values = {
+            'fingerprint': fingerprint,
+            'response': response,
+            'created_at': created_at,
+        }
+        stmt = (
+            insert(IdempotencyKey)
+            .values(key=self._key, **values)
+            .on_conflict_do_update(index_elements=['key'], set_=values)
+        )
+        await self.session.execute(stmt)
+
+
+class IdempotencyRepository:
+    """Repository for idempotency keys."""
+
+    def __init__(self, engine: SqlAlchemyEngine, lock_timeout: float) -> None:
+        """Initializes the repository.
+
+        :param engine: The database engine.
+        :type engine: SqlAlchemyEngine
+        :param lock_timeout: Seconds a request waits for the lock of a key
+        held by another request.
+        :type lock_timeout: float
+        """
+        self._engine = engine
+        self._lock_timeout = str(round(lock_timeout * 1000))
+
+    @asynccontextmanager
+    async def lock(
+        self,
+        key: str,
+    ) -> AsyncGenerator[LockedIdempotencyKey, None]:
+        """Serializes concurrent requests using the same key.
+
+        Takes ``pg_advisory_xact_lock`` on a hash of the key; the lock is
+        released when the transaction commits or rolls back on exit. The
+        wait is bounded by ``lock_timeout`` rather than by the circuit
+        breaker, since contention is not a database failure.
+
+        :param key: The idempotency key.
+        :type key: str
+        :returns: The locked key.
+        :rtype: AsyncGenerator[LockedIdempotencyKey, None]
+        :raises IdempotencyKeyInProgressError: If the key stayed locked for
+        ``lock_timeout``.
+        """
+        async with self._engine.session() as session:
+            async with session.begin():
+                await session.execute(
+                    select(
+                        func.set_config(
+                            'lock_timeout', self._lock_timeout, True
+                        )
+                    )
+                )
+                try:
+                    await session.execute(
+                        select(
+                            func.pg_advisory_xact_lock(
+                                func.hashtextextended(key, 0)
+                            )
+                        ).execution_options(circuit_breaker=False)
+                    )
+                except DBAPIError as exc:
+                    if getattr(exc.orig, 'sqlstate', None) == (
+                        LOCK_NOT_AVAILABLE
+                    ):
+                        raise IdempotencyKeyInProgressError() from exc
+                    raise
+                yield LockedIdempotencyKey(session, key)
+
+    async def delete(self, key: str) -> None:
+        """Deletes a key, so that the next request using it runs again.
+
+        :param key: The idempotency key.
+        :type key: str
+        """
+        stmt = delete(IdempotencyKey).where(IdempotencyKey.key == key)
+        async with self._engine.session() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def delete_expired(self, before: datetime) -> None:
+        """Deletes keys created before the given time.
+
+        :param before: The cutoff creation time.
+        :type before: datetime
+        """
+        stmt = delete(IdempotencyKey).where(
+            IdempotencyKey.created_at < before
+        )
+        async with self._engine.session() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+        logger.info(f'Deleted {result.rowcount} expired idempotency keys')
@@ -0,0 +1,458 @@
+import asyncio
+import heapq
+from bisect import bisect_left, insort
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from itertools import islice
+from operator import itemgetter
+from typing import Any, AsyncGenerator, Iterable, Sequence
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.logger import get_logger
+from domain.entities.queries import ApplicationQuery
+from infrastructure.database.models.application import content_hash
+from infrastructure.database.models.idempotency import IdempotencyKey
+
+logger = get_logger(__name__)
+
+TRIGRAM = 3
+
+
+def trigrams(value: str) -> set[str]:
+    """Returns the three-character substrings of a lowercased value.
+
+    :param value: The string to split.
+    :type value: str
+    :returns: The trigrams of the value.
+    :rtype: set[str]
+    """
+    value = value.lower()
+    return {value[i : i + TRIGRAM] for i in range(len(value) - TRIGRAM + 1)}
+
+
+def _ranged(query: ApplicationQuery) -> bool:
+    return query.created_after is not None or query.created_before is not None
+
+
+class InMemoryApplicationRepository:
+    """In-process implementation of the application repository.
+
+    Records are kept in creation order in a list sorted by
+    ``(created_at, id)``, so pages are list slices. A trigram index on the
+    lowercased ``user_name`` narrows substring filters to the candidates
+    sharing every trigram of the search term, like ``pg_trgm`` does for
+    the ``ILIKE`` used by the database repository. Terms shorter than a
+    trigram scan all records.
+
+    Indexes refer to records by an integer row number rather than by id,
+    since hashing a ``UUID`` runs in Python. The latest record with each
+    content hash is indexed too, to find repeated submissions.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty repository."""
+        self._records: dict[int, dict[str, Any]] = {}
+        self._rows: dict[UUID, int] = {}
+        self._keys: dict[int, tuple[datetime, UUID, int]] = {}
+        self._order: list[tuple[datetime, UUID, int]] = []
+        self._names: dict[int, str] = {}
+        self._trigrams: dict[str, set[int]] = {}
+        self._hashes: dict[UUID, int] = {}
+        self._next_row = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    async def start(self) -> None:
+        """Does nothing, records are kept in memory."""
+
+    @property
+    def ready(self) -> bool:
+        """Always true, records are kept in memory."""
+        return True
+
+    async def get_multi(
+        self,
+        query: ApplicationQuery,
+    ) -> Sequence[dict[str, Any]]:
+        """Gets a page of records matching the query.
+
+        :param query: The query to filter the records.
+        :type query: ApplicationQuery
+        :returns: A list of records, limited to ``query.fields`` if set.
+        :rtype: Sequence[dict[str, Any]]
+        """
+        start = query.page or 0
+        stop = start + query.size
+        if query.user_name:
+            keys = heapq.nsmallest(
+                stop, self._sort_keys(self._matching(query))
+            )[start:]
+        else:
+            low, high = self._span(query)
+            keys = self._order[low + start : min(low + stop, high)]
+
+        records = [self._records[row] for _, _, row in keys]
+        if query.fields:
+            records = [
+                {name: record[name] for name in query.fields}
+                for record in records
+            ]
+        logger.info(f'Retrieved {len(records)} records from memory')
+        return records
+
+    async def get_version(
+        self,
+        query: ApplicationQuery,
+    ) -> tuple[int, datetime | None]:
+        """Gets the number and latest creation time of matching records.
+
+        :param query: The query to filter the records.
+        :type query: ApplicationQuery
+        :returns: The number of matching records and their latest
+        creation time.
+        :rtype: tuple[int, datetime | None]
+        """
+        if not query.user_name:
+            low, high = self._span(query)
+            last = self._order[high - 1][0] if high > low else None
+            return high - low, last
+        keys = list(self._sort_keys(self._matching(query)))
+        return len(keys), max(keys)[0] if keys else None
+
+    async def get_by_id(self, entity_id: UUID) -> dict[str, Any] | None:
+        """Gets a record by its ID.
+
+        :param entity_id: The ID of the record.
+        :type entity_id: UUID
+        :returns: The record, or None if it does not exist.
+        :rtype: dict[str, Any] | None
+        """
+        row = self._rows.get(entity_id)
+        return self._records[row] if row is not None else None
+
+    async def get_by_ids(
+        self,
+        entity_ids: Iterable[UUID],
+    ) -> Sequence[dict[str, Any]]:
+        """Gets the records with any of the given IDs.
+
+        :param entity_ids: The IDs of the records.
+        :type entity_ids: Iterable[UUID]
+        :returns: The existing records.
+        :rtype: Sequence[dict[str, Any]]
+        """
+        rows = self._rows
+        return [
+            self._records[rows[entity_id]]
+            for entity_id in entity_ids
+            if entity_id in rows
+        ]
+
+    async def get_oldest(
+        self,
+        before: datetime,
+        limit: int,
+    ) -> Sequence[dict[str, Any]]:
+        """Gets the oldest records created before a time.
+
+        :param before: The exclusive upper bound of ``created_at``.
+        :type before: datetime
+        :param limit: The maximum number of records.
+        :type limit: int
+        :returns: The records, ordered by ``(created_at, id)``.
+        :rtype: Sequence[dict[str, Any]]
+        """
+        query = ApplicationQuery.model_construct(created_before=before)
+        return [
+            self._records[row]
+            for _, _, row in islice(self._order, limit)
+            if query.in_created_range(self._keys[row][0])
+        ]
+
+    async def get_duplicate(
+        self,
+        object: BaseModel,
+        since: datetime,
+        session: AsyncSession | None = None,
+    ) -> dict[str, Any] | None:
+        """Gets the latest record with the same content created since a time.
+
+        :param object: The data of the submitted application.
+        :type object: BaseModel
+        :param since: The inclusive lower bound of ``created_at``.
+        :type since: datetime
+        :param session: Ignored, records are kept in memory.
+        :type session: AsyncSession | None
+        :returns: The record, or None if there is none.
+        :rtype: dict[str, Any] | None
+        """
+        row = self._hashes.get(
+            content_hash(object.user_name, object.description)
+        )
+        if row is None:
+            return None
+        record = self._records[row]
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        return record if record['created_at'] >= since else None
+
+    async def create(
+        self,
+        object: BaseModel,
+        session: AsyncSession | None = None,
+    ) -> dict[str, Any]:
+        """Creates a new record.
+
+        Times without a time zone are stored as UTC, like the database
+        does, so that every key in the order compares.
+
+        :param object: The data to create the record with.
+        :type object: BaseModel
+        :param session: Ignored, records are kept in memory.
+        :type session: AsyncSession | None
+        :returns: The created record.
+        :rtype: dict[str, Any]
+        :raises ValueError: If a record with the same id exists.
+        """
+        record = object.model_dump()
+        entity_id = record['id']
+        if entity_id in self._rows:
+            raise ValueError(f'Record {entity_id} already exists')
+        created_at = record['created_at']
+        if created_at.tzinfo is None:
+            record['created_at'] = created_at.replace(tzinfo=UTC)
+
+        row = self._next_row
+        key = (record['created_at'], entity_id, row)
+        insort(self._order, key)
+        self._next_row += 1
+        self._records[row] = record
+        self._rows[entity_id] = row
+        self._keys[row] = key
+        self._names[row] = record['user_name'].lower()
+        for trigram in trigrams(record['user_name']):
+            self._trigrams.setdefault(trigram, set()).add(row)
+        self._hashes[
+            content_hash(record['user_name'], record['description'])
+        ] = row
+        logger.info(f'Created record ID: {entity_id}')
+        return record
+
+    async def delete_by_id(self, entity_id: UUID) -> None:
+        """Deletes a record by its ID.
+
+        :param entity_id: The ID of the record to delete.
+        :type entity_id: UUID
+        """
+        row = self._rows.pop(entity_id, None)
+        if row is None:
+            return
+
+        record = self._records.pop(row)
+        del self._order[bisect_left(self._order, self._keys.pop(row))]
+        del self._names[row]
+        for trigram in trigrams(record['user_name']):
+            rows = self._trigrams[trigram]
+            rows.discard(row)
+            if not rows:
+                del self._trigrams[trigram]
+        digest = content_hash(record['user_name'], record['description'])
+        if self._hashes.get(digest) == row:
+            del self._hashes[digest]
+
+    async def delete_by_ids(self, entity_ids: Iterable[UUID]) -> int:
+        """Deletes the records with any of the given IDs.
+
+        :param entity_ids: The IDs of the records to delete.
+        :type entity_ids: Iterable[UUID]
+        :returns: The number of deleted records.
+        :rtype: int
+        """
+        count = len(self._records)
+        for entity_id in entity_ids:
+            await self.delete_by_id(entity_id)
+        return count - len(self._records)
+
+    def _span(self, query: ApplicationQuery) -> tuple[int, int]:
+        """Returns the positions of the queried time range in the order.
+
+        :param query: The query with the time range.
+        :type query: ApplicationQuery
+        :returns: The first position in the range and the one after it.
+        :rtype: tuple[int, int]
+        """
+        order = self._order
+        if not order or not _ranged(query):
+            return 0, len(order)
+        low, high = 0, len(order)
+        if query.created_after is not None:
+            low = bisect_left(order, query.created_after, key=itemgetter(0))
+        if query.created_before is not None:
+            high = bisect_left(
+                order, query.created_before, lo=low, key=itemgetter(0)
+            )
+        return low, high
+
+    def _matching(self, query: ApplicationQuery) -> Iterable[int]:
+        """Returns the rows matching the user name and time range filters.
+
+        :param query: The query to filter the records.
+        :type query: ApplicationQuery
+        :returns: The matching row numbers.
+        :rtype: Iterable[int]
+        """
+        rows = self._matching_name(query.user_name or '')
+        if not _ranged(query):
+            return rows
+        keys = self._keys
+        return (
+            row for row in rows if query.in_created_range(keys[row][0])
+        )
+
+    def _matching_name(self, user_name: str) -> Iterable[int]:
+        """Returns the rows whose user name contains the search term.
+
+        :param user_name: The case-insensitive search term.
+        :type user_name: str
+        :returns: The matching row numbers.
+        :rtype: Iterable[int]
+        """
+        needle = user_name.lower()
+        candidates: Iterable[int] = self._names
+        if not needle:
+            return candidates
+        if len(needle) >= TRIGRAM:
+            postings = sorted(
+                (self._trigrams.get(trigram, set()) for trigram in
+                    trigrams(needle)),
+                key=len,
+            )
+            candidates = postings[0].intersection(*postings[1:])
+        names = self._names
+        return (row for row in candidates if needle in names[row])
+
+    def _sort_keys(
+        self,
+        rows: Iterable[int],
+    ) -> Iterable[tuple[datetime, UUID, int]]:
+        keys = self._keys
+        return (keys[row] for row in rows)
+
+
+class InMemoryLockedIdempotencyKey:
+    """An idempotency key held under an in-process lock."""
+
+    session = None
+
+    def __init__(self, keys: dict[str, IdempotencyKey], key: str) -> None:
+        """Initializes the locked key.
+
+        :param keys: The stored keys.
+        :type keys: dict[str, IdempotencyKey]
+        :param key: The idempotency key.
+        :type key: str
+        """
+        self._keys = keys
+        self._key = key
+
+    async def get(self, not_before: datetime) -> IdempotencyKey | None:
+        """Returns the stored key unless it expired.
+
+        :param not_before: Keys created before this time are expired.
+        :type not_before: datetime
+        :returns: The stored key, or None.
+        :rtype: IdempotencyKey | None
+        """
+        stored = self._keys.get(self._key)
+        if stored is None or stored.created_at < not_before:
+            return None
+        return stored
+
+    async def save(
+        self,
+        fingerprint: str,
+        response: dict[str, Any],
+        created_at: datetime,
+    ) -> None:
+        """Stores the response produced for the key.
+
+        :param fingerprint: The hash of the request body.
+        :type fingerprint: str
+        :param response: The response to replay.
+        :type response: dict[str, Any]
+        :param created_at: When the key was first used.
+        :type created_at: datetime
+        """
+        self._keys[self._key] = IdempotencyKey(
+            key=self._key,
+            fingerprint=fingerprint,
+            response=response,
+            created_at=created_at,
+        )
+
+
+class InMemoryIdempotencyRepository:
+    """In-process implementation of the idempotency key repository.
+
+    Keys are locked with an ``asyncio.Lock`` each, dropped once no request
+    holds or waits for them, so they are only honoured per worker.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty repository."""
+        self._keys: dict[str, IdempotencyKey] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._waiting: dict[str, int] = {}
+
+    @asynccontextmanager
+    async def lock(
+        self,
+        key: str,
+    ) -> AsyncGenerator[InMemoryLockedIdempotencyKey, None]:
+        """Holds a key for the duration of the block.
+
+        :param key: The idempotency key.
+        :type key: str
+        :returns: The locked key.
+        :rtype: AsyncGenerator[InMemoryLockedIdempotencyKey, None]
+        """
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._waiting[key] = self._waiting.get(key, 0) + 1
+        try:
+            async with lock:
+                yield InMemoryLockedIdempotencyKey(self._keys, key)
+        finally:
+            waiting = self._waiting[key] - 1
+            if waiting:
+                self._waiting[key] = waiting
+            else:
+                del self._waiting[key]
+                del self._locks[key]
+
+    async def delete(self, key: str) -> None:
+        """Deletes a key, so that the next request using it runs again.
+
+        :param key: The idempotency key.
+        :type key: str
+        """
+        self._keys.pop(key, None)
+
+    async def delete_expired(self, before: datetime) -> None:
+        """Deletes the keys created before a time.
+
+        :param before: The exclusive upper bound of ``created_at``.
+        :type before: datetime
+        """
+        expired = [
+            key
+            for key, stored in self._keys.items()
+            if stored.created_at < before
+        ]
+        for key in expired:
+            del self._keys[key]
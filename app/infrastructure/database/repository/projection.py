@@ -0,0 +1,66 @@
+from typing import Protocol, Sequence, Type
+
+from pydantic import BaseModel
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from core.logger import get_logger
+from domain.entities.application import ApplicationRead
+from infrastructure.database.engine import SqlAlchemyEngine
+from infrastructure.database.models.projection import ApplicationProjection
+
+logger = get_logger(__name__)
+
+
+class ProjectionStore(Protocol):
+    """The repository operations the projection consumer uses."""
+
+    async def upsert_many(
+        self,
+        objects: Sequence[ApplicationRead],
+    ) -> None: ...
+
+
+class ProjectionRepository:
+    """Repository for the applications read model."""
+
+    def __init__(
+        self,
+        engine: SqlAlchemyEngine,
+        model: Type[ApplicationProjection],
+    ) -> None:
+        """Initializes the repository.
+
+        :param engine: The database engine.
+        :type engine: SqlAlchemyEngine
+        :param model: The projection model.
+        :type model: Type[ApplicationProjection]
+        """
+        self._engine = engine
+        self._model = model
+
+    async def upsert_many(self, objects: Sequence[BaseModel]) -> None:
+        """Inserts or updates a batch of rows in a single statement.
+
+        The ids in the batch must be unique, since Postgres rejects an
+        ``ON CONFLICT DO UPDATE`` that touches the same row twice.
+
+        :param objects: The entities to project.
+        :type objects: Sequence[BaseModel]
+        """
+        stmt = insert(self._model).values(
+            [obj.model_dump() for obj in objects]
+        )
+        columns = {
+            column.name: stmt.excluded[column.name]
+            for column in self._model.__table__.columns
+            if not column.primary_key and column.name != 'projected_at'
+        }
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self._model.id],
+            set_={**columns, 'projected_at': func.now()},
+        )
+        async with self._engine.session() as session:
+            await session.execute(stmt)
+            await session.commit()
+        logger.debug(f'Upserted {len(objects)} projected rows')
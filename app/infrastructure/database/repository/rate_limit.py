@@ -0,0 +1,126 @@
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import Float, bindparam, case, delete, func
+from sqlalchemy.dialects.postgresql import insert
+
+from core.logger import get_logger
+from infrastructure.database.engine import SqlAlchemyEngine
+from infrastructure.database.models.rate_limit import RateLimitBucket
+from infrastructure.rate_limit.base import RateLimitBackend
+
+logger = get_logger(__name__)
+
+
+class PostgresRateLimitBackend(RateLimitBackend):
+    """Token buckets shared by every worker through a Postgres table.
+
+    Taking a token is a single ``INSERT ... ON CONFLICT DO UPDATE`` that
+    refills the bucket for the time elapsed since it was last updated and
+    takes a token if one is left, so concurrent requests for a client are
+    serialized by the row lock. Buckets idle long enough to be full again
+    are deleted in the background every ``cleanup_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        engine: SqlAlchemyEngine,
+        idle_timeout: float,
+        cleanup_interval: float,
+    ) -> None:
+        """Initializes the backend.
+
+        :param engine: The database engine.
+        :type engine: SqlAlchemyEngine
+        :param idle_timeout: Seconds after which an unused bucket is full,
+        and can be deleted.
+        :type idle_timeout: float
+        :param cleanup_interval: Seconds between deletions of idle buckets.
+        :type cleanup_interval: float
+        """
+        self._engine = engine
+        self._idle_timeout = timedelta(seconds=idle_timeout)
+        self._cleanup_interval = cleanup_interval
+        self._last_cleanup = time.monotonic()
+        self._cleanup: asyncio.Task[None] | None = None
+
+        table = RateLimitBucket.__table__
+        rate = bindparam('rate', type_=Float)
+        burst = bindparam('burst', type_=Float)
+        refill = func.least(
+            burst,
+            table.c.tokens
+            + func.extract('epoch', func.now() - table.c.updated_at) * rate,
+        )
+        self._acquire = (
+            insert(table)
+            .values(
+                key=bindparam('key'),
+                tokens=burst - 1,
+                allowed=True,
+                updated_at=func.now(),
+            )
+            .on_conflict_do_update(
+                index_elements=[table.c.key],
+                set_={
+                    'tokens': case((refill >= 1, refill - 1), else_=refill),
+                    'allowed': refill >= 1,
+                    'updated_at': func.now(),
+                },
+            )
+            .returning(table.c.allowed, table.c.tokens)
+        )
+
+    async def start(self) -> None:
+        """Opens a database connection ahead of the first request."""
+        await self._engine.start()
+
+    async def acquire(
+        self,
+        key: str,
+        rate: float,
+        burst: int,
+    ) -> tuple[bool, float]:
+        """Takes a token from the bucket of a client.
+
+        :param key: The client and policy the bucket belongs to.
+        :type key: str
+        :param rate: Tokens added per second.
+        :type rate: float
+        :param burst: The capacity of the bucket.
+        :type burst: int
+        :returns: Whether the request is allowed, and the tokens left.
+        :rtype: tuple[bool, float]
+        """
+        async with self._engine.session() as session:
+            result = await session.execute(
+                self._acquire, {'key': key, 'rate': rate, 'burst': burst}
+            )
+            allowed, tokens = result.one()
+            await session.commit()
+        self._schedule_cleanup()
+        return allowed, tokens
+
+    def _schedule_cleanup(self) -> None:
+        if time.monotonic() - self._last_cleanup < self._cleanup_interval:
+            return
+        if self._cleanup is not None and not self._cleanup.done():
+            return
+        self._last_cleanup = time.monotonic()
+        self._cleanup = asyncio.create_task(
+            self._delete_idle(datetime.now(UTC) - self._idle_timeout)
+        )
+
+    async def _delete_idle(self, before: datetime) -> None:
+        stmt = delete(RateLimitBucket).where(
+            RateLimitBucket.updated_at < before
+        )
+        try:
+            async with self._engine.session() as session:
+                result = await session.execute(stmt)
+                await session.commit()
+        except Exception as exc:
+            logger.error(f'Failed to delete idle rate limits: {str(exc)}')
+            return
+        logger.info(f'Deleted {result.rowcount} idle rate limits')
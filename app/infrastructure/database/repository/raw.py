@@ -0,0 +1,254 @@
+from datetime import datetime
+from typing import Any, Iterable, Sequence, Type
+
+from pydantic import BaseModel
+from sqlalchemy import Executable, any_, bindparam, insert
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.logger import get_logger
+from domain.entities.queries import BaseQuery
+from infrastructure.database.base import Base
+from infrastructure.database.filter.base import BaseFilter
+from infrastructure.database.pool import AsyncpgPool
+
+from .base import StatementBuilder
+
+logger = get_logger(__name__)
+
+dialect = PGDialect_asyncpg(paramstyle='numeric_dollar')
+
+
+class RawRepository[
+    ModelType: Base,
+    CreateSchemaType: BaseModel,
+](StatementBuilder[ModelType]):
+    """Repository running its queries directly on an asyncpg pool.
+
+    Statements are the ones the SQLAlchemy repository builds, compiled
+    once to asyncpg SQL, so both return the same rows. Execution skips the
+    SQLAlchemy session, result and type processing layers: records are
+    fetched on a pooled connection, whose prepared statement cache is keyed
+    on the SQL text, and converted straight to dictionaries. It offers
+    every operation of :class:`BaseRepository`.
+    """
+
+    def __init__(
+        self,
+        pool: AsyncpgPool,
+        model: Type[ModelType],
+        filter: BaseFilter,
+        ordered: bool = False,
+    ) -> None:
+        """Initializes the repository.
+
+        :param pool: The asyncpg connection pool.
+        :type pool: AsyncpgPool
+        :param model: The database model.
+        :type model: Type[ModelType]
+        :param filter: The filter for the model.
+        :type filter: BaseFilter
+        :param ordered: Whether pages are ordered by ``(created_at, id)``.
+        :type ordered: bool
+        """
+        super().__init__(model, filter, ordered)
+        self._pool = pool
+        self._compiled: dict[int, tuple[str, tuple[str, ...]]] = {}
+
+    async def start(self) -> None:
+        """Creates the connection pool ahead of the first request."""
+        await self._pool.start()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the connection pool is created and available."""
+        return self._pool.ready
+
+    def _compile(
+        self,
+        stmt: Executable,
+        parameters: dict[str, Any],
+    ) -> tuple[str, list[Any]]:
+        """Returns the asyncpg SQL of a cached statement and its arguments.
+
+        :param stmt: A statement cached by the repository.
+        :type stmt: Executable
+        :param parameters: The values of its bound parameters.
+        :type parameters: dict[str, Any]
+        :returns: The SQL text and the positional arguments.
+        :rtype: tuple[str, list[Any]]
+        """
+        compiled = self._compiled.get(id(stmt))
+        if compiled is None:
+            result = stmt.compile(dialect=dialect)
+            compiled = self._compiled[id(stmt)] = (
+                result.string,
+                tuple(result.positiontup),
+            )
+        sql, names = compiled
+        return sql, [parameters[name] for name in names]
+
+    async def get_multi(
+        self,
+        query: BaseQuery,
+    ) -> Sequence[dict[str, Any]]:
+        """Gets multiple records from the database.
+
+        :param query: The query to filter the records.
+        :type query: BaseQuery
+        :returns: A list of records.
+        :rtype: Sequence[dict[str, Any]]
+        """
+        sql, arguments = self._compile(*self._get_multi_statement(query))
+        async with self._pool.connection() as connection:
+            records = await connection.fetch(sql, *arguments)
+        logger.info(
+            f'Retrieved {len(records)} records of type {self._model.__name__}'
+        )
+        return [dict(record) for record in records]
+
+    async def get_version(
+        self,
+        query: BaseQuery,
+    ) -> tuple[int, datetime | None]:
+        """Gets a cheap validator for the records matching a query.
+
+        :param query: The query to filter the records.
+        :type query: BaseQuery
+        :returns: The number of matching records and their latest
+        creation time.
+        :rtype: tuple[int, datetime | None]
+        """
+        sql, arguments = self._compile(*self._get_version_statement(query))
+        async with self._pool.connection() as connection:
+            count, last_modified = await connection.fetchrow(sql, *arguments)
+        return count, last_modified
+
+    async def get_by_id(self, entity_id: Any) -> dict[str, Any] | None:
+        """Gets a record by its primary key.
+
+        :param entity_id: The ID of the record.
+        :type entity_id: Any
+        :returns: The record, or None if it does not exist.
+        :rtype: dict[str, Any] | None
+        """
+        sql, arguments = self._compile(
+            self._get_by_id_statement(), {'entity_id': entity_id}
+        )
+        async with self._pool.connection() as connection:
+            record = await connection.fetchrow(sql, *arguments)
+        return dict(record) if record is not None else None
+
+    async def get_by_ids(
+        self,
+        entity_ids: Iterable[Any],
+    ) -> Sequence[dict[str, Any]]:
+        """Gets the records with any of the given primary keys.
+
+        :param entity_ids: The IDs of the records.
+        :type entity_ids: Iterable[Any]
+        :returns: The existing records, in no particular order.
+        :rtype: Sequence[dict[str, Any]]
+        """
+        sql, arguments = self._compile(
+            self._get_by_ids_statement(), {'ids': list(entity_ids)}
+        )
+        async with self._pool.connection() as connection:
+            records = await connection.fetch(sql, *arguments)
+        return [dict(record) for record in records]
+
+    async def get_oldest(
+        self,
+        before: datetime,
+        limit: int,
+    ) -> Sequence[dict[str, Any]]:
+        """Gets the oldest records created before a time.
+
+        :param before: The exclusive upper bound of ``created_at``.
+        :type before: datetime
+        :param limit: The maximum number of records.
+        :type limit: int
+        :returns: The records, ordered by ``(created_at, id)``.
+        :rtype: Sequence[dict[str, Any]]
+        """
+        sql, arguments = self._compile(
+            self._get_oldest_statement(), {'before': before, 'limit': limit}
+        )
+        async with self._pool.connection() as connection:
+            records = await connection.fetch(sql, *arguments)
+        return [dict(record) for record in records]
+
+    async def create(
+        self,
+        object: CreateSchemaType,
+        session: AsyncSession | None = None,
+    ) -> dict[str, Any]:
+        """Creates a new record.
+
+        :param object: The data to create the record with.
+        :type object: CreateSchemaType
+        :param session: A session to insert on, left for the caller to
+        commit, instead of the pool.
+        :type session: AsyncSession | None
+        :returns: The created record.
+        :rtype: dict[str, Any]
+        """
+        stmt = self._statement(
+            'raw_create',
+            lambda: insert(self._model.__table__)
+            .values(
+                {
+                    column.name: bindparam(column.name)
+                    for column in self._model.__table__.columns
+                }
+            )
+            .returning(*self._columns(None)),
+        )
+        if session is not None:
+            result = await session.execute(stmt, self._values(object))
+            created = dict(result.mappings().one())
+        else:
+            sql, arguments = self._compile(stmt, self._values(object))
+            async with self._pool.connection() as connection:
+                created = dict(await connection.fetchrow(sql, *arguments))
+        logger.info(f'Created record ID: {created["id"]}')
+        return created
+
+    async def delete_by_id(self, entity_id: Any) -> None:
+        """Deletes a record by its ID.
+
+        :param entity_id: The ID of the record to delete.
+        :type entity_id: Any
+        """
+        table = self._model.__table__
+        stmt = self._statement(
+            'raw_delete_by_id',
+            lambda: table.delete().where(
+                table.c.id == bindparam('entity_id')
+            ),
+        )
+        sql, arguments = self._compile(stmt, {'entity_id': entity_id})
+        async with self._pool.connection() as connection:
+            await connection.execute(sql, *arguments)
+
+    async def delete_by_ids(self, entity_ids: Iterable[Any]) -> int:
+        """Deletes the records with any of the given IDs.
+
+        :param entity_ids: The IDs of the records to delete.
+        :type entity_ids: Iterable[Any]
+        :returns: The number of deleted records.
+        :rtype: int
+        """
+        table = self._model.__table__
+        stmt = self._statement(
+            'raw_delete_by_ids',
+            lambda: table.delete().where(
+                table.c.id
+                == any_(bindparam('ids', type_=ARRAY(table.c.id.type)))
+            ),
+        )
+        sql, arguments = self._compile(stmt, {'ids': list(entity_ids)})
+        async with self._pool.connection() as connection:
+            status = await connection.execute(sql, *arguments)
+        return int(status.split()[-1])
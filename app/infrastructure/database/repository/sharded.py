@@ -0,0 +1,245 @@
+import asyncio
+import heapq
+from collections import defaultdict
+from datetime import datetime
+from hashlib import blake2b
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Iterable, Mapping, Sequence
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.logger import get_logger
+from domain.entities.application import ApplicationCreate
+from domain.entities.queries import ApplicationField, ApplicationQuery
+
+from .application import ApplicationStore
+
+logger = get_logger(__name__)
+
+SORT_FIELDS: tuple[ApplicationField, ...] = ('created_at', 'id')
+
+
+def shard_index(value: Any, count: int) -> int:
+    """Returns the shard a key belongs to.
+
+    The hash is stable across processes and restarts, unlike ``hash``.
+
+    :param value: The shard key, a UUID or a string.
+    :type value: Any
+    :param count: The number of shards.
+    :type count: int
+    :returns: The index of the shard.
+    :rtype: int
+    """
+    data = value.bytes if isinstance(value, UUID) else str(value).encode()
+    digest = blake2b(data, digest_size=8).digest()
+    return int.from_bytes(digest) % count
+
+
+class ShardedRepository:
+    """Repository spreading records over several databases.
+
+    Each record is stored on the shard picked by a hash of its shard key,
+    ``id`` or ``user_name``, so a write goes to exactly one database. Reads
+    that cannot be routed fan out to every shard concurrently. Shards list
+    their pages ordered by ``(created_at, id)``; the pages are merged in
+    that order and the global offset and limit are applied to the merge, so
+    every shard returns up to ``offset + size`` rows.
+    """
+
+    def __init__(
+        self,
+        shards: Sequence[ApplicationStore],
+        shard_key: str = 'id',
+    ) -> None:
+        """Initializes the repository.
+
+        :param shards: The repository of every shard, returning ordered
+        pages.
+        :type shards: Sequence[ApplicationStore]
+        :param shard_key: The field records are routed by.
+        :type shard_key: str
+        """
+        self._shards = shards
+        self._shard_key = shard_key
+
+    def _shard(self, value: Any) -> ApplicationStore:
+        return self._shards[shard_index(value, len(self._shards))]
+
+    async def start(self) -> None:
+        """Opens a connection to every shard ahead of the first request."""
+        await asyncio.gather(*(shard.start() for shard in self._shards))
+
+    @property
+    def ready(self) -> bool:
+        """Whether every shard is available, as lists need them all."""
+        return all(shard.ready for shard in self._shards)
+
+    async def get_multi(
+        self,
+        query: ApplicationQuery,
+    ) -> Sequence[Mapping[str, Any]]:
+        """Gets a page of records merged from every shard.
+
+        :param query: The query to filter the records.
+        :type query: ApplicationQuery
+        :returns: A list of records, limited to ``query.fields`` if set.
+        :rtype: Sequence[Mapping[str, Any]]
+        """
+        offset = query.page or 0
+        fields = query.fields
+        if fields:
+            fields = tuple(dict.fromkeys((*fields, *SORT_FIELDS)))
+        shard_query = query.model_copy(
+            update={
+                'page': None,
+                'size': offset + query.size,
+                'fields': fields,
+            }
+        )
+        pages = await asyncio.gather(
+            *(shard.get_multi(shard_query) for shard in self._shards)
+        )
+        records = list(
+            islice(
+                heapq.merge(*pages, key=itemgetter(*SORT_FIELDS)),
+                offset,
+                offset + query.size,
+            )
+        )
+        if query.fields:
+            records = [
+                {name: record[name] for name in query.fields}
+                for record in records
+            ]
+        logger.info(
+            f'Retrieved {len(records)} records from {len(pages)} shards'
+        )
+        return records
+
+    async def get_version(
+        self,
+        query: ApplicationQuery,
+    ) -> tuple[int, datetime | None]:
+        """Gets the number and latest creation time of matching records.
+
+        :param query: The query to filter the records.
+        :type query: ApplicationQuery
+        :returns: The number of matching records and their latest
+        creation time.
+        :rtype: tuple[int, datetime | None]
+        """
+        versions = await asyncio.gather(
+            *(shard.get_version(query) for shard in self._shards)
+        )
+        stamps = [stamp for _, stamp in versions if stamp is not None]
+        return sum(count for count, _ in versions), max(stamps, default=None)
+
+    async def get_by_id(self, entity_id: UUID) -> Mapping[str, Any] | None:
+        """Gets a record by its ID.
+
+        :param entity_id: The ID of the record.
+        :type entity_id: UUID
+        :returns: The record, or None if it does not exist.
+        :rtype: Mapping[str, Any] | None
+        """
+        if self._shard_key == 'id':
+            return await self._shard(entity_id).get_by_id(entity_id)
+        records = await asyncio.gather(
+            *(shard.get_by_id(entity_id) for shard in self._shards)
+        )
+        return next((record for record in records if record), None)
+
+    async def get_by_ids(
+        self,
+        entity_ids: Iterable[UUID],
+    ) -> Sequence[Mapping[str, Any]]:
+        """Gets the records with any of the given IDs.
+
+        With ``id`` as the shard key, every shard is only queried for its
+        own IDs, and shards without any are skipped.
+
+        :param entity_ids: The IDs of the records.
+        :type entity_ids: Iterable[UUID]
+        :returns: The existing records, in no particular order.
+        :rtype: Sequence[Mapping[str, Any]]
+        """
+        entity_ids = list(entity_ids)
+        if self._shard_key == 'id':
+            routed: defaultdict[int, list[UUID]] = defaultdict(list)
+            for entity_id in entity_ids:
+                routed[shard_index(entity_id, len(self._shards))].append(
+                    entity_id
+                )
+            lookups = [
+                self._shards[index].get_by_ids(ids)
+                for index, ids in routed.items()
+            ]
+        else:
+            lookups = [shard.get_by_ids(entity_ids) for shard in self._shards]
+        results = await asyncio.gather(*lookups)
+        return [record for records in results for record in records]
+
+    async def get_duplicate(
+        self,
+        object: ApplicationCreate,
+        since: datetime,
+        session: AsyncSession | None = None,
+    ) -> Mapping[str, Any] | None:
+        """Gets the latest record with the same content created since a time.
+
+        Records sharded by ``user_name`` are looked up on their shard only,
+        records sharded by ``id`` on every shard.
+
+        :param object: The data of the submitted record.
+        :type object: ApplicationCreate
+        :param since: The inclusive lower bound of ``created_at``.
+        :type since: datetime
+        :param session: Ignored, since the session is on the main database
+        rather than on the shards.
+        :type session: AsyncSession | None
+        :returns: The record, or None if there is none.
+        :rtype: Mapping[str, Any] | None
+        """
+        if self._shard_key != 'id':
+            shard = self._shard(getattr(object, self._shard_key))
+            return await shard.get_duplicate(object, since)
+        records = await asyncio.gather(
+            *(shard.get_duplicate(object, since) for shard in self._shards)
+        )
+        found = [record for record in records if record is not None]
+        return max(found, key=itemgetter('created_at'), default=None)
+
+    async def create(
+        self,
+        object: ApplicationCreate,
+        session: AsyncSession | None = None,
+    ) -> Any:
+        """Creates a new record on its shard.
+
+        :param object: The data to create the record with.
+        :type object: ApplicationCreate
+        :param session: Ignored, since the session is on the main database
+        rather than on the shards.
+        :type session: AsyncSession | None
+        :returns: The created record.
+        :rtype: Any
+        """
+        return await self._shard(getattr(object, self._shard_key)).create(
+            object
+        )
+
+    async def delete_by_id(self, entity_id: UUID) -> None:
+        """Deletes a record by its ID.
+
+        :param entity_id: The ID of the record to delete.
+        :type entity_id: UUID
+        """
+        if self._shard_key == 'id':
+            await self._shard(entity_id).delete_by_id(entity_id)
+            return
+        await asyncio.gather(
+            *(shard.delete_by_id(entity_id) for shard in self._shards)
+        )
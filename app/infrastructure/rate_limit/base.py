@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+
+
+class RateLimitBackend(ABC):
+    """Stores the token buckets of rate-limited clients.
+
+    A bucket holds up to ``burst`` tokens and is refilled at ``rate``
+    tokens per second; every request takes one token or is refused.
+    Outcomes are plain ``(allowed, tokens)`` tuples, since they are built
+    on every limited request.
+    """
+
+    async def start(self) -> None:
+        """Prepares the backend ahead of the first request.
+
+        Implementations without a connection to set up do nothing.
+        """
+        pass
+
+    @abstractmethod
+    async def acquire(
+        self,
+        key: str,
+        rate: float,
+        burst: int,
+    ) -> tuple[bool, float]:
+        """Takes a token from the bucket of a client.
+
+        :param key: The client and policy the bucket belongs to.
+        :type key: str
+        :param rate: Tokens added per second.
+        :type rate: float
+        :param burst: The capacity of the bucket.
+        :type burst: int
+        :returns: Whether the request is allowed, and the tokens left.
+        :rtype: tuple[bool, float]
+        """
+        pass
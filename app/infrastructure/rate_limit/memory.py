@@ -0,0 +1,84 @@
+import time
+from collections import OrderedDict
+
+from core.metrics import metrics
+
+from .base import RateLimitBackend
+
+rate_limit_evictions = metrics.counter(
+    'rate_limit_evictions_total',
+    'Client buckets evicted from the in-process rate limiter.',
+)
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Token buckets kept in process memory.
+
+    Each bucket is the number of tokens and the time they were counted, so
+    taking a token is constant time: the tokens earned since are added
+    lazily. Buckets are kept in an LRU order bounded to ``max_clients``;
+    the least recently seen client is forgotten first, which at worst
+    grants it a full bucket again.
+    """
+
+    def __init__(self, max_clients: int) -> None:
+        """Initializes the backend.
+
+        :param max_clients: Buckets kept before the oldest is evicted.
+        :type max_clients: int
+        """
+        self._max_clients = max_clients
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, key: str, rate: float, burst: int) -> tuple[bool, float]:
+        """Takes a token from the bucket of a client without awaiting.
+
+        :param key: The client and policy the bucket belongs to.
+        :type key: str
+        :param rate: Tokens added per second.
+        :type rate: float
+        :param burst: The capacity of the bucket.
+        :type burst: int
+        :returns: Whether the request is allowed, and the tokens left.
+        :rtype: tuple[bool, float]
+        """
+        now = time.monotonic()
+        buckets = self._buckets
+        bucket = buckets.get(key)
+        if bucket is None:
+            tokens: float = burst
+            if len(buckets) >= self._max_clients:
+                buckets.popitem(last=False)
+                rate_limit_evictions.inc()
+        else:
+            tokens = bucket[0] + (now - bucket[1]) * rate
+            if tokens > burst:
+                tokens = burst
+            buckets.move_to_end(key)
+        if tokens < 1:
+            buckets[key] = (tokens, now)
+            return False, tokens
+        buckets[key] = (tokens - 1, now)
+        return True, tokens - 1
+
+    async def acquire(
+        self,
+        key: str,
+        rate: float,
+        burst: int,
+    ) -> tuple[bool, float]:
+        """Takes a token from the bucket of a client.
+
+        :param key: The client and policy the bucket belongs to.
+        :type key: str
+        :param rate: Tokens added per second.
+        :type rate: float
+        :param burst: The capacity of the bucket.
+        :type burst: int
+        :returns: Whether the request is allowed, and the tokens left.
+        :rtype: tuple[bool, float]
+        """
+        return self.take(key, rate, burst)
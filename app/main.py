@@ -1,13 +1,14 @@
 import uvicorn
 
-from core.config import app_settings
-from core.providers import providers
+from core.config import AppSettings, get_settings
+from core.providers import get_providers
 from public.api.app import create_app
 
-app = create_app(providers)
+app = create_app(get_providers())
 
 
 if __name__ == '__main__':
+    app_settings = get_settings(AppSettings)
     uvicorn.run(
         app='main:app',
         host=app_settings.host,
@@ -0,0 +1,67 @@
+import argparse
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+from core.config import DatabaseSettings, get_settings
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def database_uris(database_settings: DatabaseSettings) -> list[str]:
+    """Returns the URIs of every database to migrate.
+
+    :param database_settings: The database settings.
+    :type database_settings: DatabaseSettings
+    :returns: The main database followed by the shards.
+    :rtype: list[str]
+    """
+    uris = [database_settings.uri, *database_settings.shards]
+    return list(dict.fromkeys(uris))
+
+
+def alembic_config(uri: str) -> Config:
+    """Returns the Alembic configuration for one database.
+
+    :param uri: The database URI.
+    :type uri: str
+    :returns: The configuration, independent of the working directory.
+    :rtype: Config
+    """
+    config = Config(str(ROOT / 'alembic.ini'))
+    config.set_main_option('script_location', str(ROOT / 'app' / 'alembic'))
+    config.set_main_option('sqlalchemy.url', uri.replace('%', '%%'))
+    return config
+
+
+def run(action: str, revision: str) -> None:
+    """Upgrades or downgrades the main database and every shard.
+
+    Databases are migrated one after the other, and the run stops at the
+    first failure, so a rerun continues where it stopped: Alembic skips
+    the revisions a database already has.
+
+    :param action: ``upgrade`` or ``downgrade``.
+    :type action: str
+    :param revision: The target revision.
+    :type revision: str
+    """
+    migrate = command.upgrade if action == 'upgrade' else command.downgrade
+    uris = database_uris(get_settings(DatabaseSettings))
+    for index, uri in enumerate(uris):
+        logger.info(f'Migrating database {index + 1} of {len(uris)}')
+        migrate(alembic_config(uri), revision)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Run Alembic migrations on the database and its shards.'
+    )
+    parser.add_argument('action', choices=('upgrade', 'downgrade'))
+    parser.add_argument('revision', nargs='?', default='head')
+    args = parser.parse_args()
+    run(args.action, args.revision)
@@ -1,17 +1,34 @@
-from typing import Any, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Mapping, Sequence
 
 from dishka import Provider, make_async_container
+from dishka.exceptions import NoFactoryError
 from dishka.integrations.fastapi import setup_dishka
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.openapi.utils import get_openapi
 
-from core.config import cors_settings
+from core.config import (
+    AdmissionSettings,
+    CORSSettings,
+    CompressionSettings,
+    RateLimitSettings,
+    get_settings,
+)
+from core.logger import get_logger
+from infrastructure.rate_limit.memory import InMemoryRateLimitBackend
+from services.health import HealthService
 
 from .error_handlers import error_handlers
+from .health import health_router
+from .metrics import metrics_router
+from .middleware.admission import AdmissionControlMiddleware, create_budgets
+from .middleware.compression import CompressionMiddleware, create_encoders
+from .middleware.cors import CachedCORSMiddleware
+from .middleware.rate_limit import RateLimitMiddleware, create_policies
 from .utils import read_pyproject_toml
 from .v1.routers import api_router
 
+logger = get_logger(__name__)
+
 
 class Server:
     """Server configuration class to set up FastAPI application with
@@ -32,6 +49,7 @@ class Server:
 
         setup_dishka(self.container, app)
 
+        self._register_lifespan(app)
         self._register_middleware(app)
         self._register_routers(app)
         self._base_information(app)
@@ -45,23 +63,58 @@ class Server:
         """
         return self.app
 
+    def _register_lifespan(self, app: FastAPI) -> None:
+        """Wraps the application lifespan with per-process resources.
+
+        Each worker process runs the lifespan, so connections are opened
+        after the fork: the event publisher connects and the database pool
+        opens before the first request. Warming up is best effort, since
+        the circuit breakers and the spool handle a dependency that is
+        down; the health service retries it in the background and reports
+        the worker as not ready until it is up. On shutdown the container
+        is closed once in-flight requests are drained, which flushes the
+        producer and closes the pools.
+
+        :param app: The FastAPI application instance.
+        :type app: FastAPI
+        """
+        lifespan_context = app.router.lifespan_context
+
+        @asynccontextmanager
+        async def lifespan(app: FastAPI) -> AsyncIterator[Mapping[str, Any]]:
+            await self._start_dependencies()
+            try:
+                async with lifespan_context(app) as state:
+                    yield state
+            finally:
+                logger.info('Closing dependencies')
+                await self.container.close()
+
+        app.router.lifespan_context = lifespan
+
+    async def _start_dependencies(self) -> None:
+        """Starts the dependencies that connect ahead of the first request."""
+        try:
+            health = await self.container.get(HealthService)
+        except NoFactoryError:
+            logger.warning('No health service is configured')
+            return
+        await health.start()
+
     @staticmethod
     def _base_information(app: FastAPI) -> None:
         """Sets up basic OpenAPI information for the application.
 
+        The schema itself is built by FastAPI on the first request for it
+        and cached on the application.
+
         :param app: The FastAPI application instance.
         :type app: FastAPI
         """
-        if app.openapi_schema:
-            return app.openapi_schema
-
         project_info = read_pyproject_toml()
-        app.openapi_schema = get_openapi(
-            title=project_info['project']['name'],
-            version=project_info['project']['version'],
-            description=project_info['project']['description'],
-            routes=app.routes,
-        )
+        app.title = project_info['project']['name']
+        app.version = project_info['project']['version']
+        app.description = project_info['project']['description']
 
     @staticmethod
     def _register_middleware(app: FastAPI) -> None:
@@ -70,12 +123,41 @@ class Server:
         :param app: The FastAPI application instance.
         :type app: FastAPI
         """
+        compression_settings = get_settings(CompressionSettings)
+        admission_settings = get_settings(AdmissionSettings)
+        rate_limit_settings = get_settings(RateLimitSettings)
+        cors_settings = get_settings(CORSSettings)
+        if compression_settings.enabled:
+            app.add_middleware(
+                CompressionMiddleware,
+                encoders=create_encoders(compression_settings),
+                minimum_size=compression_settings.minimum_size,
+            )
+        if admission_settings.enabled:
+            app.add_middleware(
+                AdmissionControlMiddleware,
+                budgets=create_budgets(admission_settings),
+            )
+        if rate_limit_settings.enabled:
+            app.add_middleware(
+                RateLimitMiddleware,
+                policies=create_policies(rate_limit_settings),
+                local=InMemoryRateLimitBackend(
+                    rate_limit_settings.max_clients
+                ),
+                key_header=rate_limit_settings.key_header,
+                api_keys=rate_limit_settings.api_keys,
+                trusted_proxies=rate_limit_settings.trusted_proxies,
+                shared=rate_limit_settings.shared,
+            )
         app.add_middleware(
-            CORSMiddleware,
+            CachedCORSMiddleware,
             allow_origins=cors_settings.allow_origins,
             allow_credentials=cors_settings.allow_credentials,
             allow_methods=cors_settings.allow_methods,
             allow_headers=cors_settings.allow_headers,
+            max_age=cors_settings.max_age,
+            cache_size=cors_settings.preflight_cache_size,
         )
 
     @staticmethod
@@ -86,6 +168,8 @@ class Server:
         :type app: FastAPI
         """
         app.include_router(api_router)
+        app.include_router(health_router)
+        app.include_router(metrics_router)
 
     @staticmethod
     def _register_exception_handlers(
@@ -1,25 +1,34 @@
-from aiokafka.errors import KafkaConnectionError
+import math
+
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
+from core.circuit_breaker import CircuitOpenError
 from core.logger import get_logger
 from domain.exceptions import (
+    ArchivedError,
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyReusedError,
     NotFoundError,
+    StreamUnavailableError,
+    TooManySubscribersError,
 )
+from infrastructure.broker.base import BrokerConnectionError
+from infrastructure.broker.spool import SpoolFullError
 
 logger = get_logger(__name__)
 
 
-async def kafka_connection_error(
+async def broker_connection_error(
     request: Request,
-    exc: KafkaConnectionError,
+    exc: BrokerConnectionError,
 ) -> JSONResponse:
-    """Handles Kafka connection error exceptions.
+    """Handles broker connection error exceptions.
 
     :param request: The request that caused the exception.
     :type request: Request
     :param exc: The exception that was raised.
-    :type exc: KafkaConnectionError
+    :type exc: BrokerConnectionError
     :returns: A JSON response with a 503 status code.
     :rtype: JSONResponse
     """
@@ -30,6 +39,30 @@ async def kafka_connection_error(
     )
 
 
+async def spool_full_error(
+    request: Request,
+    exc: SpoolFullError,
+) -> JSONResponse:
+    """Handles the SpoolFullError exception.
+
+    :param request: The request that caused the exception.
+    :type request: Request
+    :param exc: The exception that was raised.
+    :type exc: SpoolFullError
+    :returns: A JSON response with a 503 status code.
+    :rtype: JSONResponse
+    """
+    logger.error(
+        'Kafka is unavailable and the event spool is full',
+        extra={'url': str(request.url)},
+    )
+    return JSONResponse(
+        status_code=503,
+        content={'message': exc.message},
+        headers={'Retry-After': '1'},
+    )
+
+
 async def database_connection_error(
     request: Request,
     exc: ConnectionRefusedError,
@@ -53,6 +86,53 @@ async def database_connection_error(
     )
 
 
+async def circuit_open_error(
+    request: Request,
+    exc: CircuitOpenError,
+) -> JSONResponse:
+    """Handles the CircuitOpenError exception.
+
+    :param request: The request that caused the exception.
+    :type request: Request
+    :param exc: The exception that was raised.
+    :type exc: CircuitOpenError
+    :returns: A JSON response with a 503 status code.
+    :rtype: JSONResponse
+    """
+    logger.warning(
+        f'Circuit {exc.name} is open, failing fast',
+        extra={'url': str(request.url)},
+    )
+    return JSONResponse(
+        status_code=503,
+        content={'message': exc.message},
+        headers={'Retry-After': str(max(math.ceil(exc.retry_after), 1))},
+    )
+
+
+async def dependency_timeout_error(
+    request: Request,
+    exc: TimeoutError,
+) -> JSONResponse:
+    """Handles timeouts of calls to Kafka or the database.
+
+    :param request: The request that caused the exception.
+    :type request: Request
+    :param exc: The exception that was raised.
+    :type exc: TimeoutError
+    :returns: A JSON response with a 503 status code.
+    :rtype: JSONResponse
+    """
+    logger.error(
+        'Dependency call timed out',
+        extra={'url': str(request.url)},
+    )
+    return JSONResponse(
+        status_code=503,
+        content={'message': 'Dependency timed out'},
+    )
+
+
 async def not_found(
     request: Request,
     exc: NotFoundError,
@@ -72,8 +152,113 @@ async def not_found(
     )
 
 
+async def idempotency_key_reused(
+    request: Request,
+    exc: IdempotencyKeyReusedError,
+) -> JSONResponse:
+    """Handles the IdempotencyKeyReusedError exception.
+
+    :param request: The request that caused the exception.
+    :type request: Request
+    :param exc: The exception that was raised.
+    :type exc: IdempotencyKeyReusedError
+    :returns: A JSON response with a 422 status code.
+    :rtype: JSONResponse
+    """
+    return JSONResponse(
+        status_code=422,
+        content={'message': exc.message},
+    )
+
+
+async def idempotency_key_in_progress(
+    request: Request,
+    exc: IdempotencyKeyInProgressError,
+) -> JSONResponse:
+    """Handles the IdempotencyKeyInProgressError exception.
+
+    :param request: The request that caused the exception.
+    :type request: Request
+    :param exc: The exception that was raised.
+    :type exc: IdempotencyKeyInProgressError
+    :returns: A JSON response with a 409 status code.
+    :rtype: JSONResponse
+    """
+    return JSONResponse(
+        status_code=409,
+        content={'message': exc.message},
+        headers={'Retry-After': '1'},
+    )
+
+
+async def archived(
+    request: Request,
+    exc: ArchivedError,
+) -> JSONResponse:
+    """Handles the ArchivedError exception.
+
+    :param request: The request that caused the exception.
+    :type request: Request
+    :param exc: The exception that was raised.
+    :type exc: ArchivedError
+    :returns: A JSON response with a 409 status code.
+    :rtype: JSONResponse
+    """
+    return JSONResponse(
+        status_code=409,
+        content={'message': exc.message},
+    )
+
+
+async def too_many_subscribers(
+    request: Request,
+    exc: TooManySubscribersError,
+) -> JSONResponse:
+    """Handles the TooManySubscribersError exception.
+
+    :param request: The request that caused the exception.
+    :type request: Request
+    :param exc: The exception that was raised.
+    :type exc: TooManySubscribersError
+    :returns: A JSON response with a 503 status code.
+    :rtype: JSONResponse
+    """
+    return JSONResponse(
+        status_code=503,
+        content={'message': exc.message},
+        headers={'Retry-After': '5'},
+    )
+
+
+async def stream_unavailable(
+    request: Request,
+    exc: StreamUnavailableError,
+) -> JSONResponse:
+    """Handles the StreamUnavailableError exception.
+
+    :param request: The request that caused the exception.
+    :type request: Request
+    :param exc: The exception that was raised.
+    :type exc: StreamUnavailableError
+    :returns: A JSON response with a 501 status code.
+    :rtype: JSONResponse
+    """
+    return JSONResponse(
+        status_code=501,
+        content={'message': exc.message},
+    )
+
+
 error_handlers = [
     not_found,  # 404
-    kafka_connection_error,  # 503
+    idempotency_key_in_progress,  # 409
+    archived,  # 409
+    idempotency_key_reused,  # 422
+    stream_unavailable,  # 501
+    broker_connection_error,  # 503
+    spool_full_error,  # 503
     database_connection_error,  # 503
+    circuit_open_error,  # 503
+    dependency_timeout_error,  # 503
+    too_many_subscribers,  # 503
 ]
@@ -0,0 +1,30 @@
+from dishka.integrations.fastapi import FromDishka, inject
+from fastapi import APIRouter, Response
+
+from services.health import HealthService
+
+health_router = APIRouter(prefix='/health', include_in_schema=False)
+
+LIVE = b'{"status":"alive"}'
+
+
+@health_router.get('/live')
+async def live() -> Response:
+    """Report that the process is up and serving requests."""
+    return Response(LIVE, media_type='application/json')
+
+
+@health_router.get('/ready')
+@inject
+async def ready(health: FromDishka[HealthService]) -> Response:
+    """Report whether the worker is ready for traffic.
+
+    Returns the readiness cached by the background refresh, 200 when the
+    database and the broker are ready and 503 otherwise, without touching
+    either.
+    """
+    return Response(
+        health.body,
+        status_code=200 if health.ready else 503,
+        media_type='application/json',
+    )
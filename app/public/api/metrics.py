@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core.metrics import metrics
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get(
+    '/metrics',
+    include_in_schema=False,
+    response_class=PlainTextResponse,
+)
+async def get_metrics() -> PlainTextResponse:
+    """Expose process metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        metrics.render(),
+        media_type='text/plain; version=0.0.4',
+    )
@@ -0,0 +1,242 @@
+import asyncio
+import time
+from collections import deque
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.config import AdmissionSettings
+from core.logger import get_logger
+from core.metrics import metrics
+
+logger = get_logger(__name__)
+
+admission_in_flight = metrics.gauge(
+    'admission_in_flight',
+    'Requests currently admitted per budget.',
+)
+admission_limit = metrics.gauge(
+    'admission_limit',
+    'Current adaptive concurrency limit per budget.',
+)
+admission_queued = metrics.gauge(
+    'admission_queued',
+    'Requests waiting for a slot per budget.',
+)
+admission_rejections = metrics.counter(
+    'admission_rejections_total',
+    'Requests shed by admission control per budget.',
+)
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request cannot be admitted in time."""
+
+
+class AdaptiveLimiter:
+    """Concurrency limiter with a bounded wait queue and an AIMD limit.
+
+    Every request that finishes within ``latency_target`` grows the limit by
+    ``1 / limit`` (about one slot per window of requests); a slower request
+    multiplies it by ``backoff``. Requests beyond the limit wait in a FIFO
+    queue of at most ``max_queue`` entries for up to ``queue_timeout``
+    seconds, and are rejected immediately once the queue is full.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        latency_target: float,
+        backoff: float = 0.9,
+    ) -> None:
+        """Initializes the limiter.
+
+        :param name: The name of the budget.
+        :type name: str
+        :param initial_limit: The starting concurrency limit.
+        :type initial_limit: int
+        :param min_limit: The lowest limit the budget shrinks to.
+        :type min_limit: int
+        :param max_limit: The highest limit the budget grows to.
+        :type max_limit: int
+        :param max_queue: Requests allowed to wait for a slot.
+        :type max_queue: int
+        :param queue_timeout: Seconds a queued request waits for a slot.
+        :type queue_timeout: float
+        :param latency_target: Latency in seconds above which the limit
+        shrinks.
+        :type latency_target: float
+        :param backoff: Multiplicative decrease factor.
+        :type backoff: float
+        """
+        self.name = name
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._latency_target = latency_target
+        self._backoff = backoff
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+        admission_in_flight.set_function(
+            lambda: self._in_flight, budget=name
+        )
+        admission_limit.set_function(lambda: int(self._limit), budget=name)
+        admission_queued.set_function(
+            lambda: len(self._waiters), budget=name
+        )
+
+    @property
+    def queue_timeout(self) -> float:
+        return self._queue_timeout
+
+    async def acquire(self) -> None:
+        """Takes a slot, waiting in the queue if the budget is exhausted.
+
+        :raises AdmissionRejectedError: If the queue is full or no slot was
+        freed in time.
+        """
+        if self._in_flight < int(self._limit) and not self._waiters:
+            self._in_flight += 1
+            return
+        if len(self._waiters) >= self._max_queue:
+            admission_rejections.inc(budget=self.name)
+            raise AdmissionRejectedError()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self._queue_timeout)
+        except TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(0.0)
+            admission_rejections.inc(budget=self.name)
+            raise AdmissionRejectedError() from None
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release(0.0)
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self, latency: float) -> None:
+        """Frees a slot and adapts the limit to the observed latency.
+
+        :param latency: Seconds the admitted request took.
+        :type latency: float
+        """
+        self._in_flight -= 1
+        if latency <= self._latency_target:
+            self._limit = min(self._limit + 1 / self._limit, self._max_limit)
+        else:
+            self._limit = max(self._limit * self._backoff, self._min_limit)
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware that sheds load per route budget.
+
+    Requests whose ``(method, path)`` maps to a budget must take a slot from
+    its :class:`AdaptiveLimiter` before reaching the application; requests
+    that cannot be admitted are rejected with 503 and ``Retry-After``.
+    Other routes pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        budgets: dict[tuple[str, str], AdaptiveLimiter],
+    ) -> None:
+        """Initializes the middleware.
+
+        :param app: The wrapped ASGI application.
+        :type app: ASGIApp
+        :param budgets: Limiters keyed by HTTP method and path.
+        :type budgets: dict[tuple[str, str], AdaptiveLimiter]
+        """
+        self.app = app
+        self._budgets = budgets
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self._budgets.get((scope['method'], scope['path']))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except AdmissionRejectedError:
+            logger.warning(f'Shedding request to {limiter.name} budget')
+            response = JSONResponse(
+                status_code=503,
+                content={'message': 'Service is overloaded'},
+                headers={
+                    'Retry-After': str(max(int(limiter.queue_timeout), 1))
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - started)
+
+
+def create_budgets(
+    settings: AdmissionSettings,
+) -> dict[tuple[str, str], AdaptiveLimiter]:
+    """Creates separate read and write budgets for the application routes.
+
+    :param settings: The admission control settings.
+    :type settings: AdmissionSettings
+    :returns: Limiters keyed by HTTP method and path.
+    :rtype: dict[tuple[str, str], AdaptiveLimiter]
+    """
+    read = AdaptiveLimiter(
+        'read',
+        settings.read_limit,
+        settings.min_limit,
+        settings.max_limit,
+        settings.read_queue,
+        settings.queue_timeout,
+        settings.read_latency_target,
+    )
+    write = AdaptiveLimiter(
+        'write',
+        settings.write_limit,
+        settings.min_limit,
+        settings.max_limit,
+        settings.write_queue,
+        settings.queue_timeout,
+        settings.write_latency_target,
+    )
+    return {
+        ('GET', '/api/v1/applications'): read,
+        ('POST', '/api/v1/applications'): write,
+    }
@@ -0,0 +1,303 @@
+import zlib
+from functools import lru_cache
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any, Protocol
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import CompressionSettings
+from core.metrics import metrics
+
+compression_bytes_in = metrics.counter(
+    'compression_bytes_in_total',
+    'Response body bytes before compression per encoding.',
+)
+compression_bytes_out = metrics.counter(
+    'compression_bytes_out_total',
+    'Response body bytes after compression per encoding.',
+)
+
+UNCOMPRESSIBLE_TYPES = (
+    'text/event-stream',
+    'image/',
+    'audio/',
+    'video/',
+    'font/woff',
+    'application/gzip',
+    'application/zip',
+    'application/zstd',
+    'application/octet-stream',
+)
+
+
+class Stream(Protocol):
+    def write(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class Encoder(Protocol):
+    name: str
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def stream(self) -> Stream: ...
+
+
+class _ZlibStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def write(self, data: bytes) -> bytes:
+        compressor = self._compressor
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class GzipEncoder:
+    """Gzip from the standard library, understood by every client."""
+
+    name = 'gzip'
+
+    def __init__(self, level: int) -> None:
+        self._level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self._level, 31)
+
+    def stream(self) -> Stream:
+        return _ZlibStream(self._level)
+
+
+class _BrotliStream:
+    def __init__(self, brotli: Any, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def write(self, data: bytes) -> bytes:
+        compressor = self._compressor
+        return compressor.process(data) + compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class BrotliEncoder:
+    """Brotli, when the ``brotli`` package is installed."""
+
+    name = 'br'
+
+    def __init__(self, quality: int) -> None:
+        self._brotli = import_module('brotli')
+        self._quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.compress(data, quality=self._quality)
+
+    def stream(self) -> Stream:
+        return _BrotliStream(self._brotli, self._quality)
+
+
+class _ZstdStream:
+    def __init__(self, zstandard: Any, compressor: Any) -> None:
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = compressor.compressobj()
+
+    def write(self, data: bytes) -> bytes:
+        compressor = self._compressor
+        return compressor.compress(data) + compressor.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class ZstdEncoder:
+    """Zstandard, when the ``zstandard`` package is installed."""
+
+    name = 'zstd'
+
+    def __init__(self, level: int) -> None:
+        self._zstandard = import_module('zstandard')
+        self._compressor = self._zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def stream(self) -> Stream:
+        return _ZstdStream(self._zstandard, self._compressor)
+
+
+def create_encoders(settings: CompressionSettings) -> list[Encoder]:
+    """Creates the encoders available in this environment.
+
+    :param settings: The compression settings.
+    :type settings: CompressionSettings
+    :returns: The encoders, most preferred first.
+    :rtype: list[Encoder]
+    """
+    encoders: list[Encoder] = []
+    if find_spec('zstandard') is not None:
+        encoders.append(ZstdEncoder(settings.zstd_level))
+    if find_spec('brotli') is not None:
+        encoders.append(BrotliEncoder(settings.brotli_quality))
+    encoders.append(GzipEncoder(settings.gzip_level))
+    return encoders
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str, available: tuple[str, ...]) -> str | None:
+    """Picks the encoding of a response from the ``Accept-Encoding`` header.
+
+    Clients send the same few header values, so the result is cached.
+
+    :param accept_encoding: The value of the request header.
+    :type accept_encoding: str
+    :param available: The encodings of the server, most preferred first.
+    :type available: tuple[str, ...]
+    :returns: The most preferred encoding the client accepts, or None.
+    :rtype: str | None
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.lower().split(','):
+        name, _, parameters = item.partition(';')
+        weight = 1.0
+        parameter = parameters.strip()
+        if parameter.startswith('q='):
+            try:
+                weight = float(parameter[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip()] = weight
+    default = weights.get('*', 0.0)
+    accepted = [
+        name for name in available if weights.get(name, default) > 0
+    ]
+    if not accepted:
+        return None
+    return max(accepted, key=lambda name: weights.get(name, default))
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses in the negotiated encoding.
+
+    A body sent in one message is compressed at once when it is at least
+    ``minimum_size`` bytes, and gets the exact ``Content-Length``. A
+    streamed body is compressed chunk by chunk, each flushed so the client
+    gets it without delay. Responses that already have a
+    ``Content-Encoding``, are already compressed media, or are event
+    streams, whose events must not wait in a compressor, are sent as they
+    are.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encoders: list[Encoder],
+        minimum_size: int,
+    ) -> None:
+        """Initializes the middleware.
+
+        :param app: The wrapped ASGI application.
+        :type app: ASGIApp
+        :param encoders: The available encoders, most preferred first.
+        :type encoders: list[Encoder]
+        :param minimum_size: Bytes below which a body is sent as it is.
+        :type minimum_size: int
+        """
+        self.app = app
+        self._encoders = {encoder.name: encoder for encoder in encoders}
+        self._available = tuple(self._encoders)
+        self._minimum_size = minimum_size
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for name, value in scope['headers']:
+            if name == b'accept-encoding':
+                accept_encoding = value.decode('latin-1')
+                break
+        encoding = (
+            negotiate(accept_encoding, self._available)
+            if accept_encoding
+            else None
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        encoder = self._encoders[encoding]
+        start: Message | None = None
+        stream: Stream | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, stream
+            if message['type'] == 'http.response.start':
+                start = message
+                return
+            if message['type'] != 'http.response.body':
+                await send(message)
+                return
+            if start is None:
+                if stream is not None:
+                    message['body'] = self._write(
+                        stream, encoding, message
+                    )
+                await send(message)
+                return
+
+            response, start = start, None
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+            headers = MutableHeaders(scope=response)
+            if not self._compressible(headers) or (
+                not more_body and len(body) < self._minimum_size
+            ):
+                await send(response)
+                await send(message)
+                return
+
+            headers['Content-Encoding'] = encoding
+            headers.add_vary_header('Accept-Encoding')
+            if more_body:
+                del headers['Content-Length']
+                stream = encoder.stream()
+                message['body'] = self._write(stream, encoding, message)
+            else:
+                message['body'] = encoder.compress(body)
+                headers['Content-Length'] = str(len(message['body']))
+                compression_bytes_in.inc(len(body), encoding=encoding)
+                compression_bytes_out.inc(
+                    len(message['body']), encoding=encoding
+                )
+            await send(response)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _compressible(headers: MutableHeaders) -> bool:
+        if 'content-encoding' in headers:
+            return False
+        content_type = headers.get('content-type', '')
+        return not content_type.startswith(UNCOMPRESSIBLE_TYPES)
+
+    @staticmethod
+    def _write(stream: Stream, encoding: str, message: Message) -> bytes:
+        body = message.get('body', b'')
+        data = stream.write(body)
+        if not message.get('more_body', False):
+            data += stream.finish()
+        compression_bytes_in.inc(len(body), encoding=encoding)
+        compression_bytes_out.inc(len(data), encoding=encoding)
+        return data
@@ -0,0 +1,78 @@
+from typing import Sequence
+
+from starlette.datastructures import Headers
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response
+from starlette.types import ASGIApp
+
+from core.cache import LRUCache
+
+
+class CachedCORSMiddleware(CORSMiddleware):
+    """CORS middleware reusing the responses to repeated preflights.
+
+    A preflight response depends only on the origin, the requested method
+    and the requested headers, and browsers send the same few combinations
+    again whenever their own cache expires. The responses are kept in a
+    bounded LRU, so a repeated preflight skips the origin and header
+    checks and the building of a new response.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Sequence[str] = (),
+        allow_methods: Sequence[str] = ('GET',),
+        allow_headers: Sequence[str] = (),
+        allow_credentials: bool = False,
+        max_age: int = 600,
+        cache_size: int = 256,
+    ) -> None:
+        """Initializes the middleware.
+
+        :param app: The wrapped ASGI application.
+        :type app: ASGIApp
+        :param allow_origins: Origins allowed to make requests.
+        :type allow_origins: Sequence[str]
+        :param allow_methods: HTTP methods that are allowed.
+        :type allow_methods: Sequence[str]
+        :param allow_headers: Headers that are allowed.
+        :type allow_headers: Sequence[str]
+        :param allow_credentials: Whether credentials are allowed.
+        :type allow_credentials: bool
+        :param max_age: Seconds browsers may cache a preflight response.
+        :type max_age: int
+        :param cache_size: Preflight responses kept in memory.
+        :type cache_size: int
+        """
+        super().__init__(
+            app,
+            allow_origins=allow_origins,
+            allow_methods=allow_methods,
+            allow_headers=allow_headers,
+            allow_credentials=allow_credentials,
+            max_age=max_age,
+        )
+        self._preflights: LRUCache[tuple[str, str, str | None], Response] = (
+            LRUCache('cors_preflight', cache_size)
+        )
+
+    def preflight_response(self, request_headers: Headers) -> Response:
+        """Returns the response to a preflight request, cached by its
+        origin, requested method and requested headers.
+
+        :param request_headers: The headers of the preflight request.
+        :type request_headers: Headers
+        :returns: The preflight response.
+        :rtype: Response
+        """
+        key = (
+            request_headers['origin'],
+            request_headers['access-control-request-method'],
+            request_headers.get('access-control-request-headers'),
+        )
+        response = self._preflights.get(key)
+        if response is None:
+            response = super().preflight_response(request_headers)
+            self._preflights.set(key, response)
+        return response
@@ -0,0 +1,305 @@
+import math
+from functools import lru_cache, partial
+from hashlib import blake2b
+from ipaddress import IPv4Network, IPv6Network, ip_address
+from typing import Iterable
+
+from dishka.exceptions import NoFactoryError
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import RateLimitSettings
+from core.logger import get_logger
+from core.metrics import metrics
+from infrastructure.rate_limit.base import RateLimitBackend
+from infrastructure.rate_limit.memory import InMemoryRateLimitBackend
+
+logger = get_logger(__name__)
+
+rate_limit_rejections = metrics.counter(
+    'rate_limit_rejections_total',
+    'Requests refused because the client exceeded its rate per policy.',
+)
+rate_limit_backend_failures = metrics.counter(
+    'rate_limit_backend_failures_total',
+    'Shared rate limit checks that failed and let the request through.',
+)
+
+
+def trusted(
+    address: str,
+    proxies: tuple[IPv4Network | IPv6Network, ...],
+) -> bool:
+    """Checks whether an address belongs to a trusted proxy.
+
+    :param address: The IP address, as sent by the peer or a proxy.
+    :type address: str
+    :param proxies: The trusted proxy networks.
+    :type proxies: tuple[IPv4Network | IPv6Network, ...]
+    :returns: Whether the address is in one of the networks.
+    :rtype: bool
+    """
+    try:
+        parsed = ip_address(address)
+    except ValueError:
+        return False
+    return any(parsed in network for network in proxies)
+
+
+class RateLimitPolicy:
+    """The rate and burst allowed to every client on a set of routes."""
+
+    def __init__(self, name: str, rate: float, burst: int) -> None:
+        """Initializes the policy.
+
+        :param name: The name of the policy, part of every bucket key.
+        :type name: str
+        :param rate: Tokens added to a client's bucket per second.
+        :type rate: float
+        :param burst: The capacity of a client's bucket.
+        :type burst: int
+        """
+        self.name = name
+        self.prefix = f'{name}:'
+        self.rate = rate
+        self.burst = burst
+        self._limit = (b'ratelimit-limit', str(burst).encode())
+        self._policy = (
+            b'ratelimit-policy',
+            f'{burst};w={math.ceil(burst / rate)}'.encode(),
+        )
+
+    def headers(self, tokens: float) -> list[tuple[bytes, bytes]]:
+        """Returns the ``RateLimit`` headers describing a bucket.
+
+        :param tokens: The tokens left in the client's bucket.
+        :type tokens: float
+        :returns: The raw response headers.
+        :rtype: list[tuple[bytes, bytes]]
+        """
+        reset = math.ceil((self.burst - tokens) / self.rate)
+        return [
+            self._limit,
+            (b'ratelimit-remaining', b'%d' % tokens),
+            (b'ratelimit-reset', b'%d' % reset),
+            self._policy,
+        ]
+
+    def retry_after(self, tokens: float) -> int:
+        """Returns the seconds until the client's bucket has a token.
+
+        :param tokens: The tokens left in the client's bucket.
+        :type tokens: float
+        :returns: The whole seconds to wait, at least one.
+        :rtype: int
+        """
+        return max(math.ceil((1 - tokens) / self.rate), 1)
+
+
+class RateLimitMiddleware:
+    """ASGI middleware limiting the request rate of every client.
+
+    Requests whose ``(method, path)`` maps to a policy take a token from
+    the client's bucket for that policy. The bucket in process memory is
+    checked first, so a flood is refused without any I/O; when ``shared``
+    is set, the request must then also get a token from the shared
+    backend, which makes the limit apply across workers. Clients are
+    identified by their API key only if it is one of ``api_keys``, so that
+    made-up keys cannot claim fresh buckets. Other clients are identified
+    by their IP address, read from ``X-Forwarded-For`` when the peer is one
+    of ``trusted_proxies``. API keys are hashed before
+    they are sent to the shared backend, and a failing shared backend lets
+    requests through. Refused requests get 429 with ``Retry-After``; every
+    limited response carries the ``RateLimit`` headers.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        policies: dict[tuple[str, str], RateLimitPolicy],
+        local: InMemoryRateLimitBackend,
+        key_header: str,
+        api_keys: Iterable[str] = (),
+        trusted_proxies: Iterable[IPv4Network | IPv6Network] = (),
+        shared: bool = False,
+    ) -> None:
+        """Initializes the middleware.
+
+        :param app: The wrapped ASGI application.
+        :type app: ASGIApp
+        :param policies: Policies keyed by HTTP method and path.
+        :type policies: dict[tuple[str, str], RateLimitPolicy]
+        :param local: The buckets of this worker.
+        :type local: InMemoryRateLimitBackend
+        :param key_header: The header carrying the client's API key.
+        :type key_header: str
+        :param api_keys: The API keys that get buckets of their own.
+        :type api_keys: Iterable[str]
+        :param trusted_proxies: The proxies whose ``X-Forwarded-For``
+        header is trusted.
+        :type trusted_proxies: Iterable[IPv4Network | IPv6Network]
+        :param shared: Whether the shared backend of the dependency
+        container is checked too.
+        :type shared: bool
+        """
+        self.app = app
+        self._policies = policies
+        self._local = local
+        self._key_header = key_header.lower().encode()
+        self._api_keys = frozenset(key.encode('latin-1') for key in api_keys)
+        self._proxies = tuple(trusted_proxies)
+        # Requests come from a few proxies and recurring clients, so
+        # addresses are not parsed again on every request.
+        self._trusted = lru_cache(maxsize=4096)(
+            partial(trusted, proxies=self._proxies)
+        )
+        self._shared = shared
+        self._backend: RateLimitBackend | None = None
+
+    def _address(self, scope: Scope) -> str:
+        """Returns the IP address of the client sending a request.
+
+        Addresses in ``X-Forwarded-For`` are appended by every proxy, so
+        they are read from the last one, and the first address not added
+        by a trusted proxy is the client's.
+
+        :param scope: The ASGI connection scope.
+        :type scope: Scope
+        :returns: The IP address of the client.
+        :rtype: str
+        """
+        client = scope.get('client')
+        address = client[0] if client else 'unknown'
+        if not self._proxies or not self._trusted(address):
+            return address
+        forwarded = b','.join(
+            value
+            for name, value in scope['headers']
+            if name == b'x-forwarded-for'
+        )
+        for hop in reversed(forwarded.decode('latin-1').split(',')):
+            hop = hop.strip()
+            if not hop:
+                break
+            address = hop
+            if not self._trusted(hop):
+                break
+        return address
+
+    def _client(self, scope: Scope) -> str:
+        """Returns the identity of the client sending a request.
+
+        :param scope: The ASGI connection scope.
+        :type scope: Scope
+        :returns: The known API key, or the client IP address.
+        :rtype: str
+        """
+        for name, value in scope['headers']:
+            if name == self._key_header and value in self._api_keys:
+                return 'key:' + value.decode('latin-1')
+        return 'ip:' + self._address(scope)
+
+    async def _shared_backend(self, scope: Scope) -> RateLimitBackend | None:
+        if self._backend is None:
+            container = scope['app'].state.dishka_container
+            try:
+                self._backend = await container.get(RateLimitBackend)
+            except NoFactoryError:
+                logger.warning('No shared rate limit backend is configured')
+                self._shared = False
+        return self._backend
+
+    async def _take_shared(
+        self,
+        scope: Scope,
+        policy: RateLimitPolicy,
+        key: str,
+        tokens: float,
+    ) -> tuple[bool, float]:
+        """Takes a token from the client's bucket in the shared backend.
+
+        API keys are hashed, so they are not stored in the backend.
+
+        :param scope: The ASGI connection scope.
+        :type scope: Scope
+        :param policy: The policy of the route.
+        :type policy: RateLimitPolicy
+        :param key: The bucket key of the client in this worker.
+        :type key: str
+        :param tokens: The tokens left in this worker's bucket.
+        :type tokens: float
+        :returns: Whether the request is allowed, and the tokens left; the
+        local outcome if the backend is missing or fails.
+        :rtype: tuple[bool, float]
+        """
+        backend = await self._shared_backend(scope)
+        if backend is None:
+            return True, tokens
+        if key.startswith(policy.prefix + 'key:'):
+            digest = blake2b(key.encode(), digest_size=16).hexdigest()
+            key = f'{policy.prefix}key:{digest}'
+        try:
+            return await backend.acquire(key, policy.rate, policy.burst)
+        except Exception as exc:
+            rate_limit_backend_failures.inc()
+            logger.warning(f'Shared rate limit check failed: {exc!r}')
+            return True, tokens
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        policy = self._policies.get((scope['method'], scope['path']))
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = policy.prefix + self._client(scope)
+        allowed, tokens = self._local.take(key, policy.rate, policy.burst)
+        if allowed and self._shared:
+            allowed, tokens = await self._take_shared(
+                scope, policy, key, tokens
+            )
+
+        headers = policy.headers(tokens)
+        if not allowed:
+            rate_limit_rejections.inc(policy=policy.name)
+            response = JSONResponse(
+                status_code=429,
+                content={'message': 'Too many requests'},
+                headers={'Retry-After': str(policy.retry_after(tokens))},
+            )
+            response.raw_headers.extend(headers)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                message['headers'] = [*message.get('headers', ()), *headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def create_policies(
+    settings: RateLimitSettings,
+) -> dict[tuple[str, str], RateLimitPolicy]:
+    """Creates separate read and write policies for the application routes.
+
+    :param settings: The rate limiting settings.
+    :type settings: RateLimitSettings
+    :returns: Policies keyed by HTTP method and path.
+    :rtype: dict[tuple[str, str], RateLimitPolicy]
+    """
+    read = RateLimitPolicy('read', settings.read_rate, settings.read_burst)
+    write = RateLimitPolicy('write', settings.write_rate, settings.write_burst)
+    return {
+        ('GET', '/api/v1/applications'): read,
+        ('POST', '/api/v1/applications'): write,
+    }
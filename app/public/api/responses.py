@@ -0,0 +1,19 @@
+from fastapi.responses import JSONResponse
+
+
+class RawJSONResponse(JSONResponse):
+    """JSON response whose content is already encoded.
+
+    Used for bodies produced by a pydantic ``TypeAdapter``, so they are sent
+    as-is instead of being validated and encoded again by FastAPI.
+    """
+
+    def render(self, content: bytes) -> bytes:
+        """Returns the pre-encoded content unchanged.
+
+        :param content: The encoded JSON body.
+        :type content: bytes
+        :returns: The response body.
+        :rtype: bytes
+        """
+        return content
@@ -1,12 +1,93 @@
 import tomllib
+from datetime import UTC, datetime
+from email.utils import format_datetime
+from functools import cache
+from hashlib import sha1
+from pathlib import Path
 from typing import Any
 
+from pydantic import BaseModel
 
+PYPROJECT = Path(__file__).resolve().parents[3] / 'pyproject.toml'
+
+
+@cache
 def read_pyproject_toml() -> dict[str, Any]:
-    """Reads the pyproject.toml file.
+    """Reads the pyproject.toml file at the root of the repository.
 
     :returns: The contents of the pyproject.toml file.
     :rtype: dict[str, Any]
     """
-    with open('./pyproject.toml', 'rb') as file:
+    with PYPROJECT.open('rb') as file:
         return tomllib.load(file)
+
+
+def make_etag(
+    query: BaseModel,
+    count: int,
+    last_modified: datetime | None,
+) -> str:
+    """Builds a weak ETag for a list query from its validator.
+
+    :param query: The list query.
+    :type query: BaseModel
+    :param count: The number of records matching the query.
+    :type count: int
+    :param last_modified: The latest creation time of the records.
+    :type last_modified: datetime | None
+    :returns: The ETag header value.
+    :rtype: str
+    """
+    stamp = last_modified.isoformat() if last_modified else ''
+    raw = f'{query.model_dump_json()}|{count}|{stamp}'
+    return f'W/"{sha1(raw.encode()).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    """Checks an If-None-Match header against an ETag (weak comparison).
+
+    :param etag: The current ETag.
+    :type etag: str
+    :param if_none_match: The If-None-Match request header.
+    :type if_none_match: str | None
+    :returns: Whether the client copy is still current.
+    :rtype: bool
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(
+        candidate.strip().removeprefix('W/') == opaque
+        for candidate in if_none_match.split(',')
+    )
+
+
+def http_date(value: datetime) -> str:
+    """Formats a datetime for HTTP headers such as Last-Modified.
+
+    :param value: The datetime to format.
+    :type value: datetime
+    :returns: The IMF-fixdate representation.
+    :rtype: str
+    """
+    return format_datetime(value.astimezone(UTC), usegmt=True)
+
+
+def sse_event(event: str, data: str, event_id: str | None = None) -> bytes:
+    """Formats a Server-Sent Events message.
+
+    :param event: The event type.
+    :type event: str
+    :param data: The event data, without newlines.
+    :type data: str
+    :param event_id: The event id.
+    :type event_id: str | None
+    :returns: The encoded message.
+    :rtype: bytes
+    """
+    message = f'event: {event}\ndata: {data}\n\n'
+    if event_id is not None:
+        message = f'id: {event_id}\n{message}'
+    return message.encode()
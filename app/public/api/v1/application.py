@@ -1,23 +1,53 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator
+from uuid import UUID
 
 from dishka.integrations.fastapi import FromDishka, inject
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from domain.entities.application import ApplicationCreate, ApplicationRead
 from domain.entities.queries import ApplicationQuery
+from public.api.responses import RawJSONResponse
+from public.api.utils import etag_matches, http_date, make_etag, sse_event
 from services.application import ApplicationService
+from services.stream import ApplicationStreamService, Subscription
 
 application_router = APIRouter(prefix='/applications')
 
 
-@application_router.get('')
+@application_router.get(
+    '',
+    response_model=list[ApplicationRead],
+    response_class=RawJSONResponse,
+)
 @inject
 async def get(
     service: FromDishka[ApplicationService],
     query: Annotated[ApplicationQuery, Query()],
-) -> list[ApplicationRead]:
-    """Get a list of applications with optional filtering and pagination."""
-    return await service.get_multi(query)
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Get a list of applications with optional filtering and pagination.
+
+    Responses carry an `ETag`; sending it back in `If-None-Match` returns
+    304 without fetching the page while the matching records are unchanged.
+    With `fields`, items only contain the listed fields. With `ids`, the
+    applications with those IDs are returned instead of a page.
+    """
+    if query.ids:
+        content = await service.get_by_ids_json(query)
+        return RawJSONResponse(content)
+
+    count, last_modified = await service.get_version(query)
+    headers = {'ETag': make_etag(query, count, last_modified)}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+
+    if etag_matches(headers['ETag'], if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    content = await service.get_multi_json(query)
+    return RawJSONResponse(content, headers=headers)
 
 
 @application_router.post('')
@@ -25,6 +55,68 @@ async def get(
 async def create(
     service: FromDishka[ApplicationService],
     application: ApplicationCreate,
+    idempotency_key: Annotated[
+        str | None,
+        Header(alias='Idempotency-Key', max_length=255),
+    ] = None,
 ) -> ApplicationRead:
-    """Create a new application."""
-    return await service.create_application(application)
+    """Create a new application.
+
+    Retries sending the same `Idempotency-Key` header get the original
+    application back instead of creating a duplicate.
+    """
+    return await service.create_application(application, idempotency_key)
+
+
+@application_router.get('/stream', response_class=StreamingResponse)
+@inject
+async def stream(
+    stream: FromDishka[ApplicationStreamService],
+    query: Annotated[ApplicationQuery, Query()],
+) -> StreamingResponse:
+    """Stream newly created applications as Server-Sent Events.
+
+    Accepts the same `user_name` filter and `fields` projection as the list
+    endpoint; pagination parameters are ignored.
+    """
+    subscription = stream.subscribe(query)
+    return StreamingResponse(
+        _events(stream, subscription),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        background=BackgroundTask(stream.unsubscribe, subscription),
+    )
+
+
+@application_router.get('/{application_id}')
+@inject
+async def get_by_id(
+    service: FromDishka[ApplicationService],
+    application_id: UUID,
+) -> ApplicationRead:
+    """Get an application by its ID."""
+    return await service.get_by_id(application_id)
+
+
+async def _events(
+    stream: ApplicationStreamService,
+    subscription: Subscription,
+) -> AsyncIterator[bytes]:
+    fields = set(subscription.query.fields or ()) or None
+    try:
+        while True:
+            try:
+                entity = await subscription.get(stream.heartbeat_interval)
+            except TimeoutError:
+                yield b': keep-alive\n\n'
+                continue
+            except ConnectionAbortedError:
+                yield sse_event('error', '"slow consumer"')
+                return
+            yield sse_event(
+                'application',
+                entity.model_dump_json(include=fields),
+                str(entity.id),
+            )
+    finally:
+        stream.unsubscribe(subscription)
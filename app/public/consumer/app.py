@@ -0,0 +1,43 @@
+from dishka import Provider, make_async_container
+from dishka.integrations.faststream import setup_dishka
+from faststream import FastStream
+from faststream.kafka import KafkaBroker
+
+from core.config import KafkaSettings, ProjectionSettings, get_settings
+
+from .projection import project_applications
+
+
+def create_consumer_app(
+    providers: list[Provider],
+    broker: KafkaBroker | None = None,
+) -> FastStream:
+    """Creates the FastStream application for the applications projection.
+
+    Every worker process joins the same consumer group, so partitions are
+    spread across the workers that are running.
+
+    :param providers: List of dependency injection providers.
+    :type providers: list[Provider]
+    :param broker: The broker to consume from; created from the Kafka
+    settings when omitted.
+    :type broker: KafkaBroker | None
+    :returns: The consumer application.
+    :rtype: FastStream
+    """
+    settings = get_settings(ProjectionSettings)
+    if broker is None:
+        broker = KafkaBroker(get_settings(KafkaSettings).uri)
+
+    broker.subscriber(
+        settings.topic,
+        group_id=settings.group_id,
+        batch=True,
+        max_records=settings.max_records,
+        batch_timeout_ms=settings.batch_timeout_ms,
+        auto_commit=False,
+    )(project_applications)
+
+    app = FastStream(broker)
+    setup_dishka(make_async_container(*providers), app, auto_inject=True)
+    return app
@@ -0,0 +1,25 @@
+from dishka.integrations.faststream import FromDishka
+
+from core.logger import get_logger
+from domain.entities.application import ApplicationRead
+from services.projection import ProjectionService
+
+logger = get_logger(__name__)
+
+
+async def project_applications(
+    batch: list[ApplicationRead],
+    service: FromDishka[ProjectionService],
+) -> None:
+    """Projects a batch of new applications into the read model.
+
+    The offsets of the batch are committed once this returns, that is,
+    after the rows are committed to the database.
+
+    :param batch: Applications consumed from the topic.
+    :type batch: list[ApplicationRead]
+    :param service: The projection service.
+    :type service: ProjectionService
+    """
+    count = await service.project(batch)
+    logger.debug(f'Projected {count} of {len(batch)} consumed applications')
@@ -0,0 +1,59 @@
+import os
+from importlib.util import find_spec
+
+import uvicorn
+
+from core.config import AppSettings, get_settings
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def worker_count(app_settings: AppSettings) -> int:
+    """Returns the number of worker processes to run.
+
+    :param app_settings: The application settings.
+    :type app_settings: AppSettings
+    :returns: The configured number, or one per CPU the process may run on
+    when it is ``0``.
+    :rtype: int
+    """
+    if app_settings.workers:
+        return app_settings.workers
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def run() -> None:
+    """Runs the API on pre-forked worker processes.
+
+    The event loop and HTTP parser are uvloop and httptools when they are
+    installed. Every worker imports the application and runs its lifespan,
+    opening its own connections. On SIGTERM the workers stop accepting
+    connections, drain in-flight requests for up to the graceful timeout
+    and then close the connections, flushing the Kafka producer.
+    """
+    app_settings = get_settings(AppSettings)
+    loop = 'uvloop' if find_spec('uvloop') else 'asyncio'
+    http = 'httptools' if find_spec('httptools') else 'h11'
+    workers = worker_count(app_settings)
+    logger.info(f'Starting {workers} workers with {loop} and {http}')
+    uvicorn.run(
+        app='main:app',
+        host=app_settings.host,
+        port=app_settings.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=app_settings.backlog,
+        timeout_keep_alive=app_settings.keep_alive,
+        timeout_graceful_shutdown=app_settings.graceful_timeout,
+        log_level=app_settings.log_level,
+        access_log=False,
+        server_header=False,
+    )
+
+
+if __name__ == '__main__':
+    run()
@@ -1,11 +1,16 @@
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import LRUCache
 from core.logger import get_logger
 from domain.entities.application import ApplicationCreate, ApplicationRead
 from infrastructure.broker.base import EventPublisher
-from infrastructure.database.repository.application import (
-    ApplicationRepository,
-)
+from infrastructure.database.repository.application import ApplicationStore
 
 from .base import BaseService
+from .deduplication import DeduplicationService
+from .idempotency import IdempotencyService
 
 logger = get_logger(__name__)
 
@@ -20,30 +25,95 @@ class ApplicationService(
 
     def __init__(
         self,
-        repository: ApplicationRepository,
-        read_entity: ApplicationRead,
+        repository: ApplicationStore,
+        read_entity: type[ApplicationRead],
         event_publisher: EventPublisher,
+        idempotency: (
+            IdempotencyService[ApplicationCreate, ApplicationRead] | None
+        ) = None,
+        cache: LRUCache[UUID, ApplicationRead] | None = None,
+        deduplication: DeduplicationService | None = None,
     ) -> None:
-        super().__init__(repository, read_entity)
+        super().__init__(repository, read_entity, cache)
         self._event_publisher = event_publisher
+        self._idempotency = idempotency
+        self._deduplication = deduplication
 
     async def create_application(
         self,
         application: ApplicationCreate,
+        idempotency_key: str | None = None,
     ) -> ApplicationRead:
         """Creates a new application and publishes the event to Kafka.
 
+        Requests repeating an idempotency key get the application created
+        by the first request, without creating or publishing anything. With
+        deduplication, so do submissions repeating the user name and
+        description of an application created within the window.
+
+        The application is inserted in the transaction storing the
+        idempotency key, and the event is published once it is committed.
+        If publishing fails, the application and the key are deleted again.
+
         :param application: The application data to create.
         :type application: ApplicationCreate
+        :param idempotency_key: The client supplied idempotency key.
+        :type idempotency_key: str | None
         :returns: The created application.
         :rtype: ApplicationRead
         """
+        try:
+            if idempotency_key is not None and self._idempotency is not None:
+                result, created = await self._idempotency.run(
+                    idempotency_key,
+                    application,
+                    self._store_application,
+                )
+            else:
+                result, created = await self._store_application(
+                    application, None
+                )
+        except Exception:
+            if self._deduplication is not None:
+                self._deduplication.forget(application)
+            raise
+
+        if created:
+            self._remember(result)
+            await self._publish_created(result, application, idempotency_key)
+        return result
+
+    async def _store_application(
+        self,
+        application: ApplicationCreate,
+        session: AsyncSession | None,
+    ) -> tuple[ApplicationRead, bool]:
+        if self._deduplication is not None:
+            return await self._deduplication.run(
+                application,
+                self._insert_application,
+                session,
+            )
+        return await self._insert_application(application, session), True
+
+    async def _insert_application(
+        self,
+        application: ApplicationCreate,
+        session: AsyncSession | None,
+    ) -> ApplicationRead:
         logger.info(
             f'Creating new application for user: {application.user_name}'
         )
-        result = await self.create(application)
+        result = await self.create(application, session)
         logger.info(f'Application created successfully, ID: {result.id}')
+        return result
 
+    async def _publish_created(
+        self,
+        result: ApplicationRead,
+        application: ApplicationCreate,
+        idempotency_key: str | None,
+    ) -> None:
         logger.debug("Publishing application event to Kafka 'applications'")
         try:
             await self._publish_message(result)
@@ -53,6 +123,10 @@ class ApplicationService(
                 f'{str(exc)}'
             )
             await self.delete_by_id(result.id)
+            if self._deduplication is not None:
+                self._deduplication.forget(application)
+            if idempotency_key is not None and self._idempotency is not None:
+                await self._idempotency.forget(idempotency_key)
             raise exc
 
         logger.info(
@@ -60,8 +134,6 @@ class ApplicationService(
             f'ID: {result.id}'
         )
 
-        return result
-
     async def _publish_message(self, message: ApplicationRead) -> None:
         async with self._event_publisher as connect:
             await connect.publish(
@@ -0,0 +1,107 @@
+from datetime import UTC, datetime, timedelta
+from itertools import groupby
+from typing import Sequence
+
+from pydantic import BaseModel
+
+from core.logger import get_logger
+from core.metrics import metrics
+from infrastructure.archive.store import ArchiveStore
+from infrastructure.database.repository.base import ArchivableRepository
+
+logger = get_logger(__name__)
+
+archived_records = metrics.counter(
+    'archived_records_total',
+    'Records moved from the database to archive files.',
+)
+
+
+def _month(record: BaseModel) -> tuple[int, int]:
+    return record.created_at.year, record.created_at.month
+
+
+class ArchiveService[ReadSchemaType: BaseModel]:
+    """Moves records older than a maximum age to the archive.
+
+    Every batch of the oldest records is written to one file per month,
+    added to the index as pending, deleted from its database and then
+    marked complete. Readers read pending files too and drop the records
+    still in the database. A run first finishes the files left pending by
+    an interrupted run by deleting their records again, so a crash at any
+    step neither loses records nor makes readers see them twice.
+    """
+
+    def __init__(
+        self,
+        repositories: Sequence[ArchivableRepository],
+        archive: ArchiveStore[ReadSchemaType],
+        read_schema: type[ReadSchemaType],
+        max_age: timedelta,
+        batch_size: int,
+    ) -> None:
+        """Initializes the service.
+
+        :param repositories: The repository of every database, or of every
+        shard.
+        :type repositories: Sequence[ArchivableRepository]
+        :param archive: The archive the records are moved to.
+        :type archive: ArchiveStore[ReadSchemaType]
+        :param read_schema: The schema of the archived records.
+        :type read_schema: type[ReadSchemaType]
+        :param max_age: The age after which records are archived.
+        :type max_age: timedelta
+        :param batch_size: Records moved per batch.
+        :type batch_size: int
+        """
+        self._repositories = repositories
+        self._archive = archive
+        self._read_schema = read_schema
+        self._max_age = max_age
+        self._batch_size = batch_size
+
+    async def recover(self) -> int:
+        """Deletes the records of pending files from their database.
+
+        :returns: The number of files completed.
+        :rtype: int
+        """
+        entries = self._archive.pending()
+        for entry in entries:
+            records = await self._archive.read(entry)
+            await self._repositories[entry.shard].delete_by_ids(
+                [record.id for record in records]
+            )
+            await self._archive.complete(entry)
+            logger.info(f'Completed interrupted archive file {entry.path}')
+        return len(entries)
+
+    async def archive(self, now: datetime | None = None) -> int:
+        """Moves every record older than the maximum age to the archive.
+
+        :param now: The current time; defaults to the system clock.
+        :type now: datetime | None
+        :returns: The number of records archived.
+        :rtype: int
+        """
+        await self.recover()
+        before = (now or datetime.now(UTC)) - self._max_age
+        total = 0
+        for shard, repository in enumerate(self._repositories):
+            while rows := await repository.get_oldest(
+                before, self._batch_size
+            ):
+                records = [
+                    self._read_schema.model_validate(row) for row in rows
+                ]
+                for _, month in groupby(records, key=_month):
+                    batch = list(month)
+                    entry = await self._archive.write(batch, shard)
+                    await repository.delete_by_ids(
+                        [record.id for record in batch]
+                    )
+                    await self._archive.complete(entry)
+                archived_records.inc(len(records))
+                total += len(records)
+        logger.info(f'Archived {total} records created before {before}')
+        return total
@@ -1,13 +1,15 @@
-from typing import Type
+from datetime import datetime
+from typing import Any, Sequence, Type
 from uuid import UUID
 
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.cache import LRUCache
 from core.logger import get_logger
 from domain.entities.queries import BaseQuery
 from domain.exceptions import NotFoundError
-from infrastructure.database.base import Base
-from infrastructure.database.repository.base import BaseRepository
+from infrastructure.database.repository.base import Repository
 
 logger = get_logger(__name__)
 
@@ -16,22 +18,30 @@ class BaseService[
     CreateSchemaType: BaseModel,
     ReadSchemaType: BaseModel,
 ]:
-    """Base class for all services."""
+    """Base class for all services.
+
+    Records are never updated, so with a cache, lookups by ID are served
+    from it once a record was created or read by this process.
+    """
 
     def __init__(
         self,
-        repository: BaseRepository[Base, CreateSchemaType],
+        repository: Repository[Any, CreateSchemaType],
         read_entity: Type[ReadSchemaType],
+        cache: LRUCache[UUID, ReadSchemaType] | None = None,
     ) -> None:
         """Initializes the service.
 
         :param repository: The repository for the service.
-        :type repository: BaseRepository
+        :type repository: Repository
         :param read_entity: The read entity for the service.
         :type read_entity: Type[ReadSchemaType]
+        :param cache: The cache of records by ID.
+        :type cache: LRUCache[UUID, ReadSchemaType] | None
         """
         self._repository = repository
         self._read_entity = read_entity
+        self._cache = cache
 
     async def get_multi(self, query: Type[BaseQuery]) -> list[ReadSchemaType]:
         """Gets multiple records.
@@ -47,22 +57,147 @@ class BaseService[
             logger.warning('No records found, raising NotFoundError')
             raise NotFoundError()
         logger.info(f'Retrieved {len(result)} records')
-        return self._read_entity.from_list(result)
+        return self._list_entity(query).from_list(result)
+
+    async def get_multi_json(self, query: Type[BaseQuery]) -> bytes:
+        """Gets multiple records encoded as a JSON array.
+
+        :param query: The query to filter the records.
+        :type query: Type[BaseQuery]
+        :returns: The records as JSON.
+        :rtype: bytes
+        """
+        entities = await self.get_multi(query)
+        return self._list_entity(query).dump_list_json(entities)
+
+    def _list_entity(self, query: Type[BaseQuery]) -> Type[ReadSchemaType]:
+        """Returns the read entity, projected to the requested fields.
+
+        :param query: The list query.
+        :type query: Type[BaseQuery]
+        :returns: The entity class for the list items.
+        :rtype: Type[ReadSchemaType]
+        """
+        if not query.fields:
+            return self._read_entity
+        return self._read_entity.partial(frozenset(query.fields))
+
+    async def get_version(
+        self,
+        query: Type[BaseQuery],
+    ) -> tuple[int, datetime | None]:
+        """Gets a validator for the records matching a query.
+
+        :param query: The query to filter the records.
+        :type query: Type[BaseQuery]
+        :returns: The number of matching records and their latest
+        creation time.
+        :rtype: tuple[int, datetime | None]
+        """
+        return await self._repository.get_version(query)
+
+    async def get_by_id(self, entity_id: UUID) -> ReadSchemaType:
+        """Gets a record by its ID.
+
+        :param entity_id: The ID of the record.
+        :type entity_id: UUID
+        :returns: The record.
+        :rtype: ReadSchemaType
+        :raises NotFoundError: If the record does not exist.
+        """
+        if self._cache is not None:
+            entity = self._cache.get(entity_id)
+            if entity is not None:
+                return entity
+
+        result = await self._repository.get_by_id(entity_id)
+        if result is None:
+            raise NotFoundError()
+        entity = self._read_entity.model_validate(result)
+        self._remember(entity)
+        return entity
+
+    async def get_by_ids(
+        self,
+        entity_ids: Sequence[UUID],
+    ) -> list[ReadSchemaType]:
+        """Gets the records with the given IDs in a single query.
+
+        Cached records are not queried again.
+
+        :param entity_ids: The IDs of the records.
+        :type entity_ids: Sequence[UUID]
+        :returns: The existing records, in the order of their IDs.
+        :rtype: list[ReadSchemaType]
+        :raises NotFoundError: If none of the records exist.
+        """
+        found: dict[UUID, ReadSchemaType] = {}
+        missing = []
+        for entity_id in dict.fromkeys(entity_ids):
+            entity = None
+            if self._cache is not None:
+                entity = self._cache.get(entity_id)
+            if entity is None:
+                missing.append(entity_id)
+            else:
+                found[entity_id] = entity
+
+        if missing:
+            result = await self._repository.get_by_ids(missing)
+            for entity in self._read_entity.from_list(result):
+                found[entity.id] = entity
+                self._remember(entity)
 
-    async def create(self, entity: CreateSchemaType) -> ReadSchemaType:
+        if not found:
+            logger.warning('No records found, raising NotFoundError')
+            raise NotFoundError()
+        return [found[key] for key in entity_ids if key in found]
+
+    async def get_by_ids_json(self, query: Type[BaseQuery]) -> bytes:
+        """Gets the records with the IDs of a query, encoded as JSON.
+
+        :param query: The query naming the IDs and the fields to return.
+        :type query: Type[BaseQuery]
+        :returns: The records as a JSON array.
+        :rtype: bytes
+        """
+        entities = await self.get_by_ids(query.ids or ())
+        list_entity = self._list_entity(query)
+        if query.fields:
+            entities = list_entity.from_list(entities)
+        return list_entity.dump_list_json(entities)
+
+    def _remember(self, entity: ReadSchemaType) -> None:
+        if self._cache is not None:
+            self._cache.set(entity.id, entity)
+
+    async def create(
+        self,
+        entity: CreateSchemaType,
+        session: AsyncSession | None = None,
+    ) -> ReadSchemaType:
         """Creates a new record.
 
+        Records created on a session are not cached, since its transaction
+        may still be rolled back.
+
         :param entity: The data to create the record with.
         :type entity: CreateSchemaType
+        :param session: A session to insert on, left for the caller to
+        commit, instead of a new one.
+        :type session: AsyncSession | None
         :returns: The created record.
         :rtype: ReadSchemaType
         """
         logger.debug(
             f'Creating new record of type {entity.__class__.__name__}'
         )
-        result = await self._repository.create(entity)
+        result = await self._repository.create(entity, session)
         logger.info('Record created successfully')
-        return self._read_entity.model_validate(result)
+        created = self._read_entity.model_validate(result)
+        if session is None:
+            self._remember(created)
+        return created
 
     async def delete_by_id(self, entity_id: UUID) -> None:
         """Deletes a record by its ID.
@@ -70,4 +205,6 @@ class BaseService[
         :param entity_id: The ID of the record to delete.
         :type entity_id: UUID
         """
+        if self._cache is not None:
+            self._cache.pop(entity_id)
         await self._repository.delete_by_id(entity_id)
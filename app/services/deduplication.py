@@ -0,0 +1,150 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import LRUCache
+from core.logger import get_logger
+from core.metrics import metrics
+from domain.entities.application import ApplicationCreate, ApplicationRead
+from infrastructure.database.models.application import content_hash
+from infrastructure.database.repository.application import ApplicationStore
+
+logger = get_logger(__name__)
+
+suppressed_duplicates = metrics.counter(
+    'suppressed_duplicates_total',
+    'Repeated submissions answered with the earlier record, by where it '
+    'was found.',
+)
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+class DeduplicationService:
+    """Returns the earlier application for submissions repeated within a
+    window.
+
+    Submissions are identified by the hash of their user name and
+    description. Recent ones are found in an in-process LRU cache whose
+    entries expire with the window, others through the indexed
+    ``content_hash`` column. Identical submissions arriving concurrently
+    in a worker are serialized, so only the first one is created; ones
+    racing in different workers within a few milliseconds may both be.
+    """
+
+    def __init__(
+        self,
+        repository: ApplicationStore,
+        read_entity: type[ApplicationRead],
+        window: float,
+        cache_size: int,
+    ) -> None:
+        """Initializes the service.
+
+        :param repository: The application repository.
+        :type repository: ApplicationStore
+        :param read_entity: The entity the handler returns.
+        :type read_entity: type[ApplicationRead]
+        :param window: Seconds a submission suppresses its repetitions.
+        :type window: float
+        :param cache_size: Recent submissions kept in memory.
+        :type cache_size: int
+        """
+        self._repository = repository
+        self._read_entity = read_entity
+        self._window = timedelta(seconds=window)
+        self._cache: LRUCache[UUID, ApplicationRead] = LRUCache(
+            'deduplication', cache_size, window
+        )
+        self._locks: dict[UUID, asyncio.Lock] = {}
+        self._waiting: dict[UUID, int] = {}
+
+    async def run(
+        self,
+        entity: ApplicationCreate,
+        handler: Callable[
+            [ApplicationCreate, AsyncSession | None],
+            Awaitable[ApplicationRead],
+        ],
+        session: AsyncSession | None = None,
+    ) -> tuple[ApplicationRead, bool]:
+        """Runs the handler unless the same content was recently submitted.
+
+        :param entity: The submitted application.
+        :type entity: ApplicationCreate
+        :param handler: Creates the application.
+        :type handler: Callable
+        :param session: The session to look for duplicates on and to pass
+        to the handler.
+        :type session: AsyncSession | None
+        :returns: The created application, or the earlier one with the
+        same content, and whether it was created.
+        :rtype: tuple[ApplicationRead, bool]
+        """
+        key = content_hash(entity.user_name, entity.description)
+        since = datetime.now(UTC) - self._window
+        result = self._recent(key, since)
+        if result is not None:
+            suppressed_duplicates.inc(source='cache')
+            return result, False
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._waiting[key] = self._waiting.get(key, 0) + 1
+        try:
+            async with lock:
+                result = self._recent(key, since)
+                if result is not None:
+                    suppressed_duplicates.inc(source='cache')
+                    return result, False
+
+                stored = await self._repository.get_duplicate(
+                    entity, since, session
+                )
+                created = stored is None
+                if stored is not None:
+                    result = self._read_entity.model_validate(stored)
+                    suppressed_duplicates.inc(source='database')
+                    logger.info(f'Returning duplicate application {result.id}')
+                else:
+                    result = await handler(entity, session)
+                self._cache.set(key, result)
+                return result, created
+        finally:
+            waiting = self._waiting[key] - 1
+            if waiting:
+                self._waiting[key] = waiting
+            else:
+                del self._waiting[key]
+                del self._locks[key]
+
+    def forget(self, entity: ApplicationCreate) -> None:
+        """Drops a submission that was not kept, so that repeating it
+        creates the application again.
+
+        :param entity: The submitted application.
+        :type entity: ApplicationCreate
+        """
+        self._cache.pop(content_hash(entity.user_name, entity.description))
+
+    def _recent(self, key: UUID, since: datetime) -> ApplicationRead | None:
+        """Returns the cached application with a content hash if it was
+        created since a time.
+
+        :param key: The content hash.
+        :type key: UUID
+        :param since: The inclusive lower bound of ``created_at``.
+        :type since: datetime
+        :returns: The application, or None.
+        :rtype: ApplicationRead | None
+        """
+        result = self._cache.get(key)
+        if result is None or _utc(result.created_at) < since:
+            return None
+        return result
@@ -0,0 +1,112 @@
+import asyncio
+import json
+from typing import Any, Mapping
+
+from core.logger import get_logger
+from core.metrics import metrics
+
+logger = get_logger(__name__)
+
+health_ready = metrics.gauge(
+    'health_ready',
+    'Whether the worker reports itself ready for traffic (1) or not (0).',
+)
+
+
+class HealthService:
+    """Readiness of the worker, computed in the background.
+
+    ``start`` warms every dependency up concurrently, opening the database
+    pool and connecting the event producer. A background task then retries
+    the dependencies that failed to start and, every ``interval`` seconds,
+    caches whether each started dependency is ``ready``, which reflects
+    its connection and circuit breaker. Probes only read the cached
+    result, so they never wait on the database or the broker.
+    """
+
+    def __init__(
+        self,
+        dependencies: Mapping[str, Any],
+        interval: float,
+        start_timeout: float,
+    ) -> None:
+        """Initializes the service.
+
+        :param dependencies: The dependencies serving requests, by name.
+        :type dependencies: Mapping[str, Any]
+        :param interval: Seconds between readiness refreshes.
+        :type interval: float
+        :param start_timeout: Seconds starting a dependency may take.
+        :type start_timeout: float
+        """
+        self._dependencies = dependencies
+        self._interval = interval
+        self._start_timeout = start_timeout
+        self._started: set[str] = set()
+        self._failed: set[str] = set()
+        self._closing = False
+        self._task: asyncio.Task[None] | None = None
+        self.ready = False
+        self.body = b''
+        self._refresh()
+        health_ready.set_function(lambda: int(self.ready))
+
+    async def start(self) -> None:
+        """Starts the dependencies, then refreshes readiness in the
+        background."""
+        await self._start_dependencies()
+        self._refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Reports the worker as unavailable and stops the refreshes."""
+        self._closing = True
+        self._refresh()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _start_dependencies(self) -> None:
+        await asyncio.gather(
+            *(
+                self._start_dependency(name, dependency)
+                for name, dependency in self._dependencies.items()
+                if name not in self._started
+            )
+        )
+
+    async def _start_dependency(self, name: str, dependency: Any) -> None:
+        start = getattr(dependency, 'start', None)
+        if start is not None:
+            try:
+                async with asyncio.timeout(self._start_timeout):
+                    await start()
+            except Exception as exc:
+                log = logger.debug if name in self._failed else logger.warning
+                log(f'Failed to start {name}: {exc!r}')
+                self._failed.add(name)
+                return
+        if name in self._failed:
+            logger.info(f'Started {name}')
+        self._started.add(name)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            if len(self._started) < len(self._dependencies):
+                await self._start_dependencies()
+            self._refresh()
+
+    def _refresh(self) -> None:
+        """Caches the readiness of every dependency and the probe body."""
+        checks = {
+            name: name in self._started and getattr(dependency, 'ready', True)
+            for name, dependency in self._dependencies.items()
+        }
+        ready = not self._closing and all(checks.values())
+        if ready != self.ready:
+            logger.info(f'Worker is {"ready" if ready else "not ready"}')
+        self.ready = ready
+        self.body = json.dumps(
+            {'status': 'ready' if ready else 'unavailable', 'checks': checks}
+        ).encode()
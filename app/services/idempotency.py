@@ -0,0 +1,153 @@
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+from hashlib import sha256
+from typing import Awaitable, Callable, Type
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import LRUCache
+from core.logger import get_logger
+from domain.exceptions import IdempotencyKeyReusedError
+from infrastructure.database.repository.idempotency import IdempotencyStore
+
+logger = get_logger(__name__)
+
+
+class IdempotencyService[
+    CreateSchemaType: BaseModel,
+    ReadSchemaType: BaseModel,
+]:
+    """Replays the stored response for repeated idempotency keys.
+
+    Recently used keys are served from an in-process LRU cache. Other keys
+    are checked in the store under a lock on the key, so concurrent
+    requests with the same key run the handler at most once. The handler
+    runs on the session holding the lock, so its writes and the stored
+    response are committed together, and work that must only happen once
+    they are committed is left to the caller.
+    """
+
+    def __init__(
+        self,
+        repository: IdempotencyStore,
+        read_entity: Type[ReadSchemaType],
+        ttl: float,
+        cache_size: int,
+        cleanup_interval: float,
+    ) -> None:
+        """Initializes the service.
+
+        :param repository: The idempotency key repository.
+        :type repository: IdempotencyStore
+        :param read_entity: The entity the handler returns.
+        :type read_entity: Type[ReadSchemaType]
+        :param ttl: Seconds an idempotency key is honored.
+        :type ttl: float
+        :param cache_size: Keys kept in the in-process cache.
+        :type cache_size: int
+        :param cleanup_interval: Seconds between deletions of expired keys.
+        :type cleanup_interval: float
+        """
+        self._repository = repository
+        self._read_entity = read_entity
+        self._ttl = timedelta(seconds=ttl)
+        self._cache: LRUCache[str, tuple[str, ReadSchemaType]] = LRUCache(
+            'idempotency', cache_size, ttl
+        )
+        self._cleanup_interval = cleanup_interval
+        self._last_cleanup = time.monotonic()
+        self._cleanup: asyncio.Task[None] | None = None
+
+    async def run(
+        self,
+        key: str,
+        entity: CreateSchemaType,
+        handler: Callable[
+            [CreateSchemaType, AsyncSession | None],
+            Awaitable[tuple[ReadSchemaType, bool]],
+        ],
+    ) -> tuple[ReadSchemaType, bool]:
+        """Runs the handler once per key and replays its result afterwards.
+
+        :param key: The idempotency key sent by the client.
+        :type key: str
+        :param entity: The request entity.
+        :type entity: CreateSchemaType
+        :param handler: The operation to make idempotent, called with the
+        entity and the session holding the lock, if any. It returns its
+        result and whether it created anything.
+        :type handler: Callable
+        :returns: The result of the first request with this key, and
+        whether this request created it.
+        :rtype: tuple[ReadSchemaType, bool]
+        :raises IdempotencyKeyReusedError: If the key was used with a
+        different request.
+        :raises IdempotencyKeyInProgressError: If a request with the same
+        key held the lock for too long.
+        """
+        fingerprint = sha256(
+            entity.model_dump_json(exclude_unset=True).encode()
+        ).hexdigest()
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug(f'Replaying cached response for key {key}')
+            return self._check(fingerprint, *cached), False
+
+        now = datetime.now(UTC)
+        async with self._repository.lock(key) as locked:
+            stored = await locked.get(not_before=now - self._ttl)
+            if stored is not None:
+                logger.info(f'Replaying stored response for key {key}')
+                result = self._read_entity.model_validate(stored.response)
+                self._cache.set(key, (stored.fingerprint, result))
+                return (
+                    self._check(fingerprint, stored.fingerprint, result),
+                    False,
+                )
+
+            result, created = await handler(entity, locked.session)
+            await locked.save(
+                fingerprint, result.model_dump(mode='json'), now
+            )
+
+        self._cache.set(key, (fingerprint, result))
+        self._schedule_cleanup(now)
+        return result, created
+
+    async def forget(self, key: str) -> None:
+        """Drops a key, so that the next request using it runs again.
+
+        :param key: The idempotency key.
+        :type key: str
+        """
+        self._cache.pop(key)
+        await self._repository.delete(key)
+
+    @staticmethod
+    def _check(
+        fingerprint: str,
+        stored_fingerprint: str,
+        result: ReadSchemaType,
+    ) -> ReadSchemaType:
+        if fingerprint != stored_fingerprint:
+            raise IdempotencyKeyReusedError()
+        return result
+
+    def _schedule_cleanup(self, now: datetime) -> None:
+        if time.monotonic() - self._last_cleanup < self._cleanup_interval:
+            return
+        if self._cleanup is not None and not self._cleanup.done():
+            return
+        self._last_cleanup = time.monotonic()
+        self._cleanup = asyncio.create_task(
+            self._delete_expired(now - self._ttl)
+        )
+
+    async def _delete_expired(self, before: datetime) -> None:
+        try:
+            await self._repository.delete_expired(before)
+        except Exception as exc:
+            logger.error(f'Failed to delete expired keys: {str(exc)}')
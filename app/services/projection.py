@@ -0,0 +1,126 @@
+import asyncio
+from typing import Sequence
+
+from core.circuit_breaker import CircuitOpenError
+from core.logger import get_logger
+from core.metrics import metrics
+from domain.entities.application import ApplicationRead
+from infrastructure.database.engine import CONNECTION_ERRORS
+from infrastructure.database.repository.projection import ProjectionStore
+
+logger = get_logger(__name__)
+
+projected_events = metrics.counter(
+    'projection_events_total',
+    'Events consumed by the applications projection.',
+)
+projected_batches = metrics.counter(
+    'projection_batches_total',
+    'Batches upserted into the applications projection.',
+)
+projection_failures = metrics.counter(
+    'projection_failures_total',
+    'Failed attempts to upsert a batch into the applications projection.',
+)
+projection_skipped = metrics.counter(
+    'projection_skipped_events_total',
+    'Events left out of the applications projection after failing.',
+)
+
+UNAVAILABLE_ERRORS = (*CONNECTION_ERRORS, CircuitOpenError)
+
+
+class ProjectionService:
+    """Keeps the applications read model up to date from the topic.
+
+    While the database is unavailable, a batch is retried up to
+    ``max_retries`` times, so the consumer does not move past events that
+    are not in the read model yet; after that its events are skipped. A
+    batch rejected by the database is upserted event by event instead, and
+    the events rejected on their own are skipped. Skipped events are logged
+    with their ids. Upserts are idempotent, which makes redelivery after a
+    crash or a rebalance harmless.
+    """
+
+    def __init__(
+        self,
+        repository: ProjectionStore,
+        retry_backoff: float,
+        max_retries: int,
+    ) -> None:
+        """Initializes the service.
+
+        :param repository: The projection repository.
+        :type repository: ProjectionStore
+        :param retry_backoff: Seconds to wait before retrying a batch.
+        :type retry_backoff: float
+        :param max_retries: Retries of a batch while the database is
+        unavailable.
+        :type max_retries: int
+        """
+        self._repository = repository
+        self._retry_backoff = retry_backoff
+        self._max_retries = max_retries
+
+    async def project(self, batch: Sequence[ApplicationRead]) -> int:
+        """Upserts a batch of events, keeping the latest event per id.
+
+        :param batch: Events in the order they were consumed.
+        :type batch: Sequence[ApplicationRead]
+        :returns: The number of rows upserted.
+        :rtype: int
+        """
+        entities = tuple({entity.id: entity for entity in batch}.values())
+        count = retries = 0
+        while entities:
+            try:
+                count = await self._upsert(entities)
+                break
+            except UNAVAILABLE_ERRORS as exc:
+                projection_failures.inc()
+                if retries >= self._max_retries:
+                    self._skip(entities, str(exc))
+                    break
+                retries += 1
+                logger.error(
+                    f'Failed to project {len(entities)} applications, '
+                    f'retrying in {self._retry_backoff}s: {str(exc)}'
+                )
+                await asyncio.sleep(self._retry_backoff)
+        projected_events.inc(len(batch))
+        projected_batches.inc()
+        return count
+
+    async def _upsert(self, entities: Sequence[ApplicationRead]) -> int:
+        """Upserts events, one by one if the database rejects them.
+
+        :param entities: The events to upsert.
+        :type entities: Sequence[ApplicationRead]
+        :returns: The number of rows upserted.
+        :rtype: int
+        :raises CircuitOpenError: If the database is unavailable.
+        """
+        try:
+            await self._repository.upsert_many(entities)
+            return len(entities)
+        except UNAVAILABLE_ERRORS:
+            raise
+        except Exception as exc:
+            projection_failures.inc()
+            if len(entities) == 1:
+                self._skip(entities, str(exc))
+                return 0
+            logger.error(
+                f'Failed to project {len(entities)} applications, '
+                f'projecting them one by one: {str(exc)}'
+            )
+        count = 0
+        for entity in entities:
+            count += await self._upsert((entity,))
+        return count
+
+    @staticmethod
+    def _skip(entities: Sequence[ApplicationRead], reason: str) -> None:
+        projection_skipped.inc(len(entities))
+        ids = ', '.join(str(entity.id) for entity in entities)
+        logger.error(f'Skipped projecting applications {ids}: {reason}')
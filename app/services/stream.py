@@ -0,0 +1,213 @@
+import asyncio
+import json
+from functools import partial
+from typing import Sequence, Type
+from uuid import UUID
+
+from core.config import StreamSettings
+from core.logger import get_logger
+from core.metrics import metrics
+from domain.entities.application import ApplicationRead
+from domain.entities.queries import ApplicationQuery
+from domain.exceptions import TooManySubscribersError
+from infrastructure.database.filter.application import ApplicationFilter
+from infrastructure.database.listener import PostgresListener
+
+logger = get_logger(__name__)
+
+SlowConsumerPolicy = StreamSettings.SlowConsumerPolicy
+
+stream_subscribers = metrics.gauge(
+    'stream_subscribers',
+    'Subscribers connected to the applications stream.',
+)
+stream_dropped = metrics.counter(
+    'stream_dropped_events_total',
+    'Events dropped or subscribers disconnected for being slow.',
+)
+
+
+class Subscription:
+    """A subscriber's filter and bounded buffer of pending events."""
+
+    def __init__(
+        self,
+        query: ApplicationQuery,
+        queue_size: int,
+        policy: SlowConsumerPolicy,
+    ) -> None:
+        """Initializes the subscription.
+
+        :param query: The filter the subscriber is interested in.
+        :type query: ApplicationQuery
+        :param queue_size: Events buffered for the subscriber.
+        :type queue_size: int
+        :param policy: What to do when the buffer is full.
+        :type policy: SlowConsumerPolicy
+        """
+        self.query = query
+        self._policy = policy
+        self._queue: asyncio.Queue[ApplicationRead | None] = asyncio.Queue(
+            queue_size
+        )
+
+    def offer(self, entity: ApplicationRead) -> None:
+        """Buffers an event, applying the slow consumer policy if full.
+
+        :param entity: The new application.
+        :type entity: ApplicationRead
+        """
+        if not self._queue.full():
+            self._queue.put_nowait(entity)
+            return
+        stream_dropped.inc(policy=self._policy.value)
+        if self._policy is SlowConsumerPolicy.drop_oldest:
+            self._queue.get_nowait()
+            self._queue.put_nowait(entity)
+            return
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> ApplicationRead:
+        """Waits for the next event.
+
+        :param timeout: Seconds to wait.
+        :type timeout: float
+        :returns: The next event.
+        :rtype: ApplicationRead
+        :raises TimeoutError: If no event arrived in time.
+        :raises ConnectionAbortedError: If the subscriber was disconnected
+        for being too slow.
+        """
+        entity = await asyncio.wait_for(self._queue.get(), timeout)
+        if entity is None:
+            raise ConnectionAbortedError('Subscriber is too slow')
+        return entity
+
+
+class ApplicationStreamService:
+    """Fans out newly created applications to stream subscribers.
+
+    One Postgres listener per database holding applications (the main
+    database, or every shard) receives notifications for new rows; every
+    matching subscriber gets the event in its own bounded queue, so a slow
+    subscriber never blocks the others.
+    """
+
+    def __init__(
+        self,
+        listeners: Sequence[PostgresListener],
+        filter: ApplicationFilter,
+        read_entity: Type[ApplicationRead],
+        queue_size: int,
+        policy: SlowConsumerPolicy,
+        max_subscribers: int,
+        heartbeat_interval: float,
+    ) -> None:
+        """Initializes the service.
+
+        :param listeners: The listeners for new application notifications.
+        :type listeners: Sequence[PostgresListener]
+        :param filter: The filter used to match subscriber queries.
+        :type filter: ApplicationFilter
+        :param read_entity: The entity events are parsed into.
+        :type read_entity: Type[ApplicationRead]
+        :param queue_size: Events buffered per subscriber.
+        :type queue_size: int
+        :param policy: The slow consumer policy.
+        :type policy: SlowConsumerPolicy
+        :param max_subscribers: Concurrent subscribers allowed.
+        :type max_subscribers: int
+        :param heartbeat_interval: Seconds between keep-alive messages.
+        :type heartbeat_interval: float
+        """
+        self._listeners = listeners
+        self._filter = filter
+        self._read_entity = read_entity
+        self._queue_size = queue_size
+        self._policy = policy
+        self._max_subscribers = max_subscribers
+        self.heartbeat_interval = heartbeat_interval
+        self._subscriptions: set[Subscription] = set()
+        self._notifications: asyncio.Queue[
+            tuple[PostgresListener, str]
+        ] = asyncio.Queue()
+        self._dispatcher: asyncio.Task[None] | None = None
+        stream_subscribers.set_function(lambda: len(self._subscriptions))
+
+    def subscribe(self, query: ApplicationQuery) -> Subscription:
+        """Subscribes to new applications matching a query.
+
+        :param query: The filter the subscriber is interested in.
+        :type query: ApplicationQuery
+        :returns: The subscription.
+        :rtype: Subscription
+        :raises TooManySubscribersError: If the subscriber limit is reached.
+        """
+        if len(self._subscriptions) >= self._max_subscribers:
+            raise TooManySubscribersError()
+        self._start()
+        subscription = Subscription(query, self._queue_size, self._policy)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Removes a subscription; safe to call more than once.
+
+        :param subscription: The subscription to remove.
+        :type subscription: Subscription
+        """
+        self._subscriptions.discard(subscription)
+
+    def _start(self) -> None:
+        if self._dispatcher is not None:
+            return
+        for listener in self._listeners:
+            listener.start(partial(self._notify, listener))
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    def _notify(self, listener: PostgresListener, payload: str) -> None:
+        self._notifications.put_nowait((listener, payload))
+
+    async def _dispatch(self) -> None:
+        while True:
+            listener, payload = await self._notifications.get()
+            try:
+                entity = await self._parse(listener, payload)
+            except Exception as exc:
+                logger.error(f'Invalid notification payload: {str(exc)}')
+                continue
+            if entity is None:
+                continue
+            for subscription in tuple(self._subscriptions):
+                if self._filter.matches(subscription.query, entity):
+                    subscription.offer(entity)
+
+    async def _parse(
+        self,
+        listener: PostgresListener,
+        payload: str,
+    ) -> ApplicationRead | None:
+        """Parses a notification, loading the row if it was too large.
+
+        :param listener: The listener that received the notification.
+        :type listener: PostgresListener
+        :param payload: The notification payload.
+        :type payload: str
+        :returns: The new application, or None if it no longer exists.
+        :rtype: ApplicationRead | None
+        """
+        data = json.loads(payload)
+        if data.keys() == {'id'}:
+            data = await listener.get_by_id(UUID(data['id']))
+            if data is None:
+                return None
+        return self._read_entity.model_validate(data)
+
+    async def close(self) -> None:
+        """Stops the dispatcher and the listeners."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        for listener in self._listeners:
+            await listener.stop()
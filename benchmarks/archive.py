@@ -0,0 +1,224 @@
+"""Parity of reads through the archive with a database holding every row.
+
+Creates applications spread over two years in an in-memory repository and
+in a reference repository, then moves the ones older than a year to
+archive files in a temporary directory with the archival job. Every list,
+version and lookup query must return the same records through the
+``ArchivedRepository`` as from the reference, whether its time range
+covers the database, the archive or both, including while a batch is
+written but not yet deleted from the database and while it is deleted but
+not yet marked complete. List queries are timed with a warm file cache.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.archive
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from itertools import groupby
+from typing import Any
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+
+from domain.entities.application import (  # noqa: E402
+    ApplicationCreate,
+    ApplicationRead,
+)
+from domain.entities.queries import ApplicationQuery  # noqa: E402
+from domain.ids import uuid7  # noqa: E402
+from infrastructure.archive.store import ArchiveStore  # noqa: E402
+from infrastructure.database.filter.application import (  # noqa: E402
+    ApplicationFilter,
+)
+from infrastructure.database.models.application import (  # noqa: E402
+    Application,
+)
+from infrastructure.database.repository.archived import (  # noqa: E402
+    ArchivedRepository,
+)
+from infrastructure.database.repository.memory import (  # noqa: E402
+    InMemoryApplicationRepository,
+)
+from services.archive import ArchiveService  # noqa: E402
+
+NOW = datetime(2026, 1, 1, tzinfo=UTC)
+ROUNDS = 200
+QUERIES = (
+    ApplicationQuery(size=50),
+    ApplicationQuery(size=25, page=40),
+    ApplicationQuery(size=50, page=5_000),
+    ApplicationQuery(size=50, user_name='user-1'),
+    ApplicationQuery(size=25, fields=('user_name',), page=3),
+    ApplicationQuery(size=50, created_after=NOW - timedelta(days=30)),
+    ApplicationQuery(
+        size=50,
+        created_after=NOW - timedelta(days=600),
+        created_before=NOW - timedelta(days=500),
+    ),
+    ApplicationQuery(
+        size=25,
+        page=10,
+        created_after=NOW - timedelta(days=400),
+        created_before=NOW - timedelta(days=300),
+    ),
+    ApplicationQuery(
+        size=25, user_name='user-4', created_before=datetime(2025, 1, 1)
+    ),
+)
+
+
+def normalize(records: Any) -> list[dict[str, Any]]:
+    return [dict(record) for record in records]
+
+
+def applications(count: int) -> list[ApplicationCreate]:
+    """Returns applications created over the two years before ``NOW``.
+
+    :param count: The number of applications.
+    :type count: int
+    :returns: The applications.
+    :rtype: list[ApplicationCreate]
+    """
+    return [
+        ApplicationCreate(
+            user_name=f'user-{index % 100}',
+            description='Application for new service access',
+            created_at=NOW - timedelta(minutes=random.randrange(2 * 525_600)),
+        )
+        for index in range(count)
+    ]
+
+
+async def check(
+    archived: ArchivedRepository,
+    reference: InMemoryApplicationRepository,
+    created: list[ApplicationCreate],
+) -> None:
+    for query in QUERIES:
+        expected = normalize(await reference.get_multi(query))
+        actual = normalize(await archived.get_multi(query))
+        assert actual == expected, f'get_multi differs for {query}'
+        assert await archived.get_version(query) == (
+            await reference.get_version(query)
+        ), f'get_version differs for {query}'
+
+    sample = random.sample(created, 20)
+    for application in sample[:5]:
+        record = await archived.get_by_id(application.id)
+        assert record is not None and record['id'] == application.id
+    ids = [application.id for application in sample]
+    found = {record['id'] for record in await archived.get_by_ids(ids)}
+    assert found == set(ids), 'get_by_ids misses records'
+    print(f'{len(QUERIES)} list queries and lookups match the reference')
+
+
+async def interrupted(
+    service: ArchiveService[ApplicationRead],
+    store: ArchiveStore[ApplicationRead],
+    hot: InMemoryApplicationRepository,
+    archived: ArchivedRepository,
+    reference: InMemoryApplicationRepository,
+    created: list[ApplicationCreate],
+) -> None:
+    """Checks reads at every step of archiving a batch.
+
+    :param service: The archival job.
+    :type service: ArchiveService[ApplicationRead]
+    :param store: The archive of the job.
+    :type store: ArchiveStore[ApplicationRead]
+    :param hot: The database of the job.
+    :type hot: InMemoryApplicationRepository
+    :param archived: The repository reading both.
+    :type archived: ArchivedRepository
+    :param reference: The repository holding every row.
+    :type reference: InMemoryApplicationRepository
+    :param created: The created applications.
+    :type created: list[ApplicationCreate]
+    """
+    rows = await hot.get_oldest(NOW - timedelta(days=300), 1_000)
+    records = [ApplicationRead.model_validate(row) for row in rows]
+    entries = [
+        await store.write(list(month), 0)
+        for _, month in groupby(
+            records, key=lambda record: record.created_at.strftime('%Y-%m')
+        )
+    ]
+    await check(archived, reference, created)
+    await hot.delete_by_ids([record.id for record in records])
+    await check(archived, reference, created)
+    assert len(store.pending()) == len(entries)
+    assert await service.recover() == len(entries)
+    await check(archived, reference, created)
+    assert await store.find((uuid7(),)) == []
+
+
+async def timed(
+    archived: ArchivedRepository,
+    reference: InMemoryApplicationRepository,
+) -> None:
+    for query in QUERIES[5:8]:
+        repositories = (('all rows', reference), ('archive', archived))
+        for name, repository in repositories:
+            started = time.perf_counter()
+            for _ in range(ROUNDS):
+                await repository.get_multi(query)
+            elapsed = (time.perf_counter() - started) / ROUNDS
+            print(
+                f'  {query.created_after:%Y-%m-%d} to '
+                f'{query.created_before or NOW:%Y-%m-%d} {name:>8}: '
+                f'{elapsed * 1e6:8.1f} us/query'
+            )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=50_000)
+    parser.add_argument('--batch-size', type=int, default=5_000)
+    args = parser.parse_args()
+
+    hot = InMemoryApplicationRepository()
+    reference = InMemoryApplicationRepository()
+    created = applications(args.seed)
+    for application in created:
+        await hot.create(application)
+        await reference.create(application)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ArchiveStore(directory, ApplicationRead, 64)
+        service = ArchiveService(
+            [hot], store, ApplicationRead, timedelta(days=365), args.batch_size
+        )
+        started = time.perf_counter()
+        moved = await service.archive(NOW)
+        elapsed = time.perf_counter() - started
+        entries = store.entries()
+        size = sum(
+            os.path.getsize(os.path.join(directory, entry.path))
+            for entry in entries
+        )
+        print(
+            f'archived {moved} of {args.seed} applications to '
+            f'{len(entries)} files ({size / 2**20:.2f} MiB) in {elapsed:.2f}s'
+        )
+        assert len(hot) + moved == args.seed
+        assert sum(entry.count for entry in entries) == moved
+        assert not store.pending()
+        assert await service.archive(NOW) == 0
+
+        archived = ArchivedRepository(
+            hot, store, ApplicationFilter(Application)
+        )
+        await check(archived, reference, created)
+        await interrupted(service, store, hot, archived, reference, created)
+        print('list queries by time range:')
+        await timed(archived, reference)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+"""Parity and speed of the raw asyncpg repository against SQLAlchemy.
+
+Needs the Postgres configured by ``POSTGRES_*`` with migrations applied.
+Creates applications through both repositories, checks that every
+lookup, list, version, duplicate and oldest-first query returns the same
+rows from both, times them, and deletes the applications it created.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.asyncpg_parity
+"""
+
+import asyncio
+import os
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+
+from core.config import DatabaseSettings, get_settings  # noqa: E402
+from core.providers import libpq_uri  # noqa: E402
+from domain.entities.application import ApplicationCreate  # noqa: E402
+from domain.entities.queries import ApplicationQuery  # noqa: E402
+from infrastructure.database.engine import SqlAlchemyEngine  # noqa: E402
+from infrastructure.database.filter.application import (  # noqa: E402
+    ApplicationFilter,
+)
+from infrastructure.database.models.application import (  # noqa: E402
+    Application,
+)
+from infrastructure.database.pool import AsyncpgPool  # noqa: E402
+from infrastructure.database.repository.application import (  # noqa: E402
+    ApplicationRepository,
+    RawApplicationRepository,
+)
+
+SEED = 500
+ROUNDS = 500
+
+
+def normalize(rows: Any) -> list[dict[str, Any]]:
+    return [dict(row) for row in rows]
+
+
+async def timed(
+    name: str,
+    call: Callable[[], Awaitable[Any]],
+) -> None:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        await call()
+    elapsed = time.perf_counter() - started
+    print(f'{name:>24}: {elapsed / ROUNDS * 1e6:8.1f} us/query')
+
+
+async def main() -> None:
+    settings = get_settings(DatabaseSettings)
+    engine = SqlAlchemyEngine(settings.uri)
+    pool = AsyncpgPool(libpq_uri(settings.uri))
+    filter = ApplicationFilter(Application)
+    orm = ApplicationRepository(engine, Application, filter)
+    raw = RawApplicationRepository(pool, Application, filter)
+    marker = uuid4().hex[:8]
+
+    created = []
+    for index in range(SEED):
+        repository = orm if index % 2 else raw
+        record = await repository.create(
+            ApplicationCreate(
+                user_name=f'parity-{marker}-{index % 7}',
+                description='Parity check',
+            )
+        )
+        created.append(record['id'] if isinstance(record, dict) else record.id)
+
+    try:
+        queries = [
+            ApplicationQuery(size=50, user_name=marker),
+            ApplicationQuery(size=25, user_name=f'{marker}-3', page=2),
+            ApplicationQuery(
+                size=50, user_name=marker.upper(), fields=('id', 'user_name')
+            ),
+            ApplicationQuery(size=50, user_name=f'{marker}-missing'),
+        ]
+        for query in queries:
+            expected = normalize(await orm.get_multi(query))
+            actual = normalize(await raw.get_multi(query))
+            key = lambda row: str(row['id'])  # noqa: E731
+            assert sorted(expected, key=key) == sorted(actual, key=key), query
+            assert await orm.get_version(query) == await raw.get_version(
+                query
+            ), query
+        print(f'{len(queries)} queries return the same rows')
+
+        ids = created[:10]
+        for entity_id in ids:
+            expected_row = await orm.get_by_id(entity_id)
+            assert expected_row is not None, entity_id
+            assert dict(expected_row) == await raw.get_by_id(entity_id)
+        assert sorted(normalize(await orm.get_by_ids(ids)), key=key) == (
+            sorted(normalize(await raw.get_by_ids(ids)), key=key)
+        )
+        submitted = ApplicationCreate(
+            user_name=f'parity-{marker}-0', description='Parity check'
+        )
+        since = datetime.now(UTC) - timedelta(hours=1)
+        duplicate = await orm.get_duplicate(submitted, since)
+        assert duplicate is not None
+        assert dict(duplicate) == await raw.get_duplicate(submitted, since)
+        before = datetime.now(UTC) + timedelta(minutes=1)
+        assert normalize(await orm.get_oldest(before, 20)) == normalize(
+            await raw.get_oldest(before, 20)
+        )
+        print('lookups, duplicates and oldest records are the same')
+
+        query = queries[0]
+        await timed('sqlalchemy get_multi', lambda: orm.get_multi(query))
+        await timed('asyncpg get_multi', lambda: raw.get_multi(query))
+        await timed('sqlalchemy get_version', lambda: orm.get_version(query))
+        await timed('asyncpg get_version', lambda: raw.get_version(query))
+    finally:
+        await raw.delete_by_id(created[0])
+        assert await raw.delete_by_ids(created) == len(created) - 1
+        await pool.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
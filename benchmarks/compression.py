@@ -0,0 +1,146 @@
+"""CPU time against bytes saved by response compression.
+
+Encodes a 50-row list page and a 10 000-row export-sized body with every
+installed encoder at a few levels, and reports the compressed size, the
+CPU time per response and the bytes saved per CPU millisecond, which is
+what the ``COMPRESSION_*`` defaults are chosen from. Also measures a CORS
+preflight with and without the response cache.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.compression
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+
+from starlette.middleware.cors import CORSMiddleware  # noqa: E402
+
+from core.config import CompressionSettings  # noqa: E402
+from domain.entities.application import ApplicationRead  # noqa: E402
+from domain.ids import uuid7  # noqa: E402
+from public.api.middleware.compression import (  # noqa: E402
+    Encoder,
+    create_encoders,
+)
+from public.api.middleware.cors import CachedCORSMiddleware  # noqa: E402
+
+WORDS = (
+    'access request service account team project database storage network '
+    'review approve deploy staging production monitor backup quota report '
+    'analytics pipeline billing support migration credentials read write'
+).split()
+LEVELS: dict[str, tuple[int, ...]] = {
+    'gzip': (1, 5, 9),
+    'br': (1, 4, 6),
+    'zstd': (1, 3, 9),
+}
+
+
+def make_body(rows: int) -> bytes:
+    generator = random.Random(rows)
+    created_at = datetime(2026, 1, 1, tzinfo=UTC)
+    models = [
+        ApplicationRead(
+            id=uuid7(),
+            user_name=f'user-{generator.randrange(100_000)}',
+            description=' '.join(
+                generator.choices(WORDS, k=generator.randrange(4, 24))
+            ),
+            created_at=created_at + timedelta(seconds=index),
+        )
+        for index in range(rows)
+    ]
+    return ApplicationRead.dump_list_json(models)
+
+
+def encoders() -> list[tuple[str, int, Encoder]]:
+    """Returns every installed encoder at each level to compare."""
+    compared = []
+    for index in range(3):
+        settings = CompressionSettings(
+            gzip_level=LEVELS['gzip'][index],
+            brotli_quality=LEVELS['br'][index],
+            zstd_level=LEVELS['zstd'][index],
+        )
+        for encoder in create_encoders(settings):
+            compared.append(
+                (encoder.name, LEVELS[encoder.name][index], encoder)
+            )
+    return sorted(compared, key=lambda item: (item[0], item[1]))
+
+
+def compression(rounds: int) -> None:
+    for name, rows in (('page', 50), ('export', 10_000)):
+        body = make_body(rows)
+        count = max(rounds * 50 // rows, 5)
+        print(f'{name}: {rows} rows, {len(body)} bytes')
+        for encoding, level, encoder in encoders():
+            started = time.process_time()
+            for _ in range(count):
+                compressed = encoder.compress(body)
+            cpu = (time.process_time() - started) / count
+            saved = len(body) - len(compressed)
+            print(
+                f'{encoding:>6} {level:>2}: {len(compressed):>9} bytes '
+                f'({len(compressed) / len(body):6.1%}), '
+                f'{cpu * 1e6:9.1f} us CPU, '
+                f'{saved / (cpu * 1e3):9.0f} bytes saved/CPU ms'
+            )
+
+
+async def preflight(requests: int) -> None:
+    options: dict[str, Any] = {
+        'allow_origins': ['http://localhost', 'http://127.0.0.1'],
+        'allow_credentials': True,
+        'allow_methods': ['GET', 'POST'],
+        'allow_headers': ['Content-Type', 'Authorization'],
+    }
+    scope = {
+        'type': 'http',
+        'method': 'OPTIONS',
+        'path': '/api/v1/applications',
+        'headers': [
+            (b'origin', b'http://localhost'),
+            (b'access-control-request-method', b'POST'),
+            (b'access-control-request-headers', b'content-type'),
+        ],
+    }
+
+    async def receive() -> dict[str, Any]:
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message: Any) -> None:
+        pass
+
+    async def app(scope: Any, receive: Any, send: Any) -> None:
+        pass
+
+    for name, middleware in (
+        ('uncached', CORSMiddleware(app, **options)),
+        ('cached', CachedCORSMiddleware(app, **options)),
+    ):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await middleware(scope, receive, send)
+        elapsed = time.perf_counter() - started
+        print(f'preflight, {name:>8}: {elapsed / requests * 1e6:6.1f} us')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=2_000)
+    args = parser.parse_args()
+    compression(args.rounds)
+    asyncio.run(preflight(args.rounds * 10))
+
+
+if __name__ == '__main__':
+    main()
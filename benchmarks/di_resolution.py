@@ -0,0 +1,135 @@
+"""Per-request cost of dependency resolution.
+
+Compares the previous provider layout, where the application repository
+and service were built in request scope, with the current one, where
+they are built once per process:
+
+* ``resolve`` enters a request scope and resolves the service, the work
+  Dishka does for every request;
+* ``request`` sends a request through the ASGI app with many routes
+  that each inject the service, to include routing and the middleware.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.di_resolution
+"""
+
+import asyncio
+import os
+import time
+from typing import Any
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+
+import httpx  # noqa: E402
+from dishka import Provider, Scope, make_async_container, provide  # noqa: E402
+from dishka.integrations.fastapi import (  # noqa: E402
+    FastapiProvider,
+    FromDishka,
+    inject,
+)
+from fastapi import FastAPI  # noqa: E402
+
+from core.providers import (  # noqa: E402
+    InMemoryApplicationProvider,
+    InMemoryBrokerProvider,
+)
+from domain.entities.application import ApplicationRead  # noqa: E402
+from infrastructure.broker.base import EventPublisher  # noqa: E402
+from infrastructure.database.repository.application import (  # noqa: E402
+    ApplicationStore,
+)
+from infrastructure.database.repository.memory import (  # noqa: E402
+    InMemoryApplicationRepository,
+)
+from public.api.app import create_app  # noqa: E402
+from services.application import ApplicationService  # noqa: E402
+
+ROUTES = 200
+ROUNDS = 5_000
+
+
+class RequestScopedProvider(Provider):
+    """The previous layout: a repository and service per request."""
+
+    @provide(scope=Scope.APP)
+    def storage(self) -> InMemoryApplicationRepository:
+        return InMemoryApplicationRepository()
+
+    @provide(scope=Scope.REQUEST)
+    def repository(
+        self,
+        storage: InMemoryApplicationRepository,
+    ) -> ApplicationStore:
+        return storage
+
+    @provide(scope=Scope.REQUEST)
+    def service(
+        self,
+        repository: ApplicationStore,
+        event_publisher: EventPublisher,
+    ) -> ApplicationService:
+        return ApplicationService(repository, ApplicationRead, event_publisher)
+
+
+LAYOUTS = {
+    'request': lambda: [
+        InMemoryBrokerProvider(),
+        RequestScopedProvider(),
+        FastapiProvider(),
+    ],
+    'app': lambda: [
+        InMemoryBrokerProvider(),
+        InMemoryApplicationProvider(),
+        FastapiProvider(),
+    ],
+}
+
+
+async def resolve(providers: list[Provider]) -> float:
+    container = make_async_container(*providers)
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        async with container() as request:
+            await request.get(ApplicationService)
+    elapsed = time.perf_counter() - started
+    await container.close()
+    return elapsed / ROUNDS
+
+
+def add_routes(app: FastAPI) -> None:
+    for index in range(ROUTES):
+
+        @app.get(f'/bench/{index}')
+        @inject
+        async def route(service: FromDishka[ApplicationService]) -> Any:
+            return None
+
+
+async def request(providers: list[Provider]) -> float:
+    app = create_app(providers)
+    add_routes(app)
+    rounds = ROUNDS // 5
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url='http://benchmark'
+    ) as client:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await client.get(f'/bench/{ROUTES - 1}')
+        elapsed = time.perf_counter() - started
+    return elapsed / rounds
+
+
+async def main() -> None:
+    for name, providers in LAYOUTS.items():
+        resolve_seconds = await resolve(providers())
+        request_seconds = await request(providers())
+        print(
+            f'{name + " scope":>13}: resolve {resolve_seconds * 1e6:6.1f} us, '
+            f'request {request_seconds * 1e6:7.1f} us '
+            f'({ROUTES} routes)'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
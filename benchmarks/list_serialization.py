@@ -0,0 +1,72 @@
+"""Benchmark of list response serialization on 50-row pages.
+
+Compares the previous path (ORM entities validated one by one, then
+re-validated and encoded by FastAPI) with the fast path (row mappings
+validated and encoded once through a cached ``TypeAdapter``).
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.list_serialization
+"""
+
+import asyncio
+import os
+import timeit
+from datetime import datetime
+from uuid import uuid4
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from domain.entities.application import ApplicationRead  # noqa: E402
+from infrastructure.database.models.application import (  # noqa: E402
+    Application,
+)
+from public.api.responses import RawJSONResponse  # noqa: E402
+
+PAGE_SIZE = 50
+ROUNDS = 2_000
+
+
+def make_rows() -> list[dict[str, object]]:
+    return [
+        {
+            'id': uuid4(),
+            'user_name': f'user-{index}',
+            'description': 'Application for new service access ' * 4,
+            'created_at': datetime.now(),
+        }
+        for index in range(PAGE_SIZE)
+    ]
+
+
+def main() -> None:
+    rows = make_rows()
+    entities = [Application(**row) for row in rows]
+    field = create_model_field('response', list[ApplicationRead])
+    loop = asyncio.new_event_loop()
+
+    def previous() -> bytes | memoryview:
+        models = [ApplicationRead.model_validate(item) for item in entities]
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=models)
+        )
+        return JSONResponse(content).body
+
+    def fast() -> bytes | memoryview:
+        models = ApplicationRead.from_list(rows)
+        return RawJSONResponse(ApplicationRead.dump_list_json(models)).body
+
+    for name, func in (('previous', previous), ('fast', fast)):
+        seconds = min(timeit.repeat(func, number=ROUNDS, repeat=3))
+        print(
+            f'{name:>8}: {seconds / ROUNDS * 1e6:8.1f} us/page '
+            f'({PAGE_SIZE} rows)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+"""Load benchmark of the applications API.
+
+Builds the application with ``create_app`` and drives it in-process
+through an ASGI client, so no server or network is involved. Kafka is
+always replaced by the in-memory publisher; applications are kept in the
+in-memory repository, or in the Postgres configured by ``POSTGRES_*``
+with ``--backend postgres``.
+
+Every scenario reports requests per second and p50/p99 latency. Results
+are written as JSON, to the temporary directory unless ``--output`` is
+given, and compared against a stored baseline; the exit status is 1 when
+a scenario's throughput or median latency regressed by more than the
+tolerance.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.load
+    PYTHONPATH=app python -m benchmarks.load --save-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+# Every request comes from the same client, which the limits would refuse.
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+
+import httpx  # noqa: E402
+from dishka.integrations.fastapi import FastapiProvider  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from core.providers import (  # noqa: E402
+    ApplicationProvider,
+    CircuitBreakerProvider,
+    IdempotencyProvider,
+    InMemoryBrokerProvider,
+    SqlAlchemyProvider,
+    memory_providers,
+)
+from domain.entities.application import ApplicationCreate  # noqa: E402
+from infrastructure.database.repository.application import (  # noqa: E402
+    ApplicationStore,
+)
+from public.api.app import create_app  # noqa: E402
+
+BENCHMARKS = Path(__file__).parent
+BASELINE = BENCHMARKS / 'baseline.json'
+RESULTS = Path(tempfile.gettempdir()) / 'applications-load.json'
+URL = '/api/v1/applications'
+PAGE_SIZE = 50
+
+Request = Callable[[httpx.AsyncClient, int], Any]
+
+
+@dataclass
+class Result:
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p99_ms: float
+
+
+def scenarios(seed: int) -> dict[str, Request]:
+    """Returns the request issued by each scenario.
+
+    :param seed: The number of applications stored before the run.
+    :type seed: int
+    :returns: The request callables, keyed by scenario name.
+    :rtype: dict[str, Request]
+    """
+    last_page = max(seed // PAGE_SIZE, 1)
+
+    def create(client: httpx.AsyncClient, index: int) -> Any:
+        return client.post(
+            URL,
+            json={
+                'user_name': f'user-{index % 100}',
+                'description': 'Application for new service access',
+            },
+        )
+
+    def list_(client: httpx.AsyncClient, index: int) -> Any:
+        return client.get(URL, params={'size': PAGE_SIZE})
+
+    def filtered(client: httpx.AsyncClient, index: int) -> Any:
+        return client.get(
+            URL, params={'size': PAGE_SIZE, 'user_name': f'user-{index % 10}'}
+        )
+
+    def deep(client: httpx.AsyncClient, index: int) -> Any:
+        return client.get(URL, params={'size': PAGE_SIZE, 'page': last_page})
+
+    return {
+        'list': list_,
+        'filtered_list': filtered,
+        'deep_pagination': deep,
+        'create': create,
+    }
+
+
+def build_app(backend: str) -> FastAPI:
+    """Builds the application for the chosen backend, with the in-memory
+    publisher in place of Kafka.
+
+    :param backend: ``memory`` or ``postgres``.
+    :type backend: str
+    :returns: The application.
+    :rtype: FastAPI
+    """
+    if backend == 'memory':
+        return create_app(memory_providers)
+    return create_app(
+        [
+            CircuitBreakerProvider(),
+            SqlAlchemyProvider(),
+            IdempotencyProvider(),
+            ApplicationProvider(),
+            InMemoryBrokerProvider(),
+            FastapiProvider(),
+        ]
+    )
+
+
+async def seed_applications(
+    app: FastAPI,
+    client: httpx.AsyncClient,
+    backend: str,
+    count: int,
+) -> None:
+    applications = [
+        ApplicationCreate(
+            user_name=f'user-{index % 100}',
+            description='Application for new service access',
+        )
+        for index in range(count)
+    ]
+    if backend == 'memory':
+        async with app.state.dishka_container() as container:
+            repository = await container.get(ApplicationStore)
+        for application in applications:
+            await repository.create(application)
+        return
+    for application in applications:
+        response = await client.post(
+            URL, content=application.model_dump_json()
+        )
+        response.raise_for_status()
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    request: Request,
+    requests: int,
+    concurrency: int,
+) -> Result:
+    """Issues requests from concurrent workers and records latencies.
+
+    :param client: The ASGI client.
+    :type client: httpx.AsyncClient
+    :param request: Issues one request of the scenario.
+    :type request: Request
+    :param requests: The number of requests to issue.
+    :type requests: int
+    :param concurrency: The number of concurrent workers.
+    :type concurrency: int
+    :returns: The scenario result.
+    :rtype: Result
+    """
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in counter:
+            started = time.perf_counter()
+            response = await request(client, index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return Result(
+        requests=requests,
+        errors=errors,
+        rps=round(requests / elapsed, 1),
+        p50_ms=round(percentiles[49] * 1000, 3),
+        p99_ms=round(percentiles[98] * 1000, 3),
+    )
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    app = build_app(args.backend)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://benchmark'
+    ) as client:
+        await seed_applications(app, client, args.backend, args.seed)
+        results = {}
+        for name, request in scenarios(args.seed).items():
+            await run_scenario(
+                client, request, args.warmup, args.concurrency
+            )
+            results[name] = asdict(
+                await run_scenario(
+                    client, request, args.requests, args.concurrency
+                )
+            )
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'backend': args.backend,
+            'seed': args.seed,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+        },
+        'scenarios': results,
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float,
+) -> bool:
+    """Prints the change against the baseline.
+
+    Throughput and median latency decide whether a scenario regressed;
+    p99 is reported but too noisy in-process to fail a run on.
+
+    :param current: The results of this run.
+    :type current: dict[str, Any]
+    :param baseline: The stored results.
+    :type baseline: dict[str, Any]
+    :param tolerance: The allowed relative slowdown.
+    :type tolerance: float
+    :returns: Whether any scenario regressed beyond the tolerance.
+    :rtype: bool
+    """
+    regressed = False
+    for name, result in current['scenarios'].items():
+        reference = baseline['scenarios'].get(name)
+        if reference is None:
+            continue
+        rps = result['rps'] / reference['rps'] - 1
+        p50 = result['p50_ms'] / reference['p50_ms'] - 1
+        p99 = result['p99_ms'] / reference['p99_ms'] - 1
+        slower = rps < -tolerance or p50 > tolerance
+        regressed = regressed or slower
+        print(
+            f'{name:>16}: req/s {rps:+7.1%}  p50 {p50:+7.1%}  '
+            f'p99 {p99:+7.1%}{"  REGRESSION" if slower else ""}'
+        )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--backend', choices=('memory', 'postgres'), default='memory'
+    )
+    parser.add_argument('--seed', type=int, default=10_000)
+    parser.add_argument('--requests', type=int, default=2_000)
+    parser.add_argument('--warmup', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--output', type=Path, default=RESULTS)
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    for name, result in results['scenarios'].items():
+        print(
+            f'{name:>16}: {result["rps"]:9.1f} req/s  '
+            f'p50 {result["p50_ms"]:7.2f} ms  '
+            f'p99 {result["p99_ms"]:7.2f} ms  '
+            f'errors {result["errors"]}'
+        )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2) + '\n')
+    print(f'Results written to {args.output}')
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + '\n')
+        return
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Throughput of the applications projection consumer.
+
+Drives the consumer application through FastStream's in-memory Kafka test
+broker. The repository is replaced by one that only waits for a fixed
+round trip per statement, so the numbers show what batching saves over
+one upsert per event.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.projection_throughput
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Sequence
+from uuid import uuid4
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+
+from dishka import Provider, Scope, provide  # noqa: E402
+from dishka.integrations.faststream import FastStreamProvider  # noqa: E402
+from faststream.kafka import KafkaBroker, TestKafkaBroker  # noqa: E402
+from faststream.types import SendableTable  # noqa: E402
+
+from core.config import ProjectionSettings, get_settings  # noqa: E402
+from domain.entities.application import ApplicationRead  # noqa: E402
+from public.consumer.app import create_consumer_app  # noqa: E402
+from services.projection import ProjectionService  # noqa: E402
+
+EVENTS = 5_000
+DUPLICATES = 0.1
+ROUND_TRIP = 0.001
+
+
+class RoundTripRepository:
+    """Stands in for the database with a fixed latency per statement."""
+
+    def __init__(self) -> None:
+        self.rows: dict[object, ApplicationRead] = {}
+        self.statements = 0
+
+    async def upsert_many(self, objects: Sequence[ApplicationRead]) -> None:
+        await asyncio.sleep(ROUND_TRIP)
+        self.statements += 1
+        for obj in objects:
+            self.rows[obj.id] = obj
+
+
+class BenchmarkProvider(Provider):
+    scope = Scope.APP
+
+    def __init__(self, repository: RoundTripRepository) -> None:
+        super().__init__()
+        self._repository = repository
+
+    @provide
+    def service(self) -> ProjectionService:
+        return ProjectionService(
+            self._repository, retry_backoff=0, max_retries=0
+        )
+
+
+def make_events() -> list[SendableTable]:
+    events: list[SendableTable] = [
+        {
+            'id': str(uuid4()),
+            'user_name': f'user-{index}',
+            'description': 'Application for new service access',
+            'created_at': datetime.now().isoformat(),
+        }
+        for index in range(int(EVENTS * (1 - DUPLICATES)))
+    ]
+    return events + events[: EVENTS - len(events)]
+
+
+async def measure(batch_size: int) -> None:
+    topic = get_settings(ProjectionSettings).topic
+    repository = RoundTripRepository()
+    broker = KafkaBroker(logger=None)
+    create_consumer_app(
+        [BenchmarkProvider(repository), FastStreamProvider()], broker
+    )
+    events = make_events()
+
+    async with TestKafkaBroker(broker) as test_broker:
+        started = time.perf_counter()
+        for offset in range(0, len(events), batch_size):
+            await test_broker.publish_batch(
+                *events[offset : offset + batch_size], topic=topic
+            )
+        elapsed = time.perf_counter() - started
+
+    print(
+        f'batch {batch_size:>4}: {len(events) / elapsed:10.0f} events/s, '
+        f'{repository.statements:>5} statements, '
+        f'{len(repository.rows)} rows'
+    )
+
+
+def main() -> None:
+    for batch_size in (1, 50, 500):
+        asyncio.run(measure(batch_size))
+
+
+if __name__ == '__main__':
+    main()
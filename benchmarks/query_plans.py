@@ -0,0 +1,386 @@
+"""Query plans of the repository statements on a seeded Postgres.
+
+Needs the Postgres configured by ``POSTGRES_*``. Creates the
+``applications`` table and its indexes in a throwaway ``query_plans``
+schema, seeds it with a synthetic distribution (user names following a
+power law, recent applications denser than old ones) and analyzes it.
+Every statement shape the repositories run is then compiled as the
+asyncpg repository sends it and explained with ``EXPLAIN (FORMAT JSON)``.
+
+Plans are stored in ``benchmarks/plans``, one file per shape, without
+their row estimates and costs, so that they only change when the plan
+does. Each file also holds the cost ceiling of the shape, set to half
+again its cost when it was recorded. No plans are shipped: the first run
+against a database records them and reports every shape as having had
+no stored plan. Later runs fail when a plan differs from the stored
+one, when its cost exceeds the ceiling, or when it does not use the
+indexes the shape is expected to use. After reviewing the differences,
+``--update`` stores the current plans and ceilings.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.query_plans [--update]
+"""
+
+import argparse
+import asyncio
+import difflib
+import json
+import math
+import os
+from datetime import UTC, datetime, timedelta
+from hashlib import md5
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+from uuid import UUID
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+
+import asyncpg  # noqa: E402
+from sqlalchemy import Executable  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.schema import CreateIndex, CreateTable  # noqa: E402
+
+from core.config import DatabaseSettings, get_settings  # noqa: E402
+from core.providers import libpq_uri  # noqa: E402
+from domain.entities.application import ApplicationCreate  # noqa: E402
+from domain.entities.queries import ApplicationQuery  # noqa: E402
+from infrastructure.database.base import Base  # noqa: E402
+from infrastructure.database.filter.application import (  # noqa: E402
+    ApplicationFilter,
+)
+from infrastructure.database.models.application import (  # noqa: E402
+    Application,
+)
+from infrastructure.database.pool import AsyncpgPool  # noqa: E402
+from infrastructure.database.repository.application import (  # noqa: E402
+    RawApplicationRepository,
+)
+
+PLANS = Path(__file__).with_name('plans')
+SCHEMA = 'query_plans'
+NOW = datetime(2026, 1, 1, tzinfo=UTC)
+ROWS = 200_000
+USERS = 20_000
+TOLERANCE = 0.5
+
+# Plan keys kept in stored plans; estimates and costs are left out.
+KEYS = (
+    'Node Type',
+    'Parent Relationship',
+    'Strategy',
+    'Scan Direction',
+    'Relation Name',
+    'Index Name',
+    'Index Cond',
+    'Recheck Cond',
+    'Filter',
+    'Sort Key',
+    'Presorted Key',
+    'Workers Planned',
+)
+
+SEED = """
+INSERT INTO applications (id, user_name, description, content_hash, created_at)
+SELECT
+    id,
+    user_name,
+    description,
+    md5(user_name || chr(31) || description)::uuid,
+    created_at
+FROM (
+    SELECT
+        md5('application-' || i)::uuid AS id,
+        'user-' || floor($2::int * power(random(), 4))::int AS user_name,
+        md5('description-' || i)
+            || repeat(' lorem ipsum', (random() * 20)::int) AS description,
+        $3::timestamptz - power(random(), 2) * interval '730 days'
+            AS created_at
+    FROM generate_series(1, $1::int) AS i
+) AS seeded
+"""
+
+type Statement = tuple[Executable, dict[str, Any]]
+
+
+def application_id(index: int) -> UUID:
+    """Returns the ID of a seeded application.
+
+    :param index: The position of the application in the seed, from 1.
+    :type index: int
+    :returns: The same ID as the seed query.
+    :rtype: UUID
+    """
+    data = f'application-{index}'.encode()
+    return UUID(md5(data, usedforsecurity=False).hexdigest())
+
+
+class Shape(NamedTuple):
+    """A statement run by the repositories and the indexes it should use."""
+
+    name: str
+    statement: Callable[[RawApplicationRepository], Statement]
+    indexes: tuple[str, ...] = ()
+    ordered: bool = False
+
+
+def listing(**fields: Any) -> Callable[[RawApplicationRepository], Statement]:
+    query = ApplicationQuery(**fields)
+    return lambda repository: repository._get_multi_statement(query)
+
+
+def version(**fields: Any) -> Callable[[RawApplicationRepository], Statement]:
+    query = ApplicationQuery(**fields)
+    return lambda repository: repository._get_version_statement(query)
+
+
+RARE_USER = f'user-{USERS - 7}'
+CREATED_AT = 'ix_applications_created_at'
+USER_NAME = 'ix_user_name_trgm'
+PRIMARY_KEY = 'pk_applications'
+
+SHAPES = (
+    Shape('list', listing(size=50)),
+    Shape('list_fields', listing(size=25, fields='id,user_name')),
+    Shape('list_ordered', listing(size=50), (CREATED_AT,), True),
+    Shape(
+        'list_ordered_deep_page',
+        listing(size=50, page=200),
+        (CREATED_AT,),
+        True,
+    ),
+    Shape(
+        'list_user_name',
+        listing(size=50, user_name=RARE_USER),
+        (USER_NAME,),
+    ),
+    Shape(
+        'list_user_name_ordered',
+        listing(size=50, user_name=RARE_USER),
+        (USER_NAME,),
+        True,
+    ),
+    Shape('list_user_name_common', listing(size=50, user_name='user-1')),
+    Shape(
+        'list_created_after',
+        listing(size=50, created_after=NOW - timedelta(days=1)),
+        (CREATED_AT,),
+        True,
+    ),
+    Shape(
+        'list_created_range',
+        listing(
+            size=50,
+            created_after=NOW - timedelta(days=600),
+            created_before=NOW - timedelta(days=590),
+        ),
+        (CREATED_AT,),
+        True,
+    ),
+    Shape(
+        'list_user_name_created_after',
+        listing(
+            size=50,
+            user_name=RARE_USER,
+            created_after=NOW - timedelta(days=30),
+        ),
+        (USER_NAME,),
+    ),
+    Shape('version', version()),
+    Shape('version_user_name', version(user_name=RARE_USER), (USER_NAME,)),
+    Shape(
+        'version_created_after',
+        version(created_after=NOW - timedelta(days=7)),
+        (CREATED_AT,),
+    ),
+    Shape(
+        'get_by_id',
+        lambda repository: (
+            repository._get_by_id_statement(),
+            {'entity_id': application_id(1_000)},
+        ),
+        (PRIMARY_KEY,),
+    ),
+    Shape(
+        'get_by_ids',
+        lambda repository: (
+            repository._get_by_ids_statement(),
+            {'ids': [application_id(index) for index in range(1, 101)]},
+        ),
+        (PRIMARY_KEY,),
+    ),
+    Shape(
+        'get_duplicate',
+        lambda repository: (
+            repository._get_duplicate_statement(),
+            repository._duplicate_parameters(
+                ApplicationCreate(user_name=RARE_USER, description='Repeated'),
+                NOW - timedelta(seconds=10),
+            ),
+        ),
+        ('ix_applications_content_hash_created_at',),
+    ),
+    Shape(
+        'get_oldest',
+        lambda repository: (
+            repository._get_oldest_statement(),
+            {'before': NOW - timedelta(days=365), 'limit': 1_000},
+        ),
+        (CREATED_AT,),
+    ),
+)
+
+
+def normalize(node: dict[str, Any]) -> dict[str, Any]:
+    """Returns a plan node without its estimates and costs.
+
+    :param node: A node of an ``EXPLAIN (FORMAT JSON)`` plan.
+    :type node: dict[str, Any]
+    :returns: The node, with its children normalized.
+    :rtype: dict[str, Any]
+    """
+    result = {key: node[key] for key in KEYS if key in node}
+    if 'Plans' in node:
+        result['Plans'] = [normalize(child) for child in node['Plans']]
+    return result
+
+
+def nodes(node: dict[str, Any]) -> list[dict[str, Any]]:
+    result = [node]
+    for child in node.get('Plans', ()):
+        result.extend(nodes(child))
+    return result
+
+
+def check(shape: Shape, plan: dict[str, Any]) -> list[str]:
+    """Returns how a plan misses the indexes a shape should use.
+
+    :param shape: The statement shape.
+    :type shape: Shape
+    :param plan: The normalized plan.
+    :type plan: dict[str, Any]
+    :returns: The problems found, if any.
+    :rtype: list[str]
+    """
+    used = {node.get('Index Name') for node in nodes(plan)}
+    problems = [
+        f'does not use {index}' for index in shape.indexes if index not in used
+    ]
+    if shape.indexes and any(
+        node['Node Type'] == 'Seq Scan' for node in nodes(plan)
+    ):
+        problems.append('scans the table sequentially')
+    return problems
+
+
+async def seed(connection: asyncpg.Connection) -> None:
+    dialect = postgresql.dialect()
+    table = Base.metadata.tables[Application.__tablename__]
+    await connection.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+    await connection.execute(f'CREATE SCHEMA {SCHEMA}')
+    await connection.execute(
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public'
+    )
+    await connection.execute(str(CreateTable(table).compile(dialect=dialect)))
+    await connection.execute('SELECT setseed(0.5)')
+    await connection.execute(SEED, ROWS, USERS, NOW)
+    for index in sorted(table.indexes, key=lambda index: str(index.name)):
+        await connection.execute(
+            str(CreateIndex(index).compile(dialect=dialect))
+        )
+    await connection.execute('VACUUM ANALYZE applications')
+
+
+async def explain(
+    connection: asyncpg.Connection,
+    repository: RawApplicationRepository,
+    shape: Shape,
+) -> tuple[str, dict[str, Any]]:
+    """Returns the SQL of a shape and its plan.
+
+    :param connection: The connection to the seeded database.
+    :type connection: asyncpg.Connection
+    :param repository: The repository building the statement.
+    :type repository: RawApplicationRepository
+    :param shape: The statement shape.
+    :type shape: Shape
+    :returns: The SQL sent by the repository and its plan.
+    :rtype: tuple[str, dict[str, Any]]
+    """
+    sql, arguments = repository._compile(*shape.statement(repository))
+    result = await connection.fetchval(
+        f'EXPLAIN (FORMAT JSON) {sql}', *arguments
+    )
+    return sql, json.loads(result)[0]['Plan']
+
+
+async def main(update: bool) -> None:
+    settings = get_settings(DatabaseSettings)
+    connection = await asyncpg.connect(
+        libpq_uri(settings.uri),
+        server_settings={
+            'search_path': f'{SCHEMA}, public',
+            'TimeZone': 'UTC',
+        },
+    )
+    filter = ApplicationFilter(Application)
+    # The repositories only compile statements; their pool is never opened.
+    pool = AsyncpgPool(libpq_uri(settings.uri))
+    repositories = {
+        ordered: RawApplicationRepository(pool, Application, filter, ordered)
+        for ordered in (False, True)
+    }
+    failures = 0
+    try:
+        await seed(connection)
+        PLANS.mkdir(exist_ok=True)
+        for shape in SHAPES:
+            sql, plan = await explain(
+                connection, repositories[shape.ordered], shape
+            )
+            cost = plan['Total Cost']
+            current: dict[str, Any] = {'sql': sql, 'plan': normalize(plan)}
+            path = PLANS / f'{shape.name}.json'
+            stored = json.loads(path.read_text()) if path.exists() else None
+            problems = check(shape, current['plan'])
+
+            if update or stored is None:
+                current['max_cost'] = math.ceil(cost * (1 + TOLERANCE))
+                path.write_text(json.dumps(current, indent=2) + '\n')
+                if not update:
+                    problems.append('had no stored plan')
+            else:
+                if cost > stored['max_cost']:
+                    problems.append(
+                        f'costs {cost:.0f}, above {stored["max_cost"]}'
+                    )
+                expected = {key: stored[key] for key in ('sql', 'plan')}
+                if current != expected:
+                    problems.append('changed plan')
+                    diff = difflib.unified_diff(
+                        json.dumps(expected, indent=2).splitlines(True),
+                        json.dumps(current, indent=2).splitlines(True),
+                        f'{path} (stored)',
+                        f'{path} (current)',
+                    )
+                    print(''.join(diff))
+
+            status = '; '.join(problems) or 'ok'
+            print(f'{shape.name:>30}: cost {cost:10.1f}  {status}')
+            failures += bool(problems)
+    finally:
+        await connection.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+        await connection.close()
+
+    if failures:
+        raise SystemExit(f'{failures} of {len(SHAPES)} query plans regressed')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--update',
+        action='store_true',
+        help='store the current plans and cost ceilings',
+    )
+    asyncio.run(main(parser.parse_args().update))
@@ -0,0 +1,130 @@
+"""Hot-path overhead of the rate limiting middleware.
+
+Measures taking a token from the in-process buckets with a few clients,
+with more clients than fit in memory (every request evicts a bucket),
+and the cost the middleware adds to a request to an empty ASGI
+application, by client IP, by the client IP forwarded by a trusted
+proxy, with a known and an unknown API key and with the in-memory fake as
+the shared backend.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.rate_limit
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from ipaddress import ip_network
+from types import SimpleNamespace
+from typing import Any
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+
+from infrastructure.rate_limit.memory import (  # noqa: E402
+    InMemoryRateLimitBackend,
+)
+from public.api.middleware.rate_limit import (  # noqa: E402
+    RateLimitMiddleware,
+    RateLimitPolicy,
+)
+
+POLICY = RateLimitPolicy('write', 1e9, 1_000_000_000)
+API_KEY = '0123456789abcdef'
+
+
+def report(name: str, seconds: float, count: int) -> None:
+    print(f'{name:>34}: {seconds / count * 1e9:8.0f} ns/op')
+
+
+def buckets(requests: int) -> None:
+    for clients, max_clients in ((100, 10_000), (200_000, 100_000)):
+        backend = InMemoryRateLimitBackend(max_clients)
+        keys = [f'write:ip:10.0.{i // 256}.{i % 256}' for i in range(clients)]
+        started = time.perf_counter()
+        for index in range(requests):
+            backend.take(keys[index % clients], POLICY.rate, POLICY.burst)
+        report(
+            f'take, {clients} clients in {max_clients}',
+            time.perf_counter() - started,
+            requests,
+        )
+
+
+async def empty_app(scope: Any, receive: Any, send: Any) -> None:
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def middleware(requests: int) -> None:
+    container = SimpleNamespace(
+        get=lambda _: asyncio.sleep(0, InMemoryRateLimitBackend(100_000))
+    )
+    app = SimpleNamespace(state=SimpleNamespace(dishka_container=container))
+
+    async def receive() -> dict[str, Any]:
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message: Any) -> None:
+        pass
+
+    def scope(api_key: str | None, proxied: bool = False) -> dict[str, Any]:
+        headers = [(b'host', b'benchmark'), (b'content-type', b'json')]
+        if api_key is not None:
+            headers.append((b'x-api-key', api_key.encode()))
+        if proxied:
+            headers.append((b'x-forwarded-for', b'203.0.113.7, 10.0.0.2'))
+        return {
+            'type': 'http',
+            'method': 'POST',
+            'path': '/api/v1/applications',
+            'headers': headers,
+            'client': ('10.0.0.1', 5000),
+            'app': app,
+        }
+
+    cases: list[tuple[str, Any, dict[str, Any]]] = [
+        ('no middleware', empty_app, scope(None)),
+    ]
+    for name, api_key, proxied, shared in (
+        ('client IP', None, False, False),
+        ('forwarded client IP', None, True, False),
+        ('unknown API key', API_KEY[::-1], False, False),
+        ('API key', API_KEY, False, False),
+        ('API key, shared fake', API_KEY, False, True),
+    ):
+        limited = RateLimitMiddleware(
+            empty_app,
+            {('POST', '/api/v1/applications'): POLICY},
+            InMemoryRateLimitBackend(100_000),
+            'X-API-Key',
+            api_keys=[API_KEY],
+            trusted_proxies=[ip_network('10.0.0.0/8')] if proxied else [],
+            shared=shared,
+        )
+        cases.append((name, limited, scope(api_key, proxied)))
+
+    baseline = 0.0
+    for name, application, request in cases:
+        started = time.perf_counter()
+        for _ in range(requests):
+            await application(request, receive, send)
+        elapsed = time.perf_counter() - started
+        if not baseline:
+            baseline = elapsed
+            report(f'request, {name}', elapsed, requests)
+            continue
+        report(f'overhead, {name}', elapsed - baseline, requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500_000)
+    args = parser.parse_args()
+    buckets(args.requests)
+    asyncio.run(middleware(args.requests))
+
+
+if __name__ == '__main__':
+    main()
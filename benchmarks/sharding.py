@@ -0,0 +1,184 @@
+"""Parity of the sharded application repository with a single database.
+
+Creates applications through a ``ShardedRepository`` and through one
+in-memory repository used as the reference, then checks that every list,
+version and lookup query returns the same records from both, and that
+each application was written to exactly one shard: the one its key
+hashes to. List queries are timed, since they fan out to every shard.
+
+By default the shards are in-memory repositories. With ``--backend
+postgres`` they are the databases listed in ``POSTGRES_SHARDS``, migrated
+with ``python -m app.migrate upgrade`` and holding no other applications;
+the applications created are deleted afterwards.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.sharding
+    PYTHONPATH=app python -m benchmarks.sharding --backend postgres
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+
+from core.config import DatabaseSettings, get_settings  # noqa: E402
+from domain.entities.application import ApplicationCreate  # noqa: E402
+from domain.entities.queries import ApplicationQuery  # noqa: E402
+from infrastructure.database.engine import SqlAlchemyEngine  # noqa: E402
+from infrastructure.database.filter.application import (  # noqa: E402
+    ApplicationFilter,
+)
+from infrastructure.database.models.application import (  # noqa: E402
+    Application,
+)
+from infrastructure.database.repository.application import (  # noqa: E402
+    ApplicationRepository,
+    ApplicationStore,
+)
+from infrastructure.database.repository.memory import (  # noqa: E402
+    InMemoryApplicationRepository,
+)
+from infrastructure.database.repository.sharded import (  # noqa: E402
+    ShardedRepository,
+    shard_index,
+)
+
+ROUNDS = 200
+QUERIES = (
+    ApplicationQuery(size=50),
+    ApplicationQuery(size=25, page=2),
+    ApplicationQuery(size=50, page=40),
+    ApplicationQuery(size=50, user_name='user-1'),
+    ApplicationQuery(size=25, user_name='USER-4', page=3),
+    ApplicationQuery(size=25, fields=('user_name',)),
+    ApplicationQuery(size=25, fields=('description', 'id'), page=5),
+)
+
+
+def normalize(records: Any) -> list[dict[str, Any]]:
+    return [dict(record) for record in records]
+
+
+def applications(count: int) -> list[ApplicationCreate]:
+    """Returns applications with shuffled, partly equal creation times.
+
+    :param count: The number of applications.
+    :type count: int
+    :returns: The applications.
+    :rtype: list[ApplicationCreate]
+    """
+    started = datetime(2026, 1, 1)
+    moments = [
+        started + timedelta(seconds=index // 3) for index in range(count)
+    ]
+    random.shuffle(moments)
+    return [
+        ApplicationCreate(
+            user_name=f'user-{index % 100}',
+            description='Application for new service access',
+            created_at=moment,
+        )
+        for index, moment in enumerate(moments)
+    ]
+
+
+async def check(
+    sharded: ShardedRepository,
+    reference: InMemoryApplicationRepository,
+    created: list[ApplicationCreate],
+) -> None:
+    for query in QUERIES:
+        expected = normalize(await reference.get_multi(query))
+        actual = normalize(await sharded.get_multi(query))
+        assert actual == expected, f'get_multi differs for {query}'
+        assert await sharded.get_version(query) == (
+            await reference.get_version(query)
+        ), f'get_version differs for {query}'
+
+    sample = random.sample(created, 20)
+    for application in sample[:5]:
+        record = await sharded.get_by_id(application.id)
+        assert record is not None and record['id'] == application.id
+    ids = [application.id for application in sample]
+    found = {record['id'] for record in await sharded.get_by_ids(ids)}
+    assert found == set(ids), 'get_by_ids misses records'
+    print(f'{len(QUERIES)} list queries and lookups match the reference')
+
+
+async def timed(sharded: ShardedRepository) -> None:
+    for query in QUERIES[:3]:
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            await sharded.get_multi(query)
+        elapsed = (time.perf_counter() - started) / ROUNDS
+        print(
+            f'  size {query.size:>2} offset {query.page or 0:>4}: '
+            f'{elapsed * 1e6:8.1f} us/query'
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--backend', choices=('memory', 'postgres'), default='memory'
+    )
+    parser.add_argument('--shards', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=5_000)
+    parser.add_argument(
+        '--shard-key', choices=('id', 'user_name'), default='id'
+    )
+    args = parser.parse_args()
+
+    engines: list[SqlAlchemyEngine] = []
+    if args.backend == 'postgres':
+        settings = get_settings(DatabaseSettings)
+        assert settings.shards, 'POSTGRES_SHARDS lists no databases'
+        engines = [SqlAlchemyEngine(uri) for uri in settings.shards]
+        shards: list[ApplicationStore] = [
+            ApplicationRepository(
+                engine, Application, ApplicationFilter(Application), True
+            )
+            for engine in engines
+        ]
+    else:
+        shards = [InMemoryApplicationRepository() for _ in range(args.shards)]
+
+    sharded = ShardedRepository(shards, args.shard_key)
+    reference = InMemoryApplicationRepository()
+    created = applications(args.seed)
+    try:
+        for application in created:
+            await sharded.create(application)
+            await reference.create(application)
+
+        for application in random.sample(created, 100):
+            index = shard_index(
+                getattr(application, args.shard_key), len(shards)
+            )
+            owners = [
+                position
+                for position, shard in enumerate(shards)
+                if await shard.get_by_id(application.id) is not None
+            ]
+            assert owners == [index], f'{application.id} on shards {owners}'
+        print(f'{args.seed} applications written to one shard each')
+
+        await check(sharded, reference, created)
+        print(f'fan-out over {len(shards)} shards:')
+        await timed(sharded)
+    finally:
+        if engines:
+            for application in created:
+                await sharded.delete_by_id(application.id)
+            for engine in engines:
+                await engine.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
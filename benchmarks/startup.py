@@ -0,0 +1,117 @@
+"""Cold start time of the API process.
+
+Every run starts a fresh interpreter that imports the application
+modules, builds the application with ``create_app`` and serves the first
+request for the OpenAPI schema, which FastAPI builds on demand. The
+parent reports the median of each phase and of the whole process, and
+which heavy packages were imported by then.
+
+The Postgres backend builds its providers without connecting, so no
+database or broker is needed.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.startup
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+HEAVY_MODULES = ('sqlalchemy', 'asyncpg', 'aiokafka', 'faststream')
+
+
+def child() -> None:
+    """Measures the phases in this process and prints them as JSON."""
+    started = time.perf_counter()
+    import asyncio
+
+    import httpx
+
+    from core.providers import get_providers
+    from public.api.app import create_app
+
+    imported = time.perf_counter()
+    app = create_app(get_providers())
+    built = time.perf_counter()
+
+    async def first_request() -> None:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url='http://benchmark'
+        ) as client:
+            response = await client.get('/openapi.json')
+            response.raise_for_status()
+
+    asyncio.run(first_request())
+    served = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                'import_ms': (imported - started) * 1000,
+                'build_ms': (built - imported) * 1000,
+                'first_request_ms': (served - built) * 1000,
+                'modules': [
+                    name for name in HEAVY_MODULES if name in sys.modules
+                ],
+            }
+        )
+    )
+
+
+def run(backend: str) -> dict[str, Any]:
+    """Starts a child process and returns its measurements.
+
+    :param backend: ``memory`` or ``postgres``.
+    :type backend: str
+    :returns: The phase timings, the process time and the heavy modules.
+    :rtype: dict[str, Any]
+    """
+    env = {
+        **os.environ,
+        'APP_BACKEND': backend,
+        'APP_LOG_LEVEL': os.environ.get('APP_LOG_LEVEL', 'warning'),
+        'POSTGRES_USER': os.environ.get('POSTGRES_USER', 'benchmark'),
+        'POSTGRES_PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'benchmark'),
+    }
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.startup', '--child'],
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+    result['process_ms'] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', action='store_true')
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    for backend in ('memory', 'postgres'):
+        runs = [run(backend) for _ in range(args.runs)]
+        phases = ('import_ms', 'build_ms', 'first_request_ms', 'process_ms')
+        medians = '  '.join(
+            f'{phase.removesuffix("_ms")} '
+            f'{statistics.median(run[phase] for run in runs):7.1f} ms'
+            for phase in phases
+        )
+        print(f'{backend:>8}: {medians}')
+        print(f'{"":>8}  imported: {", ".join(runs[0]["modules"])}')
+
+
+if __name__ == '__main__':
+    main()
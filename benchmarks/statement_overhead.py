@@ -0,0 +1,168 @@
+"""Per-query Python overhead of the repository statements.
+
+Compares building the list and count statements on every call, as the
+repository used to, with the repository's cached statements:
+
+* ``prepare`` builds the statement and computes its compilation cache
+  key, the work done before SQLAlchemy looks up the compiled form;
+* ``execute`` also runs it on an in-memory SQLite connection, which
+  executes these queries in microseconds, so the rest is Python overhead.
+
+It also checks that new filter values reuse the cached statements and
+that their SQL text, compiled for asyncpg, only holds placeholders: the
+text is what asyncpg's prepared statement cache is keyed on.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.statement_overhead
+"""
+
+import os
+import timeit
+from datetime import datetime
+from typing import Any, Callable, cast
+from uuid import uuid4
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+
+from sqlalchemy import (  # noqa: E402
+    ClauseElement,
+    Connection,
+    Executable,
+    and_,
+    create_engine,
+    event,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.dialects.postgresql.asyncpg import (  # noqa: E402
+    PGDialect_asyncpg,
+)
+
+from domain.entities.queries import ApplicationQuery  # noqa: E402
+from infrastructure.database.base import Base  # noqa: E402
+from infrastructure.database.engine import (  # noqa: E402
+    _record_compile_cache,
+    compile_cache_ratio,
+)
+from infrastructure.database.filter.application import (  # noqa: E402
+    ApplicationFilter,
+)
+from infrastructure.database.models.application import (  # noqa: E402
+    Application,
+)
+from infrastructure.database.repository.application import (  # noqa: E402
+    ApplicationStatements,
+)
+
+ROUNDS = 2_000
+QUERIES = (
+    ApplicationQuery(size=50),
+    ApplicationQuery(size=50, user_name='user-1'),
+    ApplicationQuery(size=50, page=3),
+)
+
+Prepare = Callable[[ApplicationQuery], list[tuple[Executable, Any]]]
+
+
+def previous(query: ApplicationQuery) -> list[tuple[Executable, Any]]:
+    version = select(func.count(), func.max(Application.created_at))
+    page = select(*Application.__table__.columns).limit(query.size)
+    if query.user_name:
+        where = and_(Application.user_name.ilike(f'%{query.user_name}%'))
+        version = version.where(where)
+        page = page.where(where)
+    if query.page:
+        page = page.offset(query.page)
+    return [(version, None), (page, None)]
+
+
+def cached(
+    repository: ApplicationStatements,
+) -> Prepare:
+    def prepare(query: ApplicationQuery) -> list[tuple[Executable, Any]]:
+        return [
+            repository._get_version_statement(query),
+            repository._get_multi_statement(query),
+        ]
+
+    return prepare
+
+
+def measure(connection: Connection, prepare: Prepare) -> tuple[float, float]:
+    def prepare_only() -> None:
+        for query in QUERIES:
+            for statement, _ in prepare(query):
+                cast(ClauseElement, statement)._generate_cache_key()
+
+    def execute() -> None:
+        for query in QUERIES:
+            for statement, parameters in prepare(query):
+                connection.execute(statement, parameters).all()
+
+    per_query = ROUNDS * len(QUERIES) * 2
+    prepare_seconds, execute_seconds = (
+        min(timeit.repeat(func_, number=ROUNDS, repeat=3)) / per_query
+        for func_ in (prepare_only, execute)
+    )
+    return prepare_seconds, execute_seconds
+
+
+def check_sql_text(repository: ApplicationStatements) -> None:
+    statements = {
+        id(repository._get_multi_statement(query)[0])
+        for query in (
+            ApplicationQuery(size=25, user_name=name)
+            for name in ('a', 'user-2', 'someone else')
+        )
+    }
+    assert len(statements) == 1, 'statement built per value'
+
+    dialect = PGDialect_asyncpg()
+    for statement in repository._statements.values():
+        text = str(cast(ClauseElement, statement).compile(dialect=dialect))
+        assert 'user-2' not in text and ' 25' not in text, text
+    print(
+        f'{len(repository._statements)} cached statements, '
+        'SQL text independent of the values'
+    )
+
+
+def main() -> None:
+    engine = create_engine('sqlite://')
+    event.listen(engine, 'after_cursor_execute', _record_compile_cache)
+    Base.metadata.tables[Application.__tablename__].create(engine)
+    repository = ApplicationStatements(
+        Application, ApplicationFilter(Application)
+    )
+
+    with engine.connect() as connection:
+        connection.execute(
+            insert(Application),
+            [
+                {
+                    'id': uuid4(),
+                    'user_name': f'user-{index}',
+                    'description': 'Application',
+                    'created_at': datetime.now(),
+                }
+                for index in range(200)
+            ],
+        )
+        for name, prepare in (
+            ('previous', previous),
+            ('cached', cached(repository)),
+        ):
+            prepare_seconds, execute_seconds = measure(connection, prepare)
+            print(
+                f'{name:>8}: prepare {prepare_seconds * 1e6:6.1f} us/query, '
+                f'execute {execute_seconds * 1e6:6.1f} us/query'
+            )
+
+    check_sql_text(repository)
+    print(f'compile cache hit ratio: {compile_cache_ratio.value():.4f}')
+
+
+if __name__ == '__main__':
+    main()
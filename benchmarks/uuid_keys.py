@@ -0,0 +1,125 @@
+"""Insert throughput and primary key size for the kinds of application IDs.
+
+Inserts the same number of rows into three tables whose primary key is:
+
+* ``text``: the UUID as 32 hex characters, random (``uuid4``);
+* ``uuid4``: a native 16-byte UUID, random;
+* ``uuid7``: a native 16-byte UUID, time-ordered (``domain.ids.uuid7``).
+
+Random keys insert all over the primary key B-tree, splitting pages and
+leaving them partly empty; time-ordered keys append to its right edge.
+
+By default the tables are SQLite ``WITHOUT ROWID`` tables, whose rows are
+stored in the primary key B-tree, in a temporary file. With ``--backend
+postgres`` they are temporary tables in the Postgres configured by
+``POSTGRES_*``, and the size is that of the primary key index.
+
+Run from the repository root::
+
+    PYTHONPATH=app python -m benchmarks.uuid_keys
+    PYTHONPATH=app python -m benchmarks.uuid_keys --backend postgres
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Any, Callable
+from uuid import uuid4
+
+os.environ.setdefault('APP_LOG_LEVEL', 'warning')
+
+from domain.ids import uuid7  # noqa: E402
+
+BATCH = 1_000
+
+KEYS: dict[str, tuple[str, str, Callable[[], Any]]] = {
+    'text': ('TEXT', 'text', lambda: uuid4().hex),
+    'uuid4': ('BLOB', 'uuid', uuid4),
+    'uuid7': ('BLOB', 'uuid', uuid7),
+}
+
+
+def report(name: str, rows: int, seconds: float, size: int) -> None:
+    print(
+        f'{name:>6}: {rows / seconds:10.0f} rows/s  '
+        f'primary key {size / 2**20:7.2f} MiB '
+        f'({size / rows:5.1f} bytes/row)'
+    )
+
+
+def run_sqlite(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (sqlite_type, _, generate) in KEYS.items():
+            path = os.path.join(directory, f'{name}.db')
+            connection = sqlite3.connect(path)
+            connection.execute(
+                f'CREATE TABLE keys (id {sqlite_type} PRIMARY KEY, '
+                'created_at REAL NOT NULL) WITHOUT ROWID'
+            )
+            convert = (lambda key: key.bytes) if sqlite_type == 'BLOB' else str
+            started = time.perf_counter()
+            for _ in range(rows // BATCH):
+                with connection:
+                    connection.executemany(
+                        'INSERT INTO keys VALUES (?, ?)',
+                        [
+                            (convert(generate()), time.time())
+                            for _ in range(BATCH)
+                        ],
+                    )
+            elapsed = time.perf_counter() - started
+            page_count = connection.execute('PRAGMA page_count').fetchone()[0]
+            page_size = connection.execute('PRAGMA page_size').fetchone()[0]
+            connection.close()
+            report(name, rows, elapsed, page_count * page_size)
+
+
+async def run_postgres(rows: int) -> None:
+    import asyncpg
+
+    from core.config import DatabaseSettings, get_settings
+    from core.providers import libpq_uri
+
+    settings = get_settings(DatabaseSettings)
+    connection = await asyncpg.connect(libpq_uri(settings.uri))
+    try:
+        for name, (_, postgres_type, generate) in KEYS.items():
+            table = f'benchmark_keys_{name}'
+            await connection.execute(
+                f'CREATE TEMPORARY TABLE {table} '
+                f'(id {postgres_type} PRIMARY KEY, '
+                'created_at timestamptz NOT NULL DEFAULT now())'
+            )
+            started = time.perf_counter()
+            for _ in range(rows // BATCH):
+                await connection.executemany(
+                    f'INSERT INTO {table} (id) VALUES ($1)',
+                    [(generate(),) for _ in range(BATCH)],
+                )
+            elapsed = time.perf_counter() - started
+            size = await connection.fetchval(
+                'SELECT pg_relation_size($1::regclass)', f'{table}_pkey'
+            )
+            report(name, rows, elapsed, size)
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--backend', choices=('sqlite', 'postgres'), default='sqlite'
+    )
+    parser.add_argument('--rows', type=int, default=200_000)
+    args = parser.parse_args()
+    if args.backend == 'postgres':
+        asyncio.run(run_postgres(args.rows))
+    else:
+        run_sqlite(args.rows)
+
+
+if __name__ == '__main__':
+    main()